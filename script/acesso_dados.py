@@ -0,0 +1,243 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: camada única de acesso à base de interrupções (interrupcoes_light.csv).
+
+    |> O que o Script Faz
+        Converte o CSV, uma única vez, para um arquivo colunar tipado (Parquet) com as datas já convertidas.
+        Guarda junto ao Parquet um arquivo de metadados com tamanho, mtime e hash SHA-256 do CSV de origem.
+        Detecta cache desatualizado:
+            Tamanho e mtime iguais -> cache válido, sem reler o CSV.
+            mtime diferente, mas hash igual -> cache válido (apenas os metadados são atualizados).
+            Hash diferente -> o Parquet é reconstruído.
+        A conversão é feita em blocos (pyarrow.csv.open_csv), sem carregar o CSV inteiro em memória.
+        Todas as etapas (pesos, EDA, criticidade e matriz de priorização) leem a base por aqui.
+        Acertos e falhas do cache são contados na instrumentação (instrumentacao.py).
+        Carregamento compacto (carregar_base_compacta), guiado pelo esquema:
+            Ativo, Causa e Status_Ativo como categorias (códigos inteiros + tabela de rótulos).
+            Trecho internado como categoria: cat.codes são os IDs inteiros e cat.categories a tabela de consulta.
+            Contagens (Tempo_Operacao, Freq_Falhas, Clientes_Afetados) no menor inteiro com sinal que comporta
+            o mínimo e o máximo da coluna. Impactos continuam float64 (float32 apenas se pedido: altera os valores).
+            As colunas continuam com os mesmos nomes e rótulos; as funções das etapas funcionam sem alteração.
+'''
+
+# Importar bibliotecas
+import hashlib
+import json
+import os
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from instrumentacao import contar
+
+# Diretório (relativo à base) onde ficam os arquivos de cache
+DIRETORIO_CACHE = ".cache"
+
+# Versão do formato do cache: alterar invalida todos os caches existentes
+VERSAO_CACHE = 1
+
+# Tipos conhecidos das colunas da base; colunas extras têm o tipo inferido
+ESQUEMA_BASE = {
+    "Trecho": pa.string(),
+    "Ativo": pa.string(),
+    "Data_Interrupcao": pa.timestamp("ns"),
+    "Tempo_Operacao": pa.int64(),
+    "Freq_Falhas": pa.int64(),
+    "Clientes_Afetados": pa.int64(),
+    "Impacto_DEC": pa.float64(),
+    "Impacto_FEC": pa.float64(),
+    "Causa": pa.string(),
+    "Status_Ativo": pa.string(),
+}
+
+TAMANHO_LEITURA_CSV = 64 * 1024 * 1024
+
+# Esquema compacto
+COLUNAS_CATEGORICAS = ("Ativo", "Causa", "Status_Ativo", "Trecho")
+COLUNAS_CONTAGEM = ("Tempo_Operacao", "Freq_Falhas", "Clientes_Afetados")
+COLUNAS_IMPACTO = ("Impacto_DEC", "Impacto_FEC")
+_TIPOS_INTEIROS = (pa.int8(), pa.int16(), pa.int32(), pa.int64())
+
+
+def caminho_cache(base_path):
+    """
+    Retorna os caminhos do Parquet e dos metadados associados à base.
+    """
+    diretorio, nome = os.path.split(os.path.abspath(base_path))
+    nome_base = os.path.splitext(nome)[0]
+    pasta = os.path.join(diretorio, DIRETORIO_CACHE)
+    return (os.path.join(pasta, nome_base + ".parquet"),
+            os.path.join(pasta, nome_base + ".meta.json"))
+
+
+def calcular_hash_arquivo(caminho, tamanho_bloco=8 * 1024 * 1024):
+    """
+    Calcula o hash SHA-256 do conteúdo do arquivo, lendo em blocos.
+    """
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _ler_metadados(meta_path):
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _gravar_metadados(meta_path, metadados):
+    temporario = meta_path + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, indent=2)
+    os.replace(temporario, meta_path)
+
+
+def _converter_csv_parquet(base_path, parquet_path):
+    """
+    Converte o CSV para Parquet em blocos, aplicando o esquema conhecido.
+    """
+    temporario = parquet_path + ".tmp"
+    leitor = pa_csv.open_csv(
+        base_path,
+        read_options=pa_csv.ReadOptions(block_size=TAMANHO_LEITURA_CSV),
+        convert_options=pa_csv.ConvertOptions(column_types=ESQUEMA_BASE),
+    )
+    linhas = 0
+    with pq.ParquetWriter(temporario, leitor.schema) as escritor:
+        for lote in leitor:
+            escritor.write_batch(lote)
+            linhas += lote.num_rows
+    os.replace(temporario, parquet_path)
+    return linhas
+
+
+def atualizar_cache(base_path, forcar=False):
+    """
+    Garante que o Parquet da base está atualizado e retorna seu caminho.
+    Retorna também se o cache foi reaproveitado (True) ou reconstruído (False).
+    """
+    if not os.path.exists(base_path):
+        raise FileNotFoundError(f"Base de dados não encontrada: {base_path}")
+
+    parquet_path, meta_path = caminho_cache(base_path)
+    info = os.stat(base_path)
+    metadados = _ler_metadados(meta_path)
+
+    valido = (
+        not forcar
+        and metadados is not None
+        and metadados.get("versao") == VERSAO_CACHE
+        and os.path.exists(parquet_path)
+    )
+    if valido and metadados["tamanho"] == info.st_size and metadados["mtime_ns"] == info.st_mtime_ns:
+        contar("cache_colunar_acertos")
+        return parquet_path, True
+
+    hash_atual = calcular_hash_arquivo(base_path)
+    if valido and metadados["sha256"] == hash_atual:
+        # Arquivo apenas "tocado": conteúdo igual, atualizar os metadados
+        metadados.update(tamanho=info.st_size, mtime_ns=info.st_mtime_ns)
+        _gravar_metadados(meta_path, metadados)
+        contar("cache_colunar_acertos")
+        return parquet_path, True
+
+    contar("cache_colunar_falhas")
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    linhas = _converter_csv_parquet(base_path, parquet_path)
+    _gravar_metadados(meta_path, {
+        "versao": VERSAO_CACHE,
+        "origem": os.path.abspath(base_path),
+        "tamanho": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "sha256": hash_atual,
+        "linhas": linhas,
+    })
+    print(f"Cache colunar atualizado: {parquet_path}")
+    return parquet_path, False
+
+
+def carregar_base(base_path, colunas=None):
+    """
+    Carrega a base de interrupções a partir do cache colunar.
+    """
+    parquet_path, _ = atualizar_cache(base_path)
+    return pd.read_parquet(parquet_path, columns=colunas)
+
+
+def _menor_inteiro(coluna):
+    """
+    Menor tipo inteiro com sinal que comporta todos os valores da coluna.
+    """
+    extremos = pc.min_max(coluna)
+    minimo, maximo = extremos["min"].as_py(), extremos["max"].as_py()
+    if minimo is None:
+        return coluna.type
+    for tipo in _TIPOS_INTEIROS:
+        limites = np.iinfo(tipo.to_pandas_dtype())
+        if limites.min <= minimo and maximo <= limites.max:
+            return tipo
+    return coluna.type
+
+
+def carregar_base_compacta(base_path, colunas=None, impactos_float32=False):
+    """
+    Carrega a base com tipos compactos: categorias para textos repetidos (e para Trecho)
+    e o menor inteiro seguro para as contagens.
+    """
+    parquet_path, _ = atualizar_cache(base_path)
+    nomes = pq.read_schema(parquet_path).names if colunas is None else list(colunas)
+    tabela = pq.read_table(parquet_path, columns=nomes,
+                           read_dictionary=[col for col in COLUNAS_CATEGORICAS if col in nomes])
+    return compactar_tabela(tabela, impactos_float32)
+
+
+def compactar_tabela(tabela, impactos_float32=False):
+    """
+    Converte uma tabela Arrow (categóricas já lidas como dicionário) para o DataFrame compacto.
+    """
+    # Blocos do Parquet podem ter dicionários diferentes: um único dicionário por coluna
+    tabela = tabela.unify_dictionaries()
+    nomes = tabela.schema.names
+
+    for col in COLUNAS_CONTAGEM:
+        if col in nomes and pa.types.is_integer(tabela.schema.field(col).type):
+            i = tabela.schema.get_field_index(col)
+            tabela = tabela.set_column(i, col, tabela.column(col).cast(_menor_inteiro(tabela.column(col))))
+    if impactos_float32:
+        for col in COLUNAS_IMPACTO:
+            if col in nomes:
+                i = tabela.schema.get_field_index(col)
+                tabela = tabela.set_column(i, col, tabela.column(col).cast(pa.float32()))
+    return tabela.to_pandas()
+
+
+def colunas_base(base_path):
+    """
+    Retorna os nomes das colunas da base sem carregar os dados.
+    """
+    parquet_path, _ = atualizar_cache(base_path)
+    return pq.read_schema(parquet_path).names
+
+
+def linhas_base(base_path):
+    """
+    Retorna o número de linhas da base (metadados do Parquet, sem ler os dados).
+    """
+    parquet_path, _ = atualizar_cache(base_path)
+    return pq.ParquetFile(parquet_path).metadata.num_rows
+
+
+def iterar_blocos(base_path, tamanho_bloco=1_000_000, colunas=None):
+    """
+    Percorre a base em blocos de até `tamanho_bloco` linhas (DataFrames).
+    """
+    parquet_path, _ = atualizar_cache(base_path)
+    arquivo = pq.ParquetFile(parquet_path)
+    for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=colunas):
+        yield lote.to_pandas()
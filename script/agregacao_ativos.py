@@ -0,0 +1,167 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: consolidar o log de eventos por ativo e calcular janelas móveis de 3, 12 e 36 meses.
+
+    |> O que o Script Faz
+        Agrupa os eventos por ativo (Trecho) e, opcionalmente, também por tipo de ativo (Ativo).
+        Calcula somas móveis de Impacto_DEC, Impacto_FEC e Clientes_Afetados e a contagem de eventos
+        em janelas de meses do calendário (o mês de referência e os N-1 anteriores).
+        Não há laço Python por grupo:
+            Os eventos são ordenados uma vez por (grupo, mês).
+            Cada par (grupo, mês) vira uma chave inteira crescente: grupo * BASE + mês.
+            Os limites de cada janela saem de np.searchsorted sobre essas chaves.
+            As somas saem da diferença de somas acumuladas (np.cumsum).
+        Dois formatos de saída:
+            calcular_janelas_moveis: uma linha por evento, com as janelas que terminam no mês do evento.
+            agregar_por_ativo: uma linha por ativo, com as janelas que terminam no mês de referência.
+        A tabela por ativo mantém os nomes das colunas da base (Freq_Falhas = número de eventos,
+        Tempo_Operacao = máximo, impactos e clientes = somas), então pode ser passada diretamente
+        para calcular_criticidade; as colunas de janela (ex.: Impacto_DEC_12M) podem receber pesos.
+        Eventos sem Data_Interrupcao (ex.: partição sem_data) ou sem alguma chave de grupo (ex.: Trecho vazio)
+        não pertencem a nenhum (grupo, mês) e ficam fora das janelas:
+            calcular_janelas_moveis mantém a linha do evento, com as colunas de janela vazias (NaN).
+            agregar_por_ativo consolida apenas os eventos com data e chaves.
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+
+JANELAS_MESES = (3, 12, 36)
+VARIAVEIS_JANELA = ("Impacto_DEC", "Impacto_FEC", "Clientes_Afetados")
+
+
+def _mes_absoluto(datas):
+    datas = pd.to_datetime(datas)
+    # NaT viraria INT64_MIN na conversão e estouraria o deslocamento das chaves
+    if datas.isna().any():
+        raise ValueError("Eventos sem Data_Interrupcao não têm mês absoluto; filtre-os antes (_eventos_validos).")
+    return (datas.dt.year * 12 + datas.dt.month - 1).to_numpy(dtype=np.int64)
+
+
+def _eventos_validos(df, chaves):
+    """
+    Máscara dos eventos com Data_Interrupcao e todas as chaves de grupo preenchidas.
+    """
+    validos = pd.to_datetime(df["Data_Interrupcao"]).notna().to_numpy()
+    for chave in chaves:
+        validos &= df[chave].notna().to_numpy()
+    if not validos.any():
+        raise ValueError("Nenhum evento com Data_Interrupcao e chaves preenchidas para calcular as janelas móveis.")
+    return validos
+
+
+def _indexar_grupos(df, chaves):
+    """
+    Código inteiro de grupo por evento e a tabela de chaves de cada grupo.
+    """
+    grupos = df.groupby(list(chaves), sort=True, observed=True)
+    codigos = grupos.ngroup()
+    # Chave nula: ngroup devolve NaN, que viraria INT64_MIN e colidiria com outro grupo nas chaves
+    if codigos.isna().any():
+        raise ValueError(f"Eventos sem chave de grupo {list(chaves)}; filtre-os antes (_eventos_validos).")
+    tabela = grupos.size().reset_index()[list(chaves)]
+    return codigos.to_numpy(dtype=np.int64), tabela
+
+
+def _preparar(df, chaves, janelas, mes_referencia=None):
+    codigos, tabela = _indexar_grupos(df, chaves)
+    meses = _mes_absoluto(df["Data_Interrupcao"])
+    maior_janela = max(janelas)
+
+    # Deslocamento para que (mês - janela) nunca fique negativo nem invada o grupo anterior
+    menor = min(meses.min(), mes_referencia if mes_referencia is not None else meses.min()) - maior_janela
+    maior = max(meses.max(), mes_referencia if mes_referencia is not None else meses.max())
+    base = maior - menor + 1
+
+    ordem = np.lexsort((meses, codigos))
+    chave = codigos[ordem] * base + (meses[ordem] - menor)
+    return ordem, chave, codigos, tabela, base, menor
+
+
+def _acumular(valores):
+    # Soma acumulada com zero à esquerda; inteiros ficam exatos em int64
+    dtype = np.int64 if np.issubdtype(valores.dtype, np.integer) else np.float64
+    acumulado = np.zeros(len(valores) + 1, dtype=dtype)
+    np.cumsum(valores, out=acumulado[1:])
+    return acumulado
+
+
+def calcular_janelas_moveis(df, chaves=("Trecho",), janelas=JANELAS_MESES, variaveis=VARIAVEIS_JANELA):
+    """
+    Acrescenta a cada evento as somas móveis (e contagens) das janelas que terminam no mês do evento.
+    """
+    validos = _eventos_validos(df, chaves)
+    completo = validos.all()
+    eventos = df if completo else df[validos]
+    ordem, chave, _, _, _, _ = _preparar(eventos, chaves, janelas)
+    fim = np.searchsorted(chave, chave, side="right")
+
+    resultado = df.copy()
+    acumulados = {var: _acumular(eventos[var].to_numpy()[ordem]) for var in variaveis}
+
+    def _atribuir(coluna, valores):
+        # Eventos sem data ou sem chave: janela vazia (NaN)
+        if not completo:
+            todas = np.full(len(df), np.nan)
+            todas[validos] = valores
+            valores = todas
+        resultado[coluna] = valores
+
+    for janela in janelas:
+        inicio = np.searchsorted(chave, chave - janela, side="right")
+        contagem = np.empty(len(eventos), dtype=np.int64)
+        contagem[ordem] = fim - inicio
+        _atribuir(f"Eventos_{janela}M", contagem)
+        for var, acumulado in acumulados.items():
+            soma = np.empty(len(eventos), dtype=acumulado.dtype)
+            soma[ordem] = acumulado[fim] - acumulado[inicio]
+            _atribuir(f"{var}_{janela}M", soma)
+    return resultado
+
+
+def agregar_por_ativo(df, chaves=("Trecho",), por_tipo=False, janelas=JANELAS_MESES,
+                      variaveis=VARIAVEIS_JANELA, data_referencia=None):
+    """
+    Uma linha por ativo com totais e janelas móveis terminando no mês de `data_referencia`
+    (por padrão, o mês do evento mais recente da base).
+    """
+    chaves = (("Ativo",) if por_tipo and "Ativo" not in chaves else ()) + tuple(chaves)
+    validos = _eventos_validos(df, chaves)
+    if not validos.all():
+        df = df[validos]
+    meses = _mes_absoluto(df["Data_Interrupcao"])
+    mes_referencia = int(meses.max()) if data_referencia is None else int(
+        _mes_absoluto(pd.Series([pd.Timestamp(data_referencia)]))[0])
+
+    ordem, chave, codigos, tabela, base, menor = _preparar(df, chaves, janelas, mes_referencia)
+    n_grupos = len(tabela)
+    grupos = np.arange(n_grupos, dtype=np.int64)
+    inicio_grupo = np.searchsorted(chave, grupos * base, side="left")
+    fim_grupo = np.searchsorted(chave, (grupos + 1) * base, side="left")
+
+    resultado = tabela.copy()
+    if "Ativo" not in chaves and "Ativo" in df.columns:
+        # Tipo do evento mais recente de cada ativo
+        resultado["Ativo"] = df["Ativo"].to_numpy()[ordem[fim_grupo - 1]]
+
+    # Totais no formato da base
+    resultado["Freq_Falhas"] = fim_grupo - inicio_grupo
+    if "Tempo_Operacao" in df.columns:
+        resultado["Tempo_Operacao"] = np.maximum.reduceat(
+            df["Tempo_Operacao"].to_numpy()[ordem], inicio_grupo)
+
+    acumulados = {var: _acumular(df[var].to_numpy()[ordem]) for var in variaveis}
+    for var, acumulado in acumulados.items():
+        resultado[var] = acumulado[fim_grupo] - acumulado[inicio_grupo]
+
+    # Janelas terminando no mês de referência
+    limite = grupos * base + (mes_referencia - menor)
+    fim = np.searchsorted(chave, limite, side="right")
+    for janela in janelas:
+        inicio = np.searchsorted(chave, limite - janela, side="right")
+        resultado[f"Eventos_{janela}M"] = fim - inicio
+        for var, acumulado in acumulados.items():
+            resultado[f"{var}_{janela}M"] = acumulado[fim] - acumulado[inicio]
+    return resultado
@@ -0,0 +1,148 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: derivar os pesos da análise de criticidade pelo AHP (Analytic Hierarchy Process),
+       a partir das comparações par a par de vários especialistas.
+
+    |> O que o Script Faz
+        Lê os julgamentos em formato longo (Especialista, Variavel_A, Variavel_B, Valor), onde Valor é a
+        importância de Variavel_A em relação a Variavel_B na escala de Saaty (1/9 a 9).
+        Monta um tensor especialistas x n x n de matrizes recíprocas.
+        Calcula o vetor de prioridades de todos os especialistas de uma vez, por iteração da potência em lote.
+        Calcula lambda_max, o índice de consistência (CI) e a razão de consistência (CR) de cada especialista:
+            CI = (lambda_max - n) / (n - 1)        CR = CI / RI(n)
+        Agrega os vetores dos especialistas consistentes (CR <= 0,10 por padrão) pela média geométrica.
+        Grava os pesos no formato de pesos_anal_criticidade.csv (Variavel,Peso).
+'''
+
+# Importar bibliotecas
+import os
+import numpy as np
+import pandas as pd
+
+# Caminhos para arquivos
+OUTPUT_PATH = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+JULGAMENTOS_FILE_PATH = os.path.join(OUTPUT_PATH, "julgamentos_ahp.csv")
+PESOS_FILE_PATH = os.path.join(OUTPUT_PATH, "pesos_anal_criticidade.csv")
+
+# Índice aleatório (RI) de Saaty por ordem da matriz
+INDICE_ALEATORIO = {1: 0.0, 2: 0.0, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24,
+                    7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49}
+
+LIMITE_CR = 0.10
+
+
+def montar_matrizes(julgamentos_df, variaveis=None):
+    """
+    Converte os julgamentos em um tensor (especialistas x n x n) de matrizes recíprocas.
+    """
+    if variaveis is None:
+        variaveis = sorted(set(julgamentos_df["Variavel_A"]) | set(julgamentos_df["Variavel_B"]))
+    especialistas = julgamentos_df["Especialista"].drop_duplicates().tolist()
+    n = len(variaveis)
+
+    e = pd.Index(especialistas).get_indexer(julgamentos_df["Especialista"])
+    i = pd.Index(variaveis).get_indexer(julgamentos_df["Variavel_A"])
+    j = pd.Index(variaveis).get_indexer(julgamentos_df["Variavel_B"])
+    if (i < 0).any() or (j < 0).any():
+        raise ValueError("Julgamentos com variáveis fora da lista informada.")
+
+    matrizes = np.full((len(especialistas), n, n), np.nan)
+    matrizes[:, np.arange(n), np.arange(n)] = 1.0
+    valores = julgamentos_df["Valor"].to_numpy(dtype=np.float64)
+    matrizes[e, i, j] = valores
+    matrizes[e, j, i] = 1.0 / valores
+
+    incompletos = np.isnan(matrizes).any(axis=(1, 2))
+    if incompletos.any():
+        faltantes = [especialistas[k] for k in np.flatnonzero(incompletos)]
+        raise ValueError(f"Comparações par a par incompletas para: {faltantes}")
+    return matrizes, especialistas, variaveis
+
+
+def calcular_prioridades(matrizes, max_iteracoes=1000, tolerancia=1e-12):
+    """
+    Vetor de prioridades (autovetor principal normalizado) e lambda_max de cada matriz,
+    por iteração da potência em lote.
+    """
+    n_matrizes, n, _ = matrizes.shape
+    vetores = np.full((n_matrizes, n), 1.0 / n)
+    for _ in range(max_iteracoes):
+        novos = np.einsum("eij,ej->ei", matrizes, vetores)
+        novos /= novos.sum(axis=1, keepdims=True)
+        convergiu = np.abs(novos - vetores).max() < tolerancia
+        vetores = novos
+        if convergiu:
+            break
+
+    lambda_max = (np.einsum("eij,ej->ei", matrizes, vetores) / vetores).mean(axis=1)
+    return vetores, lambda_max
+
+
+def razao_consistencia(lambda_max, n):
+    """
+    Razão de consistência de Saaty (CR) para matrizes de ordem n.
+    """
+    if n <= 2:
+        return np.zeros_like(lambda_max)
+    indice_consistencia = (lambda_max - n) / (n - 1)
+    return indice_consistencia / INDICE_ALEATORIO.get(n, 1.49)
+
+
+def agregar_geometricamente(prioridades, pesos_especialistas=None):
+    """
+    Agregação das prioridades individuais pela média geométrica (ponderada), normalizada.
+    """
+    if pesos_especialistas is None:
+        pesos_especialistas = np.ones(len(prioridades))
+    pesos_especialistas = np.asarray(pesos_especialistas, dtype=np.float64)
+    pesos_especialistas = pesos_especialistas / pesos_especialistas.sum()
+    agregado = np.exp(pesos_especialistas @ np.log(prioridades))
+    return agregado / agregado.sum()
+
+
+def derivar_pesos(julgamentos_df, variaveis=None, escala=100.0, limite_cr=LIMITE_CR):
+    """
+    Deriva os pesos pelo AHP. Retorna (pesos_df no formato Variavel,Peso, relatorio por especialista).
+    """
+    matrizes, especialistas, variaveis = montar_matrizes(julgamentos_df, variaveis)
+    prioridades, lambda_max = calcular_prioridades(matrizes)
+    cr = razao_consistencia(lambda_max, len(variaveis))
+
+    consistentes = cr <= limite_cr if limite_cr is not None else np.ones(len(cr), dtype=bool)
+    if not consistentes.any():
+        raise ValueError("Nenhum especialista com julgamentos consistentes (CR acima do limite).")
+
+    agregado = agregar_geometricamente(prioridades[consistentes])
+    pesos_df = pd.DataFrame({"Variavel": variaveis, "Peso": np.round(agregado * escala, 4)})
+
+    relatorio = pd.DataFrame(prioridades, columns=variaveis)
+    relatorio.insert(0, "Especialista", especialistas)
+    relatorio["Lambda_Max"] = lambda_max
+    relatorio["CR"] = cr
+    relatorio["Consistente"] = consistentes
+    return pesos_df, relatorio
+
+
+def salvar_pesos(pesos_df, pesos_path=PESOS_FILE_PATH):
+    """
+    Grava os pesos no formato de pesos_anal_criticidade.csv.
+    """
+    pesos_df.to_csv(pesos_path, index=False, encoding="utf-8")
+    print(f"Pesos AHP salvos em: {pesos_path}")
+
+
+# Script Principal
+if __name__ == "__main__":
+    if not os.path.exists(JULGAMENTOS_FILE_PATH):
+        print(f"Arquivo de julgamentos não encontrado: {JULGAMENTOS_FILE_PATH}")
+    else:
+        julgamentos_df = pd.read_csv(JULGAMENTOS_FILE_PATH)
+        pesos_df, relatorio = derivar_pesos(julgamentos_df)
+
+        print("Consistência dos Julgamentos por Especialista:\n")
+        print(relatorio[["Especialista", "Lambda_Max", "CR", "Consistente"]].to_string(index=False))
+        print("\nPesos Agregados (AHP):\n")
+        print(pesos_df.to_string(index=False))
+
+        salvar_pesos(pesos_df)
@@ -0,0 +1,230 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: análise de sensibilidade ("e se?") do Índice de Criticidade para milhares de cenários de pesos.
+
+    |> O que o Script Faz
+        Recebe uma matriz de pesos cenários x variáveis (uma linha por cenário, colunas com os nomes das variáveis).
+        Normaliza a base uma única vez (Min-Max, como em matriz_prioridade.py).
+        Calcula o índice de todos os cenários com um único produto matricial por bloco de linhas:
+            Indices_bloco = X_bloco (linhas x variáveis) @ W.T (variáveis x cenários)
+        O tamanho do bloco é escolhido para que a matriz linhas x cenários nunca seja materializada por inteiro.
+        Mantém, para cada cenário, apenas os K ativos mais críticos (empates resolvidos pela ordem da base).
+        Retorna:
+            Top-K de cada cenário.
+            Estatísticas de estabilidade por cenário em relação a um cenário de referência.
+            Frequência com que cada ativo aparece no Top-K e sua posição média.
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import os
+import instrumentacao
+from acesso_dados import carregar_base_compacta
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+pesos_file_path = os.path.join(output_path, "pesos_anal_criticidade.csv")
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+
+# Número máximo de elementos (linhas x cenários) materializados por bloco
+ELEMENTOS_POR_BLOCO = 1 << 24
+
+_SENTINELA = np.iinfo(np.int64).max
+
+
+def normalizar_variaveis(df, variaveis):
+    """
+    Retorna a matriz (linhas x variáveis) normalizada por Min-Max, como em matriz_prioridade.py.
+    """
+    if "Impacto_DEC_FEC" in variaveis and "Impacto_DEC_FEC" not in df.columns:
+        df = df.assign(Impacto_DEC_FEC=df["Impacto_DEC"] + df["Impacto_FEC"])
+
+    faltantes = [var for var in variaveis if var not in df.columns]
+    if faltantes:
+        raise ValueError(f"Variáveis faltantes na base de dados: {faltantes}")
+
+    matriz = np.empty((len(df), len(variaveis)), dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for j, var in enumerate(variaveis):
+            valores = df[var].to_numpy(dtype=np.float64)
+            minimo, maximo = np.nanmin(valores), np.nanmax(valores)
+            matriz[:, j] = (valores - minimo) / (maximo - minimo)
+    return matriz
+
+
+def gerar_cenarios_aleatorios(pesos_df, n_cenarios, variacao=0.25, semente=0):
+    """
+    Gera cenários perturbando multiplicativamente os pesos de referência
+    (fator lognormal com desvio `variacao`). O cenário 0 é o de referência.
+    """
+    rng = np.random.default_rng(semente)
+    pesos = pesos_df["Peso"].to_numpy(dtype=np.float64)
+    fatores = rng.lognormal(mean=0.0, sigma=variacao, size=(n_cenarios, len(pesos)))
+    fatores[0] = 1.0
+    cenarios = pd.DataFrame(pesos * fatores, columns=pesos_df["Variavel"].tolist())
+    cenarios.index.name = "Cenario"
+    return cenarios
+
+
+def _top_k_bloco(indices, inicio, k):
+    """
+    Seleciona os K maiores de cada linha de `indices` (cenários x linhas do bloco)
+    por seleção parcial. Empates no limiar ficam com as linhas de menor posição.
+    """
+    n_cenarios, n_linhas = indices.shape
+    posicoes = np.arange(inicio, inicio + n_linhas, dtype=np.int64)
+    if n_linhas <= k:
+        return indices, np.broadcast_to(posicoes, indices.shape)
+
+    limiar = -np.partition(-indices, k - 1, axis=1)[:, k - 1:k]
+    maiores = indices > limiar
+    iguais = indices == limiar
+    vagas = k - maiores.sum(axis=1, keepdims=True)
+    selecionados = maiores | (iguais & (np.cumsum(iguais, axis=1) <= vagas))
+
+    # Exatamente K selecionados por cenário, em ordem de posição
+    linhas, colunas = np.nonzero(selecionados)
+    return (indices[linhas, colunas].reshape(n_cenarios, k),
+            posicoes[colunas].reshape(n_cenarios, k))
+
+
+def _mesclar_top_k(valores_a, posicoes_a, valores_b, posicoes_b, k):
+    valores = np.concatenate([valores_a, valores_b], axis=1)
+    posicoes = np.concatenate([posicoes_a, posicoes_b], axis=1)
+    ordem = np.lexsort((posicoes, -valores), axis=1)[:, :k]
+    return (np.take_along_axis(valores, ordem, axis=1),
+            np.take_along_axis(posicoes, ordem, axis=1))
+
+
+def _mesclar_candidatos(melhores_valores, melhores_posicoes, cenarios, valores, posicoes, k):
+    """
+    Mescla candidatos esparsos (cenário, valor, posição) no Top-K corrente, in-place.
+    """
+    unicos, grupo_cand = np.unique(cenarios, return_inverse=True)
+    n_unicos = len(unicos)
+    grupo = np.concatenate([np.repeat(np.arange(n_unicos), k), grupo_cand])
+    valor = np.concatenate([melhores_valores[unicos].ravel(), valores])
+    posicao = np.concatenate([melhores_posicoes[unicos].ravel(), posicoes])
+
+    ordem = np.lexsort((posicao, -valor, grupo))
+    grupo_ordenado = grupo[ordem]
+    inicio_grupo = np.searchsorted(grupo_ordenado, grupo_ordenado, side="left")
+    manter = ordem[(np.arange(len(ordem)) - inicio_grupo) < k]
+
+    melhores_valores[unicos] = valor[manter].reshape(n_unicos, k)
+    melhores_posicoes[unicos] = posicao[manter].reshape(n_unicos, k)
+
+
+def avaliar_cenarios(df, cenarios_df, k=100, referencia=0, elementos_por_bloco=ELEMENTOS_POR_BLOCO):
+    """
+    Avalia todos os cenários de pesos (linhas de `cenarios_df`) sobre a base.
+
+    Retorna três DataFrames:
+        top_k: Cenario, Posicao, Linha, Trecho, Indice_Criticidade (K linhas por cenário).
+        estabilidade: por cenário, sobreposição/Jaccard do Top-K com o cenário de referência
+            e deslocamento médio de posição dos ativos em comum.
+        frequencia: por ativo, fração de cenários em que aparece no Top-K e posições média/melhor/pior.
+    """
+    variaveis = cenarios_df.columns.tolist()
+    pesos = cenarios_df.to_numpy(dtype=np.float64)
+    n_cenarios = len(pesos)
+    k = min(k, len(df))
+
+    # Normalização única
+    matriz = normalizar_variaveis(df, variaveis)
+    possui_nan = bool(np.isnan(matriz).any() or np.isnan(pesos).any())
+
+    melhores_valores = np.full((n_cenarios, k), -np.inf)
+    melhores_posicoes = np.full((n_cenarios, k), _SENTINELA, dtype=np.int64)
+
+    tamanho_bloco = max(k, elementos_por_bloco // max(n_cenarios, 1))
+    for inicio in range(0, len(matriz), tamanho_bloco):
+        bloco = matriz[inicio:inicio + tamanho_bloco]
+        indices = pesos @ bloco.T  # cenários x linhas do bloco
+        # NaN (variável constante) fica no fim do ranking, como no sort_values
+        if possui_nan:
+            indices[np.isnan(indices)] = -np.inf
+
+        # Cenários com Top-K ainda incompleto: seleção parcial sobre o bloco inteiro
+        incompletos = melhores_posicoes[:, -1] == _SENTINELA
+        if incompletos.any():
+            ativos = np.flatnonzero(incompletos)
+            valores, posicoes = _top_k_bloco(indices[ativos], inicio, k)
+            melhores_valores[ativos], melhores_posicoes[ativos] = _mesclar_top_k(
+                melhores_valores[ativos], melhores_posicoes[ativos], valores, posicoes, k)
+
+        # Demais cenários: só entram valores acima do K-ésimo atual (empates ficam
+        # com as linhas anteriores), o que costuma ser uma fração mínima do bloco
+        candidatos = indices > melhores_valores[:, -1:]
+        candidatos[incompletos] = False
+        cenarios, colunas = np.nonzero(candidatos)
+        if cenarios.size:
+            _mesclar_candidatos(melhores_valores, melhores_posicoes, cenarios,
+                                indices[cenarios, colunas], inicio + colunas, k)
+
+    # Top-K em formato longo
+    rotulos = df["Trecho"].to_numpy() if "Trecho" in df.columns else np.arange(len(df))
+    valores_saida = melhores_valores.copy()
+    valores_saida[np.isneginf(valores_saida)] = np.nan
+    top_k = pd.DataFrame({
+        "Cenario": np.repeat(cenarios_df.index.to_numpy(), k),
+        "Posicao": np.tile(np.arange(1, k + 1), n_cenarios),
+        "Linha": melhores_posicoes.ravel(),
+        "Trecho": rotulos[melhores_posicoes.ravel()],
+        "Indice_Criticidade": valores_saida.ravel(),
+    })
+
+    # Estabilidade em relação ao cenário de referência
+    ref = melhores_posicoes[referencia]
+    presente = np.isin(melhores_posicoes, ref)
+    comuns = presente.sum(axis=1)
+    posicao_ref = np.full(len(df), -1, dtype=np.int64)
+    posicao_ref[ref] = np.arange(k)
+    deslocamento = np.where(
+        presente, np.abs(posicao_ref[np.where(presente, melhores_posicoes, 0)] - np.arange(k)), 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        estabilidade = pd.DataFrame({
+            "Sobreposicao_TopK": comuns / k,
+            "Jaccard_TopK": comuns / (2 * k - comuns),
+            "Deslocamento_Medio": deslocamento.sum(axis=1) / comuns,
+        }, index=cenarios_df.index)
+
+    # Frequência de cada ativo no Top-K
+    linhas_top = melhores_posicoes.ravel()
+    posicoes_top = np.tile(np.arange(1, k + 1), n_cenarios)
+    frequencia = (
+        pd.DataFrame({"Linha": linhas_top, "Posicao": posicoes_top})
+        .groupby("Linha")["Posicao"]
+        .agg(Cenarios_TopK="size", Posicao_Media="mean", Melhor_Posicao="min", Pior_Posicao="max")
+        .reset_index()
+    )
+    frequencia.insert(1, "Trecho", rotulos[frequencia["Linha"].to_numpy()])
+    frequencia["Frequencia_TopK"] = frequencia["Cenarios_TopK"] / n_cenarios
+    frequencia = frequencia.sort_values(
+        ["Frequencia_TopK", "Posicao_Media"], ascending=[False, True], kind="stable")
+
+    return top_k, estabilidade, frequencia
+
+
+# Script Principal
+if __name__ == "__main__":
+    with instrumentacao.etapa("carregamento") as registro:
+        df = carregar_base_compacta(dados_path)
+        pesos_df = pd.read_csv(pesos_file_path)
+        registro["linhas"] = len(df)
+
+    cenarios_df = gerar_cenarios_aleatorios(pesos_df, n_cenarios=10_000)
+    with instrumentacao.etapa("avaliar_cenarios", linhas=len(df) * len(cenarios_df)):
+        top_k, estabilidade, frequencia = avaliar_cenarios(df, cenarios_df, k=20)
+
+    print("Estabilidade do Top-K em relação aos pesos de referência:\n")
+    print(estabilidade.describe().to_string())
+    print("\nAtivos mais frequentes no Top-K:\n")
+    print(frequencia.head(20).to_string(index=False))
+
+    resultado_path = os.path.join(output_path, "cenarios_top_k.csv")
+    top_k.to_csv(resultado_path, index=False)
+    print(f"\nResultados salvos em: {resultado_path}")
+    instrumentacao.emitir()
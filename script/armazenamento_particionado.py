@@ -0,0 +1,308 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: armazenar os eventos particionados por ano/mês e ler apenas as partições de um recorte.
+
+    |> O que o Script Faz
+        Reorganiza o cache colunar (acesso_dados.py) em partições por mês da Data_Interrupcao:
+            DADOS/.cache/interrupcoes_light.particoes/ano=2023/mes=04/dados.parquet
+            Eventos sem data ficam na partição sem_data (lida apenas quando não há filtro de datas).
+            A conversão é feita em blocos; cada bloco gravado vira um grupo de linhas com estatísticas próprias.
+        Um manifesto (manifesto.json) guarda, para cada partição, o número de linhas, o mínimo e o máximo de
+        cada coluna numérica e de data e os tipos de ativo presentes. As partições são reconstruídas apenas
+        quando o hash do CSV de origem muda (o mesmo controle do cache colunar).
+        Leitura com filtros (carregar_particoes):
+            inicio/fim   Intervalo de datas (fim inclusivo; uma data sem hora inclui o dia inteiro).
+            ativos       Tipos de ativo (coluna Ativo).
+            colunas      Subconjunto de colunas.
+        As partições cujas estatísticas não cruzam o filtro não são abertas; as que estão inteiramente dentro
+        do filtro são lidas sem filtro de linhas. Nas demais o filtro é aplicado na leitura (pyarrow), por
+        grupo de linhas e depois por linha.
+        carregar_base_filtrada é a entrada usada pelas etapas: sem filtros de data e de ativo, lê o cache
+        colunar inteiro como antes (carregar_base_compacta).
+
+    |> Uso
+        python armazenamento_particionado.py --inicio 2023-01-01 --fim 2023-06-30 --ativos Transformador Religador
+'''
+
+# Importar bibliotecas
+import argparse
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from acesso_dados import COLUNAS_CATEGORICAS, atualizar_cache, caminho_cache, carregar_base_compacta, \
+    compactar_tabela
+from instrumentacao import contar
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+
+# Versão do formato das partições: alterar invalida todas as partições existentes
+VERSAO_PARTICOES = 1
+
+COLUNA_DATA = "Data_Interrupcao"
+COLUNA_ATIVO = "Ativo"
+PARTICAO_SEM_DATA = "sem_data"
+ARQUIVO_PARTICAO = "dados.parquet"
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Linhas lidas do cache colunar por bloco na conversão
+TAMANHO_BLOCO_PARTICOES = 1 << 20
+
+
+def caminho_particoes(base_path):
+    """
+    Diretório das partições da base (ao lado do cache colunar).
+    """
+    parquet_path, _ = caminho_cache(base_path)
+    return os.path.splitext(parquet_path)[0] + ".particoes"
+
+
+def _ler_manifesto(diretorio):
+    caminho = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _valor_json(valor):
+    # Datas em ISO 8601; NaN (coluna sem valores) como None
+    if hasattr(valor, "isoformat"):
+        return pd.Timestamp(valor).isoformat()
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+class _EstatisticasParticao:
+    """
+    Linhas, extremos das colunas numéricas e de data e tipos de ativo de uma partição, acumulados por bloco.
+    """
+
+    def __init__(self, colunas):
+        self.colunas = colunas
+        self.linhas = 0
+        self.minimos = {}
+        self.maximos = {}
+        self.ativos = set()
+
+    def atualizar(self, tabela):
+        self.linhas += tabela.num_rows
+        for col in self.colunas:
+            extremos = pc.min_max(tabela.column(col))
+            minimo, maximo = extremos["min"].as_py(), extremos["max"].as_py()
+            if minimo is None:
+                continue
+            self.minimos[col] = minimo if col not in self.minimos else min(self.minimos[col], minimo)
+            self.maximos[col] = maximo if col not in self.maximos else max(self.maximos[col], maximo)
+        if COLUNA_ATIVO in tabela.schema.names:
+            self.ativos.update(v for v in pc.unique(tabela.column(COLUNA_ATIVO)).to_pylist() if v is not None)
+
+    def manifesto(self, nome):
+        return {
+            "particao": nome,
+            "arquivo": f"{nome}/{ARQUIVO_PARTICAO}",
+            "linhas": self.linhas,
+            "minimos": {col: _valor_json(v) for col, v in self.minimos.items()},
+            "maximos": {col: _valor_json(v) for col, v in self.maximos.items()},
+            "ativos": sorted(self.ativos),
+        }
+
+
+def _nome_particao(chave):
+    if chave < 0:
+        return PARTICAO_SEM_DATA
+    ano, mes = divmod(chave, 12)
+    return f"ano={ano:04d}/mes={mes + 1:02d}"
+
+
+def _chaves_mes(tabela):
+    # Mês absoluto (ano * 12 + mês - 1) de cada linha; -1 para eventos sem data
+    datas = tabela.column(COLUNA_DATA)
+    chaves = pc.add(pc.multiply(pc.year(datas), 12), pc.subtract(pc.month(datas), 1))
+    return pc.fill_null(chaves, -1).to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+def _converter_particoes(parquet_path, diretorio, tamanho_bloco):
+    """
+    Grava as partições ano/mês a partir do cache colunar, em blocos. Retorna as entradas do manifesto.
+    """
+    arquivo = pq.ParquetFile(parquet_path)
+    esquema = arquivo.schema_arrow
+    if COLUNA_DATA not in esquema.names:
+        raise KeyError(f"A coluna '{COLUNA_DATA}' é necessária para particionar a base.")
+    colunas_estatisticas = [campo.name for campo in esquema
+                            if pa.types.is_integer(campo.type) or pa.types.is_floating(campo.type)
+                            or pa.types.is_timestamp(campo.type)]
+
+    escritores = {}
+    estatisticas = {}
+    try:
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco):
+            tabela = pa.Table.from_batches([lote], schema=esquema)
+            chaves, inversos, contagens = np.unique(_chaves_mes(tabela), return_inverse=True, return_counts=True)
+            # Linhas agrupadas por mês (ordem estável): cada mês é uma fatia contígua do bloco
+            tabela = tabela.take(pa.array(np.argsort(inversos, kind="stable")))
+            inicio = 0
+            for chave, contagem in zip(chaves.tolist(), contagens.tolist()):
+                fatia = tabela.slice(inicio, contagem)
+                inicio += contagem
+                nome = _nome_particao(chave)
+                if nome not in escritores:
+                    os.makedirs(os.path.join(diretorio, nome), exist_ok=True)
+                    escritores[nome] = pq.ParquetWriter(os.path.join(diretorio, nome, ARQUIVO_PARTICAO), esquema)
+                    estatisticas[nome] = _EstatisticasParticao(colunas_estatisticas)
+                escritores[nome].write_table(fatia)
+                estatisticas[nome].atualizar(fatia)
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+    return [estatisticas[nome].manifesto(nome) for nome in sorted(estatisticas)]
+
+
+def atualizar_particoes(base_path, forcar=False, tamanho_bloco=TAMANHO_BLOCO_PARTICOES):
+    """
+    Garante que as partições ano/mês da base estão atualizadas e retorna (diretório, manifesto).
+    """
+    parquet_path, meta_path = atualizar_cache(base_path)[0], caminho_cache(base_path)[1]
+    with open(meta_path, encoding="utf-8") as arquivo:
+        sha256 = json.load(arquivo)["sha256"]
+
+    diretorio = caminho_particoes(base_path)
+    manifesto = _ler_manifesto(diretorio)
+    if (not forcar and manifesto is not None and manifesto.get("versao") == VERSAO_PARTICOES
+            and manifesto.get("sha256") == sha256):
+        contar("particoes_acertos")
+        return diretorio, manifesto
+
+    contar("particoes_falhas")
+    # Gravação em um diretório temporário, trocado pelo definitivo ao final
+    temporario = diretorio + ".tmp"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    manifesto = {
+        "versao": VERSAO_PARTICOES,
+        "sha256": sha256,
+        "coluna_data": COLUNA_DATA,
+        "particoes": _converter_particoes(parquet_path, temporario, tamanho_bloco),
+    }
+    with open(os.path.join(temporario, ARQUIVO_MANIFESTO), "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, indent=2, ensure_ascii=False)
+    shutil.rmtree(diretorio, ignore_errors=True)
+    os.replace(temporario, diretorio)
+    print(f"Partições por ano/mês atualizadas: {diretorio} ({len(manifesto['particoes'])} partições)")
+    return diretorio, manifesto
+
+
+def _intervalo(inicio, fim):
+    # Limites [inicio, fim_exclusivo); fim sem hora inclui o dia inteiro
+    inicio = None if inicio is None else pd.Timestamp(inicio)
+    if fim is not None:
+        fim = pd.Timestamp(fim)
+        fim = fim + pd.Timedelta(days=1) if fim == fim.normalize() else fim + pd.Timedelta(1, "ns")
+    return inicio, fim
+
+
+def selecionar_particoes(manifesto, inicio=None, fim=None, ativos=None):
+    """
+    Partições do manifesto que podem conter linhas do filtro, com o filtro de linhas de cada uma
+    (None quando a partição está inteiramente dentro do filtro).
+    """
+    inicio, fim = _intervalo(inicio, fim)
+    ativos = None if ativos is None else set(ativos)
+    selecionadas = []
+    for particao in manifesto["particoes"]:
+        filtros = []
+        if inicio is not None or fim is not None:
+            if particao["particao"] == PARTICAO_SEM_DATA:
+                continue
+            minimo = pd.Timestamp(particao["minimos"][COLUNA_DATA])
+            maximo = pd.Timestamp(particao["maximos"][COLUNA_DATA])
+            if (inicio is not None and maximo < inicio) or (fim is not None and minimo >= fim):
+                continue
+            if inicio is not None and minimo < inicio:
+                filtros.append((COLUNA_DATA, ">=", inicio))
+            if fim is not None and maximo >= fim:
+                filtros.append((COLUNA_DATA, "<", fim))
+        if ativos is not None:
+            presentes = set(particao["ativos"])
+            if not presentes & ativos:
+                continue
+            if not presentes <= ativos:
+                filtros.append((COLUNA_ATIVO, "in", sorted(ativos)))
+        selecionadas.append((particao, filtros or None))
+    return selecionadas
+
+
+def ler_particao(diretorio, particao, filtros=None, colunas=None, compacta=False):
+    """
+    Tabela Arrow de uma partição, com o filtro de linhas e as colunas pedidas.
+    compacta=True lê as colunas categóricas como dicionário (para compactar_tabela).
+    """
+    caminho = os.path.join(diretorio, particao["arquivo"])
+    nomes = pq.read_schema(caminho).names if colunas is None else list(colunas)
+    dicionario = [col for col in COLUNAS_CATEGORICAS if col in nomes] if compacta else None
+    return pq.read_table(caminho, columns=nomes, filters=filtros, read_dictionary=dicionario)
+
+
+def carregar_particoes(base_path, inicio=None, fim=None, ativos=None, colunas=None, impactos_float32=False):
+    """
+    Carrega (com tipos compactos) apenas as linhas do intervalo de datas e dos tipos de ativo pedidos,
+    abrindo somente as partições que podem contê-las.
+    """
+    diretorio, manifesto = atualizar_particoes(base_path)
+    selecionadas = selecionar_particoes(manifesto, inicio, fim, ativos)
+    contar("particoes_lidas", len(selecionadas))
+    contar("particoes_ignoradas", len(manifesto["particoes"]) - len(selecionadas))
+    if selecionadas:
+        tabela = pa.concat_tables([ler_particao(diretorio, particao, filtros, colunas, compacta=True)
+                                   for particao, filtros in selecionadas])
+    else:
+        # Tabela vazia com os mesmos tipos da leitura compacta (categóricas como dicionário)
+        esquema = pq.read_schema(atualizar_cache(base_path)[0])
+        nomes = esquema.names if colunas is None else list(colunas)
+        campos = [campo.with_type(pa.dictionary(pa.int32(), campo.type)) if campo.name in COLUNAS_CATEGORICAS
+                  else campo for campo in esquema]
+        tabela = pa.schema(campos).empty_table().select(nomes)
+    return compactar_tabela(tabela, impactos_float32)
+
+
+def carregar_base_filtrada(base_path, inicio=None, fim=None, ativos=None, colunas=None):
+    """
+    Carrega a base compacta, lendo das partições ano/mês quando há filtro de datas ou de ativos.
+    """
+    if inicio is None and fim is None and ativos is None:
+        return carregar_base_compacta(base_path, colunas)
+    return carregar_particoes(base_path, inicio, fim, ativos, colunas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partições ano/mês da base de interrupções.")
+    parser.add_argument("--base", default=dados_path)
+    parser.add_argument("--inicio")
+    parser.add_argument("--fim")
+    parser.add_argument("--ativos", nargs="+")
+    parser.add_argument("--colunas", nargs="+")
+    parser.add_argument("--forcar", action="store_true", help="Reconstrói as partições.")
+    args = parser.parse_args()
+
+    diretorio, manifesto = atualizar_particoes(args.base, forcar=args.forcar)
+    selecionadas = selecionar_particoes(manifesto, args.inicio, args.fim, args.ativos)
+    linhas = sum(particao["linhas"] for particao, _ in selecionadas)
+    print(f"{len(selecionadas)} de {len(manifesto['particoes'])} partições selecionadas "
+          f"(até {linhas} linhas).")
+    df = carregar_particoes(args.base, args.inicio, args.fim, args.ativos, args.colunas)
+    print(f"{len(df)} linhas carregadas.")
+    print(df.head(10).to_string(index=False))
+
+
+# Script Principal
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: medir o desempenho de cada etapa do estudo em bases de 10^3 a 10^8 registros.
+
+    |> O que o Script Faz
+        Gera bases reprodutíveis (semente fixa) com o esquema de gerar_base_simulada (versão vetorizada).
+        Mede, para cada tamanho de base:
+            geracao                Geração da base simulada (CSV).
+            cache_colunar          Conversão do CSV para o cache Parquet (acesso_dados.py).
+            carregamento           Leitura da base a partir do cache.
+            carregamento_compacto  Leitura com tipos compactos (categorias e inteiros reduzidos).
+            validar_pesos          Validação dos pesos contra o esquema da base.
+            criticidade_criterio   calcular_criticidade de criterio_definido_classificar_criticidade.py.
+            criticidade_matriz     calcular_criticidade de matriz_prioridade.py (Min-Max).
+            criticidade_streaming  calcular_criticidade_streaming (em blocos, fora da memória).
+            criticidade_particionada  Min-Max por partições em paralelo, com Top-K (processamento_particionado.py).
+            ranking_top_k          Top-K por seleção parcial (ranking_criticidade.py).
+            ranking_completo       Ordenação completa estável.
+            eda                    Estatísticas da EDA em uma passagem (estatisticas_eda.py).
+        Cada etapa executa em um processo Python novo: tempo de parede (melhor de N repetições),
+        vazão (linhas/s) e pico de memória residente (RSS) do processo.
+        Etapas que carregam a base inteira em memória são ignoradas acima de --max-linhas-memoria.
+        Os resultados são gravados em JSON; com --referencia, são comparados a uma execução anterior
+        e as regressões (tempo ou memória acima da tolerância) são listadas (código de saída 1).
+
+    |> Uso
+        python benchmark_desempenho.py --tamanhos 1e3 1e4 1e5 1e6 --saida benchmark.json
+        python benchmark_desempenho.py --tamanhos 1e3 1e5 --referencia benchmark.json --tolerancia 0.25
+'''
+
+# Importar bibliotecas
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+VERSAO_BENCHMARK = 1
+
+TAMANHOS_PADRAO = (10**3, 10**4, 10**5, 10**6, 10**7, 10**8)
+
+ETAPAS = ("geracao", "cache_colunar", "carregamento", "carregamento_compacto", "validar_pesos", "criticidade_criterio",
+          "criticidade_matriz", "criticidade_streaming", "criticidade_particionada", "ranking_top_k",
+          "ranking_completo", "eda")
+
+# Etapas que mantêm a base inteira em memória
+ETAPAS_EM_MEMORIA = {"carregamento", "carregamento_compacto", "criticidade_criterio", "criticidade_matriz",
+                     "criticidade_particionada",
+                     "ranking_top_k", "ranking_completo"}
+
+SEMENTE = 42
+TOP_K = 100
+PESOS_PADRAO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "DADOS", "pesos_anal_criticidade.csv")
+
+
+def _pico_rss_mb():
+    # ru_maxrss: kilobytes no Linux, bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+def _preparar_etapa(etapa, base_path, pesos_path, linhas, diretorio):
+    """
+    Executa a preparação da etapa (fora da medição) e retorna a função a ser medida.
+    """
+    import pandas as pd
+    from acesso_dados import atualizar_cache, carregar_base, carregar_base_compacta
+
+    pesos_df = pd.read_csv(pesos_path)
+
+    if etapa == "geracao":
+        from geracao_base_dados import gerar_base_simulada_vetorizada
+        return lambda: gerar_base_simulada_vetorizada(base_path, linhas, semente=SEMENTE)
+    if etapa == "cache_colunar":
+        return lambda: atualizar_cache(base_path, forcar=True)
+
+    atualizar_cache(base_path)
+    if etapa == "carregamento":
+        return lambda: carregar_base(base_path)
+    if etapa == "carregamento_compacto":
+        return lambda: carregar_base_compacta(base_path)
+    if etapa == "validar_pesos":
+        from pesos_analise_criticidade import validar_pesos
+        return lambda: validar_pesos(base_path, pesos_df)
+    if etapa == "criticidade_streaming":
+        from matriz_prioridade import calcular_criticidade_streaming
+        saida = os.path.join(diretorio, f"criticidade_{linhas}.csv")
+        return lambda: calcular_criticidade_streaming(base_path, pesos_df, saida)
+    if etapa == "eda":
+        from estatisticas_eda import calcular_estatisticas
+        return lambda: calcular_estatisticas(base_path)
+
+    df = carregar_base_compacta(base_path)
+    if etapa == "criticidade_criterio":
+        import criterio_definido_classificar_criticidade as criterio
+        return lambda: criterio.calcular_criticidade(df, pesos_df)
+    if etapa == "criticidade_matriz":
+        import matriz_prioridade
+        return lambda: matriz_prioridade.calcular_criticidade(df, pesos_df)
+    if etapa == "criticidade_particionada":
+        from processamento_particionado import calcular_criticidade_particionada
+        return lambda: calcular_criticidade_particionada(df, pesos_df, top_k=TOP_K)
+
+    from ranking_criticidade import ordenar_por_criticidade
+    import criterio_definido_classificar_criticidade as criterio
+    with contextlib.redirect_stdout(io.StringIO()):
+        criterio.calcular_criticidade(df, pesos_df)
+    if etapa == "ranking_top_k":
+        return lambda: ordenar_por_criticidade(df, "Criticidade_Calculada", TOP_K)
+    if etapa == "ranking_completo":
+        return lambda: ordenar_por_criticidade(df, "Criticidade_Calculada")
+    raise ValueError(f"Etapa desconhecida: {etapa}")
+
+
+def _medir_etapa(etapa, base_path, pesos_path, linhas, diretorio, repeticoes):
+    """
+    Executada em um processo novo: prepara a etapa e mede o melhor tempo de `repeticoes`.
+    """
+    os.environ["REDE_AEREA_HEADLESS"] = "1"
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcao = _preparar_etapa(etapa, base_path, pesos_path, linhas, diretorio)
+        rss_inicial = _pico_rss_mb()
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+    tempo = min(tempos)
+    return {
+        "etapa": etapa,
+        "linhas": linhas,
+        "tempo_s": tempo,
+        "linhas_por_s": linhas / tempo if tempo > 0 else None,
+        "pico_rss_mb": _pico_rss_mb(),
+        "rss_preparo_mb": rss_inicial,
+        "repeticoes": repeticoes,
+    }
+
+
+def _descrever_ambiente():
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+        "commit": commit,
+    }
+
+
+def executar_benchmark(tamanhos=TAMANHOS_PADRAO, etapas=ETAPAS, diretorio=None, pesos_path=PESOS_PADRAO_PATH,
+                       repeticoes=1, max_linhas_memoria=2 * 10**7, reusar_bases=False):
+    """
+    Mede as etapas para cada tamanho de base. Retorna o dicionário gravado em JSON.
+    """
+    diretorio = diretorio or tempfile.mkdtemp(prefix="benchmark_rede_aerea_")
+    os.makedirs(diretorio, exist_ok=True)
+    contexto = multiprocessing.get_context("spawn")
+    resultados = []
+
+    for linhas in tamanhos:
+        base_path = os.path.join(diretorio, f"base_{linhas}.csv")
+        for etapa in etapas:
+            if etapa == "geracao" and reusar_bases and os.path.exists(base_path):
+                continue
+            if etapa in ETAPAS_EM_MEMORIA and linhas > max_linhas_memoria:
+                resultados.append({"etapa": etapa, "linhas": linhas, "ignorada": "acima de max_linhas_memoria"})
+                print(f"{linhas:>12d}  {etapa:24s} ignorada (em memória)")
+                continue
+            if etapa != "geracao" and not os.path.exists(base_path):
+                from geracao_base_dados import gerar_base_simulada_vetorizada
+                with contextlib.redirect_stdout(io.StringIO()):
+                    gerar_base_simulada_vetorizada(base_path, linhas, semente=SEMENTE)
+
+            # Processo novo por etapa: pico de RSS e importações isolados
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+                resultado = executor.submit(_medir_etapa, etapa, base_path, pesos_path, linhas,
+                                            diretorio, repeticoes).result()
+            resultados.append(resultado)
+            print(f"{linhas:>12d}  {etapa:24s} {resultado['tempo_s']:10.3f} s  "
+                  f"{resultado['linhas_por_s']:14.0f} linhas/s  {resultado['pico_rss_mb']:9.1f} MB")
+
+    return {
+        "versao": VERSAO_BENCHMARK,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "ambiente": _descrever_ambiente(),
+        "resultados": resultados,
+    }
+
+
+def comparar_com_referencia(atual, referencia, tolerancia=0.25, tempo_minimo_s=0.05):
+    """
+    Lista as regressões de tempo ou de pico de memória acima da tolerância (fração) em relação à referência.
+    Tempos abaixo de `tempo_minimo_s` na referência não são comparados (ruído de medição).
+    """
+    indice = {(r["etapa"], r["linhas"]): r for r in referencia["resultados"] if "tempo_s" in r}
+    regressoes = []
+    for r in atual["resultados"]:
+        ref = indice.get((r["etapa"], r["linhas"]))
+        if ref is None or "tempo_s" not in r:
+            continue
+        for metrica in ("tempo_s", "pico_rss_mb"):
+            if metrica == "tempo_s" and ref[metrica] < tempo_minimo_s:
+                continue
+            razao = r[metrica] / ref[metrica] if ref[metrica] else float("inf")
+            if razao > 1 + tolerancia:
+                regressoes.append({"etapa": r["etapa"], "linhas": r["linhas"], "metrica": metrica,
+                                   "referencia": ref[metrica], "atual": r[metrica], "razao": razao})
+    return regressoes
+
+
+def salvar_resultados(resultados, saida_path):
+    temporario = saida_path + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(resultados, arquivo, indent=2)
+    os.replace(temporario, saida_path)
+    print(f"\nResultados salvos em: {saida_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do estudo de criticidade.")
+    parser.add_argument("--tamanhos", nargs="+", type=float, default=TAMANHOS_PADRAO,
+                        help="Números de registros (aceita notação 1e6).")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=ETAPAS)
+    parser.add_argument("--diretorio", help="Diretório para as bases geradas (padrão: temporário).")
+    parser.add_argument("--pesos", default=PESOS_PADRAO_PATH)
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--max-linhas-memoria", type=float, default=2e7)
+    parser.add_argument("--reusar-bases", action="store_true")
+    parser.add_argument("--saida", default="benchmark_desempenho.json")
+    parser.add_argument("--referencia", help="JSON de uma execução anterior para comparação.")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    resultados = executar_benchmark(
+        tamanhos=[int(t) for t in args.tamanhos], etapas=args.etapas, diretorio=args.diretorio,
+        pesos_path=args.pesos, repeticoes=args.repeticoes,
+        max_linhas_memoria=int(args.max_linhas_memoria), reusar_bases=args.reusar_bases)
+    salvar_resultados(resultados, args.saida)
+
+    if args.referencia:
+        with open(args.referencia, encoding="utf-8") as arquivo:
+            referencia = json.load(arquivo)
+        regressoes = comparar_com_referencia(resultados, referencia, args.tolerancia)
+        if regressoes:
+            print(f"\nRegressões (tolerância de {args.tolerancia:.0%}):")
+            for r in regressoes:
+                print(f"  {r['etapa']:24s} {r['linhas']:>12d}  {r['metrica']:12s} "
+                      f"{r['referencia']:.3f} -> {r['atual']:.3f} ({r['razao']:.2f}x)")
+            return 1
+        print("\nNenhuma regressão em relação à referência.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
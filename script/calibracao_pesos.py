@@ -0,0 +1,318 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: calibrar os pesos de pesos_anal_criticidade.csv contra a criticidade observada (Criticidade_REAL).
+
+    |> O que o Script Faz
+        Ajusta pesos não negativos para que a soma ponderada das variáveis (como em nucleo_criticidade.py)
+        reproduza Criticidade_REAL:
+            metodo="nnls"   mínimos quadrados não negativos (Lawson-Hanson).
+            metodo="ridge"  mínimos quadrados não negativos com penalização ridge; lambda escolhido por validação
+                            cruzada entre LAMBDAS_RIDGE (penalização sobre as variáveis padronizadas).
+            normalizacao="bruta" (criterio_definido_classificar_criticidade.py) ou "minmax" (matriz_prioridade.py).
+        Uma única passagem pela base, em blocos, acumula as equações normais (X'X, X'y, y'y, somas, mínimos e
+        máximos) separadas por dobra da validação cruzada:
+            Os grupos de linhas do cache colunar (ou as partições ano/mês, com filtros) são processados em paralelo
+            e os acumuladores são somados na ordem das tarefas.
+            A dobra de cada linha vem de um hash da sua posição na tarefa: não depende do número de processos.
+            O Min-Max é uma transformação afim, aplicada depois sobre as equações acumuladas (extremos globais).
+        Validação cruzada em k dobras sem reajustar sobre a base: o treino da dobra f usa as equações totais
+        menos as da dobra f, e o erro de validação vem das equações da própria dobra (y'y - 2w'X'y + w'X'Xw).
+        Todos os sistemas são k x k (k = número de variáveis): o custo das dobras e dos lambdas não depende
+        do número de linhas.
+        Grava os pesos escolhidos no formato de pesos_anal_criticidade.csv (Variavel,Peso).
+
+    |> Uso
+        python calibracao_pesos.py --metodo ridge --normalizacao bruta --dobras 5 --processos 8
+'''
+
+# Importar bibliotecas
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import instrumentacao
+from concurrent.futures import ProcessPoolExecutor
+from acesso_dados import atualizar_cache, colunas_base
+from armazenamento_particionado import atualizar_particoes, ler_particao, selecionar_particoes
+from normalizacao_robusta import colunas_bloco, colunas_leitura
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+pesos_file_path = os.path.join(output_path, "pesos_anal_criticidade.csv")
+
+COLUNA_ALVO = "Criticidade_REAL"
+METODOS = ("nnls", "ridge")
+NORMALIZACOES = ("bruta", "minmax")
+
+N_DOBRAS = 5
+LAMBDAS_RIDGE = (0.0, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+# Linhas por bloco no acúmulo das equações normais
+TAMANHO_BLOCO_CALIBRACAO = 1 << 16
+
+# Constante multiplicativa do hash das posições (razão áurea em 64 bits)
+_HASH_DOBRA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def dobras_linhas(tarefa, inicio, n, n_dobras):
+    """
+    Dobra de cada linha a partir de um hash de (tarefa, posição na tarefa).
+    """
+    posicoes = (np.uint64(tarefa) << np.uint64(40)) + np.arange(inicio, inicio + n, dtype=np.uint64)
+    return ((posicoes * _HASH_DOBRA) >> np.uint64(33)) % np.uint64(n_dobras)
+
+
+class EquacoesNormais:
+    """
+    Equações normais acumuladas por dobra: X'X, X'y, y'y, somas de X e de y, contagens e extremos de X.
+    """
+
+    def __init__(self, n_variaveis, n_dobras=N_DOBRAS):
+        k = n_variaveis
+        self.n_dobras = n_dobras
+        self.n = np.zeros(n_dobras)
+        self.xtx = np.zeros((n_dobras, k, k))
+        self.xty = np.zeros((n_dobras, k))
+        self.yty = np.zeros(n_dobras)
+        self.soma_x = np.zeros((n_dobras, k))
+        self.soma_y = np.zeros(n_dobras)
+        self.minimos = np.full(k, np.inf)
+        self.maximos = np.full(k, -np.inf)
+
+    def atualizar(self, x, y, dobras):
+        """
+        Incorpora um bloco: x (linhas x variáveis), y e a dobra de cada linha. Linhas com NaN são ignoradas.
+        """
+        if len(x):
+            self.minimos = np.fmin(self.minimos, np.nanmin(np.where(np.isnan(x), np.inf, x), axis=0))
+            self.maximos = np.fmax(self.maximos, np.nanmax(np.where(np.isnan(x), -np.inf, x), axis=0))
+        completas = ~(np.isnan(x).any(axis=1) | np.isnan(y))
+        x, y, dobras = x[completas], y[completas], dobras[completas]
+        for f in range(self.n_dobras):
+            na_dobra = dobras == f
+            xf, yf = x[na_dobra], y[na_dobra]
+            self.n[f] += len(yf)
+            self.xtx[f] += xf.T @ xf
+            self.xty[f] += xf.T @ yf
+            self.yty[f] += yf @ yf
+            self.soma_x[f] += xf.sum(axis=0)
+            self.soma_y[f] += yf.sum()
+        return self
+
+    def mesclar(self, outro):
+        for nome in ("n", "xtx", "xty", "yty", "soma_x", "soma_y"):
+            setattr(self, nome, getattr(self, nome) + getattr(outro, nome))
+        self.minimos = np.fmin(self.minimos, outro.minimos)
+        self.maximos = np.fmax(self.maximos, outro.maximos)
+        return self
+
+    def sistema(self, dobras, normalizacao="bruta"):
+        """
+        (X'X, X'y, y'y, n) das dobras indicadas, nas variáveis brutas ou Min-Max (extremos globais).
+        """
+        n = self.n[dobras].sum()
+        xtx, xty, yty = self.xtx[dobras].sum(axis=0), self.xty[dobras].sum(axis=0), self.yty[dobras].sum()
+        if normalizacao == "minmax":
+            # X_norm = (X - 1 m') D^-1, com m = mínimos e D = diag(máximo - mínimo)
+            m = self.minimos
+            s = self.soma_x[dobras].sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                inversa = 1.0 / (self.maximos - self.minimos)
+            inversa[~np.isfinite(inversa)] = 0.0
+            xtx = (xtx - np.outer(s, m) - np.outer(m, s) + n * np.outer(m, m)) * np.outer(inversa, inversa)
+            xty = (xty - m * self.soma_y[dobras].sum()) * inversa
+        return xtx, xty, yty, n
+
+
+def resolver_nnls(xtx, xty, tolerancia=1e-10, max_iteracoes=None):
+    """
+    Mínimos quadrados não negativos (Lawson-Hanson) sobre as equações normais: min w'X'Xw/2 - w'X'y, w >= 0.
+    """
+    k = len(xty)
+    w = np.zeros(k)
+    passivo = np.zeros(k, dtype=bool)
+    limite = tolerancia * max(1.0, np.abs(xty).max(initial=0.0))
+    for _ in range(max_iteracoes or 3 * k):
+        gradiente = xty - xtx @ w
+        candidatos = ~passivo & (gradiente > limite)
+        if not candidatos.any():
+            break
+        passivo[np.argmax(np.where(candidatos, gradiente, -np.inf))] = True
+        while True:
+            s = np.zeros(k)
+            indices = np.flatnonzero(passivo)
+            s[indices] = np.linalg.lstsq(xtx[np.ix_(indices, indices)], xty[indices], rcond=None)[0]
+            if (s[indices] > 0).all():
+                w = s
+                break
+            # Passo até a primeira variável que se anula; ela sai do conjunto passivo
+            negativos = passivo & (s <= 0)
+            alfa = np.min(w[negativos] / (w[negativos] - s[negativos]))
+            w = w + alfa * (s - w)
+            passivo &= w > tolerancia
+            w[~passivo] = 0.0
+    return w
+
+
+def resolver(xtx, xty, n, lambda_ridge=0.0):
+    """
+    Pesos não negativos com penalização ridge lambda * n * ||D w||², D = desvio (raiz da diagonal de X'X / n).
+    """
+    escala = np.sqrt(np.diag(xtx) / max(n, 1.0))
+    escala[escala == 0] = 1.0
+    # Variáveis padronizadas (u = D w) melhoram o condicionamento e tornam o lambda comparável entre variáveis
+    xtx_p = xtx / np.outer(escala, escala) + lambda_ridge * n * np.eye(len(xty))
+    return resolver_nnls(xtx_p, xty / escala) / escala
+
+
+def _erro_quadratico(w, xtx, xty, yty):
+    return max(yty - 2.0 * w @ xty + w @ xtx @ w, 0.0)
+
+
+def validacao_cruzada(equacoes, normalizacao="bruta", lambdas=(0.0,)):
+    """
+    Erro de validação (RMSE) de cada lambda em k dobras, sem reajustar sobre a base.
+    """
+    todas = np.arange(equacoes.n_dobras)
+    linhas = []
+    for lambda_ridge in lambdas:
+        sse = np.zeros(equacoes.n_dobras)
+        for f in todas:
+            xtx, xty, _, n = equacoes.sistema(todas != f, normalizacao)
+            w = resolver(xtx, xty, n, lambda_ridge)
+            xtx, xty, yty, _ = equacoes.sistema(todas == f, normalizacao)
+            sse[f] = _erro_quadratico(w, xtx, xty, yty)
+        linhas.append({"Lambda": lambda_ridge,
+                       "RMSE_Validacao": np.sqrt(sse.sum() / max(equacoes.n.sum(), 1.0)),
+                       **{f"RMSE_Dobra_{f + 1}": np.sqrt(sse[f] / max(equacoes.n[f], 1.0)) for f in todas}})
+    return pd.DataFrame(linhas)
+
+
+def equacoes_do_df(df, variaveis, alvo=COLUNA_ALVO, n_dobras=N_DOBRAS, tamanho_bloco=TAMANHO_BLOCO_CALIBRACAO,
+                   tarefa=0, equacoes=None):
+    """
+    Acumula, em blocos, as equações normais das variáveis de um DataFrame.
+    """
+    if equacoes is None:
+        equacoes = EquacoesNormais(len(variaveis), n_dobras)
+    for inicio in range(0, len(df), tamanho_bloco):
+        bloco = df.iloc[inicio:inicio + tamanho_bloco]
+        x = np.column_stack([np.asarray(c, dtype=np.float64) for c in colunas_bloco(bloco, variaveis)])
+        y = bloco[alvo].to_numpy(dtype=np.float64, na_value=np.nan)
+        equacoes.atualizar(x, y, dobras_linhas(tarefa, inicio, len(bloco), n_dobras))
+    return equacoes
+
+
+def _equacoes_grupo(parquet_path, grupo, variaveis, alvo, n_dobras):
+    """
+    Tarefa dos processos: equações normais de um grupo de linhas do cache colunar.
+    """
+    bloco = pq.ParquetFile(parquet_path).read_row_group(grupo, columns=colunas_leitura(variaveis) + [alvo])
+    return equacoes_do_df(bloco.to_pandas(), variaveis, alvo, n_dobras, tarefa=grupo)
+
+
+def _equacoes_particao(diretorio, tarefa, variaveis, alvo, n_dobras):
+    """
+    Tarefa dos processos: equações normais de uma partição ano/mês (com o filtro de linhas).
+    """
+    indice, (particao, filtros) = tarefa
+    tabela = ler_particao(diretorio, particao, filtros, colunas_leitura(variaveis) + [alvo])
+    return equacoes_do_df(tabela.to_pandas(), variaveis, alvo, n_dobras, tarefa=indice)
+
+
+def equacoes_da_base(base_path, variaveis, alvo=COLUNA_ALVO, n_dobras=N_DOBRAS, n_processos=1,
+                     inicio=None, fim=None, ativos=None):
+    """
+    Equações normais sobre a base (via cache colunar), por grupo de linhas e em paralelo.
+    Com inicio/fim/ativos, apenas as partições ano/mês do recorte são lidas.
+    """
+    if alvo not in colunas_base(base_path):
+        raise KeyError(f"A coluna '{alvo}' (criticidade observada) não existe na base.")
+    if inicio is None and fim is None and ativos is None:
+        tarefa = _equacoes_grupo
+        fonte, _ = atualizar_cache(base_path)
+        unidades = list(range(pq.ParquetFile(fonte).num_row_groups))
+    else:
+        tarefa = _equacoes_particao
+        fonte, manifesto = atualizar_particoes(base_path)
+        unidades = list(enumerate(selecionar_particoes(manifesto, inicio, fim, ativos)))
+
+    argumentos = ([fonte] * len(unidades), unidades, [list(variaveis)] * len(unidades),
+                  [alvo] * len(unidades), [n_dobras] * len(unidades))
+    if n_processos > 1 and len(unidades) > 1:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            parciais = list(executor.map(tarefa, *argumentos))
+    else:
+        parciais = list(map(tarefa, *argumentos))
+
+    total = EquacoesNormais(len(variaveis), n_dobras)
+    for parcial in parciais:
+        total.mesclar(parcial)
+    return total
+
+
+def calibrar_pesos(equacoes, variaveis, metodo="nnls", normalizacao="bruta", lambdas=LAMBDAS_RIDGE):
+    """
+    Escolhe o lambda pela validação cruzada e ajusta os pesos em todas as linhas.
+    Retorna (pesos_df no formato Variavel,Peso, relatório da validação cruzada).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo} (opções: {METODOS})")
+    if normalizacao not in NORMALIZACOES:
+        raise ValueError(f"Normalização desconhecida: {normalizacao} (opções: {NORMALIZACOES})")
+    if equacoes.n.sum() == 0:
+        raise ValueError("Nenhuma linha completa (variáveis e criticidade observada) para a calibração.")
+
+    relatorio = validacao_cruzada(equacoes, normalizacao, lambdas if metodo == "ridge" else (0.0,))
+    melhor = relatorio.loc[relatorio["RMSE_Validacao"].idxmin(), "Lambda"]
+    todas = np.ones(equacoes.n_dobras, dtype=bool)
+    xtx, xty, _, n = equacoes.sistema(todas, normalizacao)
+    pesos = resolver(xtx, xty, n, melhor)
+    relatorio["Escolhido"] = relatorio["Lambda"] == melhor
+    return pd.DataFrame({"Variavel": list(variaveis), "Peso": np.round(pesos, 6)}), relatorio
+
+
+def salvar_pesos(pesos_df, pesos_path=pesos_file_path):
+    """
+    Grava os pesos no formato de pesos_anal_criticidade.csv.
+    """
+    pesos_df.to_csv(pesos_path, index=False, encoding="utf-8")
+    print(f"Pesos calibrados salvos em: {pesos_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibração dos pesos contra a criticidade observada.")
+    parser.add_argument("--base", default=dados_path)
+    parser.add_argument("--pesos", default=pesos_file_path, help="Pesos atuais (define as variáveis).")
+    parser.add_argument("--saida", default=pesos_file_path)
+    parser.add_argument("--metodo", choices=METODOS, default="nnls")
+    parser.add_argument("--normalizacao", choices=NORMALIZACOES, default="bruta")
+    parser.add_argument("--dobras", type=int, default=N_DOBRAS)
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--inicio")
+    parser.add_argument("--fim")
+    parser.add_argument("--ativos", nargs="+")
+    args = parser.parse_args()
+
+    variaveis = pd.read_csv(args.pesos)["Variavel"].tolist()
+    with instrumentacao.etapa("equacoes_normais") as registro:
+        equacoes = equacoes_da_base(args.base, variaveis, n_dobras=args.dobras, n_processos=args.processos,
+                                    inicio=args.inicio, fim=args.fim, ativos=args.ativos)
+        registro["linhas"] = int(equacoes.n.sum())
+    with instrumentacao.etapa("calibracao"):
+        pesos_df, relatorio = calibrar_pesos(equacoes, variaveis, args.metodo, args.normalizacao)
+
+    print("Validação cruzada:\n")
+    print(relatorio.to_string(index=False))
+    print("\nPesos calibrados:\n")
+    print(pesos_df.to_string(index=False))
+    salvar_pesos(pesos_df, args.saida)
+    instrumentacao.emitir()
+
+
+# Script Principal
+if __name__ == "__main__":
+    main()
@@ -10,15 +10,29 @@
             1. Carregar dados e pesos externos.
             2. Validação automática entre pesos e colunas do DataFrame.
             3. Cálculo do Índice de Criticidade, incluindo Impacto_FEC.
+               A soma ponderada é feita pelo núcleo comum nucleo_criticidade.py (o mesmo da matriz de priorização).
             4. Visualizações interativas: mapa de calor, comparação entre criticidade calculada e real, ranking e tabela interativa.
+               Os gráficos respeitam o orçamento de pontos de visualizacao_escalavel.py (Top-N barras, tabela paginada).
+               No modo headless (REDE_AEREA_HEADLESS=1) apenas o cálculo é feito e o Plotly não é importado.
+               Com REDE_AEREA_RELATORIO, as figuras vão para um único relatório HTML (relatorio_html.py).
+            5. Recorte opcional da base na carga (inicio, fim, ativos, colunas): apenas as partições ano/mês
+               que cruzam o filtro são lidas (armazenamento_particionado.py).
+            6. Resultado gravado por exportacao_resultados.py: apenas chaves do ativo, índice e posição
+               (Parquet por padrão) e um resumo com os primeiros do ranking.
 '''
 
 # Importar bibliotecas
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
 import os
+import instrumentacao
+import relatorio_html
+from armazenamento_particionado import carregar_base_filtrada
+from exportacao_resultados import exportar_resultados
+from nucleo_criticidade import calcular_pontuacao, colunas_variaveis
+from ranking_criticidade import ordenar_por_criticidade
+from topologia_rede import juntar_topologia_pesos
+from visualizacao_escalavel import ORCAMENTO_PONTOS, graficos_habilitados, selecionar_top_n, tabela_paginada
 
 # Caminho dos arquivos
 output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
@@ -28,9 +42,12 @@ base_dados_path = os.path.join(output_path, "interrupcoes_light.csv")
 # 1. Carregar os Dados e Pesos
 
 
-def carregar_dados_pesos(base_path, pesos_path):
-    df = pd.read_csv(base_path)
+def carregar_dados_pesos(base_path, pesos_path, inicio=None, fim=None, ativos=None, colunas=None):
+    # Filtros opcionais: intervalo de datas (fim inclusivo), tipos de ativo e subconjunto de colunas
+    df = carregar_base_filtrada(base_path, inicio, fim, ativos, colunas)
     pesos_df = pd.read_csv(pesos_path)
+    # Métricas de topologia (topologia_rede.py) citadas nos pesos
+    df = juntar_topologia_pesos(df, pesos_df, base_path)
     print("Base de dados e pesos carregados com sucesso!")
     return df, pesos_df
 
@@ -50,17 +67,25 @@ def validar_pesos(df, pesos_df):
 # 3. Calcular Criticidade com Pesos
 
 
-def calcular_criticidade(df, pesos_df):
+def calcular_criticidade(df, pesos_df, top_k=None):
+    # top_k: retorna apenas os K ativos mais críticos (seleção parcial, mesma ordem da ordenação completa)
+    # Soma ponderada dos valores brutos pelo núcleo comum (nucleo_criticidade.py)
     pesos_dict = dict(zip(pesos_df["Variavel"], pesos_df["Peso"]))
-    df["Criticidade_Calculada"] = sum(
-        df[var] * pesos_dict.get(var, 0) for var in pesos_dict
+    df["Criticidade_Calculada"] = calcular_pontuacao(
+        colunas_variaveis(df, pesos_dict), list(pesos_dict.values()), normalizacao="bruta"
     )
-    return df.sort_values(by="Criticidade_Calculada", ascending=False)
+    return ordenar_por_criticidade(df, "Criticidade_Calculada", top_k)
 
 # 4. Visualizações dos Resultados
 
 
-def gerar_graficos(df):
+def gerar_graficos(df, orcamento_barras=None, orcamento_tabela=None):
+    # Plotly importado apenas aqui: o cálculo da criticidade não depende de bibliotecas gráficas
+    import plotly.express as px
+
+    # Apenas os ativos mais críticos são enviados aos gráficos de barras e à tabela
+    top_df = selecionar_top_n(df, "Criticidade_Calculada", orcamento_barras)
+
     # Gráfico 1: Heatmap de Correlação (excluindo colunas não numéricas)
     colunas_numericas = df.select_dtypes(include=[np.number]).columns.tolist()
     corr_matrix = df[colunas_numericas].corr()
@@ -68,69 +93,82 @@ def gerar_graficos(df):
         corr_matrix, text_auto=True, color_continuous_scale="RdBu_r",
         title="Correlação entre Variáveis", labels=dict(color="Correlação")
     )
-    fig_heatmap.show()
+    relatorio_html.exibir(fig_heatmap, "Criticidade")
 
     # Gráfico 2: Comparacão entre Criticidade Calculada e Real
     if "Criticidade_REAL" in df.columns:
         fig_comparativo = px.bar(
-            df, x="Ativo", y=["Criticidade_Calculada", "Criticidade_REAL"],
+            top_df, x="Ativo", y=["Criticidade_Calculada", "Criticidade_REAL"],
             title="Comparacão entre Criticidade Calculada e Real",
             barmode="group", labels={"value": "Criticidade", "variable": "Tipo"},
             text_auto=True
         )
-        fig_comparativo.show()
+        relatorio_html.exibir(fig_comparativo, "Criticidade")
 
     # Gráfico 3: Ranking dos Ativos
     fig_ranking = px.bar(
-        df, x="Ativo", y="Criticidade_Calculada",
+        top_df, x="Ativo", y="Criticidade_Calculada",
         title="Ranking dos Ativos pela Criticidade Calculada",
         text="Criticidade_Calculada",
         labels={"Criticidade_Calculada": "Índice de Criticidade"}
     )
     fig_ranking.update_traces(
         texttemplate='%{text:.2f}', textposition='outside')
-    fig_ranking.show()
-
-    # Gráfico 4: Tabela Interativa
-    fig_table = go.Figure(
-        data=[go.Table(
-            columnwidth=[10, 5, 5, 5, 5, 5],
-            header=dict(values=[
-                "<b>Ativo</b>", "<b>Freq. Falhas</b>", "<b>Tempo Operação</b>",
-                "<b>Impacto DEC</b>", "<b>Impacto FEC</b>", "<b>Criticidade Calculada</b>"
-            ], fill_color='lightgrey', line_color='darkslategray', align='center', font=dict(size=12, color='black')),
-            cells=dict(values=[
-                df["Ativo"], df["Freq_Falhas"], df["Tempo_Operacao"],
-                df["Impacto_DEC"], df["Impacto_FEC"], np.round(
-                    df["Criticidade_Calculada"], 2)
-            ], fill_color='white', line_color='darkslategray', align='center', font=dict(size=12, color='black'))
-        )]
-    )
-    fig_table.update_layout(
-        title_text="Tabela de Criticidade dos Ativos", title_x=0.5, margin=dict(l=10, r=10, t=50, b=10), width=800
+    relatorio_html.exibir(fig_ranking, "Criticidade")
+
+    # Gráfico 4: Tabela Interativa (paginada, primeiras linhas do ranking)
+    orcamento_tabela = orcamento_tabela or ORCAMENTO_PONTOS["tabela"]
+    tabela_df = selecionar_top_n(df, "Criticidade_Calculada", orcamento_tabela)
+    fig_table = tabela_paginada(
+        colunas=[
+            tabela_df["Ativo"], tabela_df["Freq_Falhas"], tabela_df["Tempo_Operacao"],
+            tabela_df["Impacto_DEC"], tabela_df["Impacto_FEC"], np.round(
+                tabela_df["Criticidade_Calculada"], 2)
+        ],
+        cabecalhos=[
+            "<b>Ativo</b>", "<b>Freq. Falhas</b>", "<b>Tempo Operação</b>",
+            "<b>Impacto DEC</b>", "<b>Impacto FEC</b>", "<b>Criticidade Calculada</b>"
+        ],
+        titulo="Tabela de Criticidade dos Ativos",
+        total_linhas=len(df),
+        columnwidth=[10, 5, 5, 5, 5, 5],
+        estilo_cabecalho=dict(fill_color='lightgrey', line_color='darkslategray',
+                              align='center', font=dict(size=12, color='black')),
+        estilo_celulas=dict(fill_color='white', line_color='darkslategray',
+                            align='center', font=dict(size=12, color='black'))
     )
-    fig_table.show()
+    relatorio_html.exibir(fig_table, "Criticidade")
 
 
 # 5. Executar o Script Principal
 if __name__ == "__main__":
     # Carregar dados e pesos
-    df, pesos_df = carregar_dados_pesos(base_dados_path, pesos_file_path)
+    with instrumentacao.etapa("carregamento") as registro:
+        df, pesos_df = carregar_dados_pesos(base_dados_path, pesos_file_path)
+        registro["linhas"] = len(df)
 
     # Validar pesos
-    validar_pesos(df, pesos_df)
+    with instrumentacao.etapa("validar_pesos"):
+        validar_pesos(df, pesos_df)
 
     # Calcular criticidade
-    df = calcular_criticidade(df, pesos_df)
+    with instrumentacao.etapa("criticidade", linhas=len(df)):
+        df = calcular_criticidade(df, pesos_df)
 
     # Relatório no terminal
     print("\nRelatório Final de Criticidade dos Ativos:")
     print(df[["Ativo", "Criticidade_Calculada"]])
 
-    # Gerar gráficos e tabelas
-    gerar_graficos(df)
+    # Gerar gráficos e tabelas (exceto no modo headless)
+    if graficos_habilitados():
+        with instrumentacao.etapa("graficos"):
+            gerar_graficos(df)
 
     # Salvar resultado final
-    resultado_path = os.path.join(output_path, "resultado_criticidade.csv")
-    df.to_csv(resultado_path, index=False)
-    print(f"Resultados salvos em: {resultado_path}")
+    with instrumentacao.etapa("gravacao", linhas=len(df)):
+        caminhos = exportar_resultados(df, os.path.join(output_path, "resultado_criticidade"),
+                                       "Criticidade_Calculada")
+    print(f"Resultados salvos em: {caminhos['resultado']}")
+    print(f"Resumo dos mais críticos salvo em: {caminhos['resumo']}")
+    relatorio_html.gravar()
+    instrumentacao.emitir()
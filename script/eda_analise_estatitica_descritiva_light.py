@@ -1,11 +1,14 @@
-''' 
+'''
     ATIVOS_REDE_AEREA.docx
 
     |> Objetivo: realizar pré-processamento inical nos dados.
 
     |> O que o Script Faz
-        Carrega a Base de Dados:
-        Lê o arquivo .csv e converte a coluna Data_Interrupcao para o formato de data.
+        Calcula as Estatísticas em uma Única Passagem:
+        Lê a base pelo cache colunar (acesso_dados) e acumula, bloco a bloco, todas as estatísticas
+        da EDA (estatisticas_eda.py): tipos e não nulos, resumo numérico, frequências das categorias,
+        contagem mensal, correlação e uma amostra fixa para a dispersão.
+        Os blocos podem ser processados em paralelo (n_processos) e os acumuladores são mesclados.
         Gera Estatísticas Descritivas:
         Resumo dos dados numéricos.
         Gráficos Interativos:
@@ -15,75 +18,132 @@
             Correlação entre Duração e Clientes Afetados (Gráfico de dispersão).
             Boxplot independente para todas as variáveis numéricas.
             Correlação entre o tempo de operação e clientes afetados (gráfico de dispersão).
+        Os gráficos usam dados já agregados ou reduzidos (visualizacao_escalavel.py): contagens por categoria,
+        série mensal com LTTB, dispersão WebGL amostrada e boxplots com estatísticas pré-calculadas.
+        O script pode ser importado sem executar nada; a execução fica em main().
+        main aceita um recorte da base (inicio, fim, ativos, colunas): apenas as partições ano/mês
+        que cruzam o filtro são lidas (armazenamento_particionado.py).
+        No modo headless (REDE_AEREA_HEADLESS=1) apenas as estatísticas são calculadas e exibidas.
+        Com REDE_AEREA_RELATORIO, as figuras vão para um único relatório HTML (relatorio_html.py).
 '''
 
 # Importar as bibliotecas
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
+import instrumentacao
+import relatorio_html
+from estatisticas_eda import calcular_estatisticas
+from visualizacao_escalavel import boxplot_estatisticas, dispersao_webgl, graficos_habilitados, lttb
 
 # Caminho do arquivo
 file_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS/interrupcoes_light.csv"
 
-# 1. Carregar os dados
-df = pd.read_csv(file_path, parse_dates=["Data_Interrupcao"])
-print("Dados carregados com sucesso!")
-
-# 2. Estatísticas Descritivas
-print("\nInformações dos Dados:")
-print(df.info())
-print("\nEstatísticas Descritivas:")
-print(df.describe())
-
-# 3. Gráfico de Barras com Valores no Topo (Quantidade de Interrupções por Ativo)
-fig_ativos = px.bar(
-    df, x="Ativo", title="Quantidade de Interrupções por Tipo de Ativo", color="Ativo"
-)
-fig_ativos.show()
-
-# 4. Gráfico de Pizza (Distribuição das Causas)
-fig_causas = px.pie(df, names="Causa",
-                    title="Distribuição das Causas das Interrupções")
-fig_causas.show()
-
-# 5. Gráfico de Ocorrências por Mês
-df["Mes_Ano"] = df["Data_Interrupcao"].dt.to_period("M").astype(str)
-fig_mes = px.bar(
-    df.groupby("Mes_Ano").size().reset_index(name="Quantidade"),
-    x="Mes_Ano", y="Quantidade", title="Interrupções por Mês"
-)
-fig_mes.update_layout(yaxis_title="Quantidade", xaxis_title="Mês/Ano")
-fig_mes.show()
-
-# 6. Gráfico de Correlação com Linha de Tendência (Tempo de Operação x Clientes Afetados)
-fig_corr = px.scatter(
-    df, x="Tempo_Operacao", y="Clientes_Afetados",
-    size="Impacto_DEC", color="Ativo",
-    trendline="ols",
-    title="Correlação entre Tempo de Operação e Clientes Afetados"
-)
-fig_corr.update_traces(marker=dict(
-    line=dict(width=0.5, color='DarkSlateGrey')))
-fig_corr.update_layout(xaxis_title="Tempo de Operação (anos)",
-                       yaxis_title="Clientes Afetados")
-fig_corr.show()
-
-# 7. Boxplots Independentes em Subplots
-variaveis_numericas = ["Tempo_Operacao", "Freq_Falhas",
+VARIAVEIS_NUMERICAS = ["Tempo_Operacao", "Freq_Falhas",
                        "Clientes_Afetados", "Impacto_DEC", "Impacto_FEC"]
-fig_boxplots = make_subplots(rows=len(variaveis_numericas), cols=1,
-                             subplot_titles=variaveis_numericas)
 
-for i, var in enumerate(variaveis_numericas):
-    fig_boxplots.add_trace(
-        go.Box(y=df[var], name=var, boxmean='sd'), row=i+1, col=1
+
+def exibir_estatisticas(estatisticas):
+    """
+    Equivalente de df.info() e df.describe() a partir dos acumuladores.
+    """
+    print("\nInformações dos Dados:")
+    print(f"{estatisticas.n_linhas} linhas")
+    print(estatisticas.info().to_string(index=False))
+    print("\nEstatísticas Descritivas:")
+    print(estatisticas.resumo())
+
+
+def boxplot_acumulado(estatisticas, var):
+    """
+    Boxplot com quartis do sketch; as cercas de 1,5 IQR são limitadas ao mínimo e ao máximo observados.
+    """
+    j = estatisticas.colunas_numericas.index(var)
+    q1, mediana, q3 = estatisticas.quantis(var, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inferior = max(estatisticas.minimos[j], q1 - 1.5 * iqr)
+    superior = min(estatisticas.maximos[j], q3 + 1.5 * iqr)
+    desvio = np.sqrt(estatisticas.m2_col[j] / (estatisticas.n_col[j] - 1))
+    return boxplot_estatisticas(var, q1, mediana, q3, inferior, superior, estatisticas.media_col[j], desvio)
+
+
+def gerar_graficos(estatisticas):
+    # Plotly (e o statsmodels da linha de tendência) são importados apenas quando os gráficos são pedidos
+    import plotly.express as px
+    from plotly.subplots import make_subplots
+
+    # 3. Gráfico de Barras com Valores no Topo (Quantidade de Interrupções por Ativo)
+    contagem_ativos = estatisticas.frequencias("Ativo").rename_axis("Ativo").reset_index(name="Quantidade")
+    fig_ativos = px.bar(
+        contagem_ativos, x="Ativo", y="Quantidade", text="Quantidade",
+        title="Quantidade de Interrupções por Tipo de Ativo", color="Ativo"
     )
+    relatorio_html.exibir(fig_ativos, "Análise Exploratória")
+
+    # 4. Gráfico de Pizza (Distribuição das Causas)
+    contagem_causas = estatisticas.frequencias("Causa").rename_axis("Causa").reset_index(name="Quantidade")
+    fig_causas = px.pie(contagem_causas, names="Causa", values="Quantidade",
+                        title="Distribuição das Causas das Interrupções")
+    relatorio_html.exibir(fig_causas, "Análise Exploratória")
+
+    # 5. Gráfico de Ocorrências por Mês
+    por_mes = estatisticas.contagem_mensal()
+    por_mes = por_mes.iloc[lttb(np.arange(len(por_mes)), por_mes["Quantidade"])]
+    fig_mes = px.bar(
+        por_mes, x="Mes_Ano", y="Quantidade", title="Interrupções por Mês"
+    )
+    fig_mes.update_layout(yaxis_title="Quantidade", xaxis_title="Mês/Ano")
+    relatorio_html.exibir(fig_mes, "Análise Exploratória")
+
+    # 6. Gráfico de Correlação com Linha de Tendência (Tempo de Operação x Clientes Afetados)
+    # A amostra acumulada já respeita o orçamento de pontos da dispersão
+    fig_corr = dispersao_webgl(
+        estatisticas.amostra_linhas(), x="Tempo_Operacao", y="Clientes_Afetados",
+        size="Impacto_DEC", color="Ativo",
+        trendline="ols",
+        title="Correlação entre Tempo de Operação e Clientes Afetados"
+    )
+    fig_corr.update_traces(marker=dict(
+        line=dict(width=0.5, color='DarkSlateGrey')))
+    fig_corr.update_layout(xaxis_title="Tempo de Operação (anos)",
+                           yaxis_title="Clientes Afetados")
+    relatorio_html.exibir(fig_corr, "Análise Exploratória")
+
+    # 7. Boxplots Independentes em Subplots
+    fig_boxplots = make_subplots(rows=len(VARIAVEIS_NUMERICAS), cols=1,
+                                 subplot_titles=VARIAVEIS_NUMERICAS)
+
+    for i, var in enumerate(VARIAVEIS_NUMERICAS):
+        fig_boxplots.add_trace(
+            boxplot_acumulado(estatisticas, var), row=i+1, col=1
+        )
+
+    fig_boxplots.update_layout(
+        title_text="Boxplots Independentes das Variáveis Numéricas",
+        height=1500,  # Altura ajustada para acomodar todos os gráficos
+        showlegend=False
+    )
+    relatorio_html.exibir(fig_boxplots, "Análise Exploratória")
+
+
+def main(base_path=file_path, n_processos=1, inicio=None, fim=None, ativos=None, colunas=None):
+    # 1. Carregar os dados e acumular as estatísticas (uma única passagem, apenas no recorte pedido)
+    with instrumentacao.etapa("estatisticas_eda") as registro:
+        estatisticas = calcular_estatisticas(base_path, n_processos=n_processos, inicio=inicio, fim=fim,
+                                             ativos=ativos, colunas=colunas)
+        registro["linhas"] = estatisticas.n_linhas
+    print("Dados carregados com sucesso!")
+
+    # 2. Estatísticas Descritivas
+    exibir_estatisticas(estatisticas)
+
+    if graficos_habilitados():
+        with instrumentacao.etapa("graficos"):
+            gerar_graficos(estatisticas)
+    relatorio_html.gravar()
+    instrumentacao.emitir()
+    return estatisticas
+
 
-fig_boxplots.update_layout(
-    title_text="Boxplots Independentes das Variáveis Numéricas",
-    height=1500,  # Altura ajustada para acomodar todos os gráficos
-    showlegend=False
-)
-fig_boxplots.show()
+# Script Principal
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: calcular, em uma única passagem pela base, todas as estatísticas usadas na EDA.
+
+    |> O que o Script Faz
+        AcumuladorEDA percorre a base em blocos e mantém acumuladores mescláveis:
+            Contagem de linhas, não nulos e tipo de cada coluna (substitui df.info()).
+            Média, variância, mínimo e máximo por coluna numérica (momentos de Welford/Chan).
+            Matriz de co-momentos -> covariância e correlação (linhas completas).
+            Sketch de quantis por coluna numérica (sketch_quantis.py) -> quartis e medianas.
+            Frequência das categorias (Ativo, Causa, Status_Ativo...).
+            Contagem de interrupções por mês (Mes_Ano).
+            Amostra uniforme de tamanho fixo (menores prioridades aleatórias), para gráficos de dispersão.
+        Acumuladores de blocos diferentes são combinados com mesclar(); assim os grupos de linhas do cache
+        colunar podem ser processados em paralelo (calcular_estatisticas com n_processos > 1).
+        Recorte opcional (inicio, fim, ativos, colunas): apenas as partições ano/mês que cruzam o filtro
+        são lidas (armazenamento_particionado.py) e as partições são divididas entre os processos.
+        O módulo não executa nada ao ser importado.
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from acesso_dados import atualizar_cache
+from armazenamento_particionado import atualizar_particoes, ler_particao, selecionar_particoes
+from sketch_quantis import SketchQuantis
+
+# Número de contagens parciais de categorias guardadas antes de consolidar
+LIMITE_PARCIAIS = 16
+
+
+def _mesclar_momentos(n_a, media_a, m2_a, n_b, media_b, m2_b):
+    """
+    Combinação de Chan et al. para contagem, média e segundo momento (ou co-momento).
+    Funciona elemento a elemento (vetores) ou com matrizes de co-momentos.
+    """
+    n = n_a + n_b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = media_b - media_a
+        fator_b = np.where(n > 0, n_b / np.where(n > 0, n, 1), 0.0)
+        media = media_a + delta * fator_b
+        if np.ndim(m2_a) == 2:
+            m2 = m2_a + m2_b + np.outer(delta, delta) * (n_a * n_b / n if n > 0 else 0.0)
+        else:
+            m2 = m2_a + m2_b + delta ** 2 * np.where(n > 0, n_a * n_b / np.where(n > 0, n, 1), 0.0)
+    return n, media, m2
+
+
+def _somar_contagens(partes):
+    """
+    Soma contagens parciais (Series indexadas pela categoria) por hash, sem ordenar nem alinhar índices.
+    """
+    if len(partes) == 1:
+        return partes[0]
+    return pd.concat(partes).groupby(level=0, sort=False, dropna=False, observed=True).sum().astype(np.int64)
+
+
+class AcumuladorEDA:
+    """
+    Estatísticas descritivas mescláveis, atualizadas bloco a bloco.
+    """
+
+    def __init__(self, colunas_numericas=None, colunas_categoricas=None, coluna_data="Data_Interrupcao",
+                 tamanho_amostra=20000, k_sketch=400, semente=0):
+        self.colunas_numericas = colunas_numericas
+        self.colunas_categoricas = colunas_categoricas
+        self.coluna_data = coluna_data
+        self.tamanho_amostra = tamanho_amostra
+        self.k_sketch = k_sketch
+        self._rng = np.random.default_rng(semente)
+
+        self.n_linhas = 0
+        self.tipos = {}
+        self.nao_nulos = {}
+        self._frequencias = {}
+        self.mensal = pd.Series(dtype=np.int64)
+        self.amostra = None
+        self._iniciado = False
+
+    def _iniciar(self, bloco):
+        if self.colunas_numericas is None:
+            self.colunas_numericas = bloco.select_dtypes(include=[np.number]).columns.tolist()
+        if self.colunas_categoricas is None:
+            self.colunas_categoricas = bloco.select_dtypes(
+                include=["object", "category", "string"]).columns.tolist()
+        v = len(self.colunas_numericas)
+        # Momentos por coluna (ignorando NaN)
+        self.n_col = np.zeros(v)
+        self.media_col = np.zeros(v)
+        self.m2_col = np.zeros(v)
+        self.minimos = np.full(v, np.inf)
+        self.maximos = np.full(v, -np.inf)
+        # Co-momentos (linhas completas)
+        self.n_completo = 0.0
+        self.media_completo = np.zeros(v)
+        self.comomentos = np.zeros((v, v))
+        self.sketches = {col: SketchQuantis(self.k_sketch, semente=j)
+                         for j, col in enumerate(self.colunas_numericas)}
+        self._iniciado = True
+
+    def atualizar(self, bloco):
+        """
+        Incorpora um bloco (DataFrame) às estatísticas.
+        """
+        if not self._iniciado:
+            self._iniciar(bloco)
+
+        self.n_linhas += len(bloco)
+        for col in bloco.columns:
+            self.tipos.setdefault(col, str(bloco[col].dtype))
+            self.nao_nulos[col] = self.nao_nulos.get(col, 0) + int(bloco[col].notna().sum())
+
+        # Momentos e extremos por coluna
+        matriz = bloco[self.colunas_numericas].to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = ~np.isnan(matriz)
+        n_b = validos.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media_b = np.where(n_b > 0, np.nansum(matriz, axis=0) / np.where(n_b > 0, n_b, 1), 0.0)
+        m2_b = np.nansum((matriz - media_b) ** 2, axis=0)
+        self.n_col, self.media_col, self.m2_col = _mesclar_momentos(
+            self.n_col, self.media_col, self.m2_col, n_b, media_b, m2_b)
+        if len(matriz):
+            self.minimos = np.fmin(self.minimos, np.nanmin(np.where(validos, matriz, np.inf), axis=0))
+            self.maximos = np.fmax(self.maximos, np.nanmax(np.where(validos, matriz, -np.inf), axis=0))
+
+        # Co-momentos com as linhas completas
+        completas = matriz[validos.all(axis=1)]
+        if len(completas):
+            media_c = completas.mean(axis=0)
+            centrado = completas - media_c
+            self.n_completo, self.media_completo, self.comomentos = _mesclar_momentos(
+                self.n_completo, self.media_completo, self.comomentos,
+                float(len(completas)), media_c, centrado.T @ centrado)
+
+        for j, col in enumerate(self.colunas_numericas):
+            self.sketches[col].atualizar(matriz[:, j])
+
+        # Frequências das categorias (contagens parciais, consolidadas a cada LIMITE_PARCIAIS blocos)
+        for col in self.colunas_categoricas:
+            contagem = bloco[col].value_counts(dropna=False, sort=False)
+            # Colunas categóricas listam também as categorias ausentes do bloco
+            self._acrescentar_frequencia(col, contagem[contagem > 0])
+
+        # Contagem mensal (índice = mês absoluto, ano * 12 + mês - 1)
+        if self.coluna_data in bloco.columns:
+            datas = pd.to_datetime(bloco[self.coluna_data])
+            meses = (datas.dt.year * 12 + datas.dt.month - 1).dropna().astype(np.int64)
+            self.mensal = self.mensal.add(meses.value_counts(), fill_value=0).astype(np.int64)
+
+        # Amostra uniforme: mantém as linhas com as menores prioridades aleatórias
+        if self.tamanho_amostra:
+            candidatos = bloco.assign(_prioridade=self._rng.random(len(bloco)))
+            self._mesclar_amostra(candidatos.nsmallest(self.tamanho_amostra, "_prioridade"))
+        return self
+
+    def _acrescentar_frequencia(self, col, contagem):
+        partes = self._frequencias.setdefault(col, [])
+        partes.append(contagem)
+        if len(partes) >= LIMITE_PARCIAIS:
+            self._frequencias[col] = [_somar_contagens(partes)]
+
+    def _mesclar_amostra(self, candidatos):
+        if self.amostra is None:
+            self.amostra = candidatos.reset_index(drop=True)
+        else:
+            self.amostra = pd.concat([self.amostra, candidatos], ignore_index=True).nsmallest(
+                self.tamanho_amostra, "_prioridade").reset_index(drop=True)
+
+    def mesclar(self, outro):
+        """
+        Incorpora as estatísticas de outro acumulador (outro bloco ou processo).
+        """
+        if not outro._iniciado:
+            return self
+        if not self._iniciado:
+            self.__dict__.update({chave: valor for chave, valor in outro.__dict__.items() if chave != "_rng"})
+            return self
+
+        self.n_linhas += outro.n_linhas
+        for col, tipo in outro.tipos.items():
+            self.tipos.setdefault(col, tipo)
+        for col, n in outro.nao_nulos.items():
+            self.nao_nulos[col] = self.nao_nulos.get(col, 0) + n
+        self.n_col, self.media_col, self.m2_col = _mesclar_momentos(
+            self.n_col, self.media_col, self.m2_col, outro.n_col, outro.media_col, outro.m2_col)
+        self.minimos = np.fmin(self.minimos, outro.minimos)
+        self.maximos = np.fmax(self.maximos, outro.maximos)
+        self.n_completo, self.media_completo, self.comomentos = _mesclar_momentos(
+            self.n_completo, self.media_completo, self.comomentos,
+            outro.n_completo, outro.media_completo, outro.comomentos)
+        for col, sketch in outro.sketches.items():
+            self.sketches[col].mesclar(sketch)
+        for col, partes in outro._frequencias.items():
+            for contagem in partes:
+                self._acrescentar_frequencia(col, contagem)
+        self.mensal = self.mensal.add(outro.mensal, fill_value=0).astype(np.int64)
+        if outro.amostra is not None:
+            self._mesclar_amostra(outro.amostra)
+        return self
+
+    # Consultas
+
+    def info(self):
+        """
+        Equivalente resumido de df.info(): tipo e não nulos por coluna.
+        """
+        return pd.DataFrame({
+            "Coluna": list(self.tipos),
+            "Tipo": list(self.tipos.values()),
+            "Nao_Nulos": [self.nao_nulos[col] for col in self.tipos],
+        })
+
+    def resumo(self):
+        """
+        Equivalente de df.describe() (quartis aproximados pelo sketch).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            desvio = np.sqrt(self.m2_col / (self.n_col - 1))
+        quartis = np.array([self.sketches[col].quantis([0.25, 0.5, 0.75]) for col in self.colunas_numericas]).T
+        return pd.DataFrame(
+            [self.n_col, self.media_col, desvio, self.minimos, *quartis, self.maximos],
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+            columns=self.colunas_numericas,
+        )
+
+    def frequencias(self, coluna):
+        """
+        Contagem de cada categoria da coluna, em ordem decrescente.
+        """
+        partes = self._frequencias[coluna]
+        if len(partes) > 1:
+            self._frequencias[coluna] = partes = [_somar_contagens(partes)]
+        return partes[0].sort_values(ascending=False, kind="stable")
+
+    def quantis(self, coluna, qs):
+        return self.sketches[coluna].quantis(qs)
+
+    def covariancia(self):
+        return pd.DataFrame(self.comomentos / (self.n_completo - 1),
+                            index=self.colunas_numericas, columns=self.colunas_numericas)
+
+    def correlacao(self):
+        desvio = np.sqrt(np.diag(self.comomentos))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlacao = self.comomentos / np.outer(desvio, desvio)
+        return pd.DataFrame(correlacao, index=self.colunas_numericas, columns=self.colunas_numericas)
+
+    def contagem_mensal(self):
+        """
+        Interrupções por mês, com a coluna Mes_Ano no formato AAAA-MM.
+        """
+        mensal = self.mensal.sort_index()
+        anos, meses = np.divmod(mensal.index.to_numpy(dtype=np.int64), 12)
+        return pd.DataFrame({
+            "Mes_Ano": [f"{ano:04d}-{mes + 1:02d}" for ano, mes in zip(anos, meses)],
+            "Quantidade": mensal.to_numpy(),
+        })
+
+    def amostra_linhas(self):
+        return None if self.amostra is None else self.amostra.drop(columns="_prioridade")
+
+
+def _acumular_grupos(parquet_path, grupos, semente, parametros, colunas=None):
+    """
+    Tarefa dos processos: acumula as estatísticas de um conjunto de grupos de linhas do Parquet.
+    """
+    acumulador = AcumuladorEDA(semente=semente, **parametros)
+    arquivo = pq.ParquetFile(parquet_path)
+    for lote in arquivo.iter_batches(row_groups=grupos, columns=colunas):
+        acumulador.atualizar(lote.to_pandas())
+    return acumulador
+
+
+def _acumular_particoes(diretorio, particoes, semente, parametros, colunas=None):
+    """
+    Tarefa dos processos: acumula as estatísticas de um conjunto de partições (com o filtro de cada uma).
+    """
+    acumulador = AcumuladorEDA(semente=semente, **parametros)
+    for particao, filtros in particoes:
+        tabela = ler_particao(diretorio, particao, filtros, colunas)
+        if tabela.num_rows:
+            acumulador.atualizar(tabela.to_pandas())
+    return acumulador
+
+
+def calcular_estatisticas(base_path, n_processos=1, inicio=None, fim=None, ativos=None, colunas=None,
+                          **parametros):
+    """
+    Calcula todas as estatísticas da EDA em uma passagem pela base (via cache colunar).
+    Com n_processos > 1, os grupos de linhas do Parquet são divididos entre processos
+    e os acumuladores são mesclados na ordem dos grupos.
+    inicio/fim (fim inclusivo) e ativos restringem a base; apenas as partições ano/mês do recorte são lidas.
+    """
+    if inicio is None and fim is None and ativos is None:
+        tarefa = _acumular_grupos
+        fonte, _ = atualizar_cache(base_path)
+        unidades = list(range(pq.ParquetFile(fonte).num_row_groups))
+    else:
+        tarefa = _acumular_particoes
+        fonte, manifesto = atualizar_particoes(base_path)
+        unidades = selecionar_particoes(manifesto, inicio, fim, ativos)
+    partes = np.array_split(np.arange(len(unidades)), max(1, min(n_processos, len(unidades))))
+    fatias = [[unidades[i] for i in parte] for parte in partes]
+
+    if len(fatias) == 1:
+        parciais = [tarefa(fonte, fatias[0], 0, parametros, colunas)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(fatias)) as executor:
+            parciais = list(executor.map(
+                tarefa, [fonte] * len(fatias), fatias, range(len(fatias)),
+                [parametros] * len(fatias), [colunas] * len(fatias)))
+
+    total = parciais[0]
+    for parcial in parciais[1:]:
+        total.mesclar(parcial)
+    return total
@@ -0,0 +1,147 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: gravar os resultados da criticidade sem exportar o DataFrame intermediário inteiro em texto.
+
+    |> O que o Script Faz
+        Projeção das colunas: por padrão apenas as chaves do ativo (Trecho, Ativo), o índice de criticidade e a
+        posição no ranking (Posicao); colunas="todas" mantém todas as colunas (incluindo as *_Norm).
+        Formatos:
+            parquet   Colunar, comprimido (zstd); categorias gravadas como dicionário.
+            csv.gz    CSV em blocos de LINHAS_POR_BLOCO_CSV linhas; cada bloco é convertido para texto e
+                      comprimido em uma thread (pyarrow e zlib liberam o GIL) e gravado como um membro gzip.
+                      O arquivo é um gzip válido (membros concatenados), lido normalmente por pandas/gzip.
+            csv       Igual ao csv.gz, sem compressão.
+        Grava também um resumo pequeno com os TOP_K_RESUMO primeiros do ranking (CSV), para consumidores rápidos.
+        Configuração sem alterar os scripts:
+            REDE_AEREA_FORMATO_RESULTADOS   parquet (padrão), csv.gz ou csv.
+            REDE_AEREA_COLUNAS_RESULTADOS   Colunas separadas por vírgula, ou "todas".
+        Os arquivos são gravados de forma atômica (arquivo temporário + os.replace).
+'''
+
+# Importar bibliotecas
+import gzip
+import io
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+FORMATOS = ("parquet", "csv.gz", "csv")
+
+COLUNAS_CHAVE = ("Trecho", "Ativo")
+COLUNA_POSICAO = "Posicao"
+
+TOP_K_RESUMO = 100
+
+LINHAS_POR_BLOCO_CSV = 1 << 18
+NIVEL_GZIP = 6
+COMPRESSAO_PARQUET = "zstd"
+
+
+def formato_padrao():
+    formato = os.environ.get("REDE_AEREA_FORMATO_RESULTADOS", "parquet")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de resultados desconhecido: {formato} (opções: {FORMATOS})")
+    return formato
+
+
+def colunas_padrao():
+    valor = os.environ.get("REDE_AEREA_COLUNAS_RESULTADOS", "")
+    if valor == "todas":
+        return "todas"
+    return [col for col in valor.split(",") if col] or None
+
+
+def projetar(df, coluna_indice, colunas=None):
+    """
+    Colunas exportadas de um DataFrame já ordenado pelo ranking, com a posição de cada linha (1 = mais crítico).
+    colunas=None: chaves do ativo + índice + posição; "todas": todas as colunas + posição.
+    """
+    if colunas == "todas":
+        colunas = list(df.columns)
+    elif colunas is None:
+        colunas = [col for col in COLUNAS_CHAVE if col in df.columns] + [coluna_indice]
+    faltantes = [col for col in colunas if col not in df.columns and col != COLUNA_POSICAO]
+    if faltantes:
+        raise KeyError(f"Colunas inexistentes no resultado: {faltantes}")
+    projetado = df[[col for col in colunas if col != COLUNA_POSICAO]].reset_index(drop=True)
+    # Posição logo após o índice (ou ao final, se o índice não for exportado)
+    i = projetado.columns.get_loc(coluna_indice) + 1 if coluna_indice in projetado.columns else projetado.shape[1]
+    projetado.insert(i, COLUNA_POSICAO, np.arange(1, len(projetado) + 1))
+    return projetado
+
+
+def _tabela_texto(df):
+    # O escritor CSV do pyarrow não aceita dicionários: categorias viram texto
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    for i, campo in enumerate(tabela.schema):
+        if pa.types.is_dictionary(campo.type):
+            tabela = tabela.set_column(i, campo.name, tabela.column(i).cast(campo.type.value_type))
+    return tabela
+
+
+def _bloco_csv(df, cabecalho, comprimir):
+    """
+    Tarefa das threads: texto CSV de um bloco (comprimido como um membro gzip, se pedido).
+    """
+    buffer = io.BytesIO()
+    pa_csv.write_csv(_tabela_texto(df), buffer, write_options=pa_csv.WriteOptions(include_header=cabecalho))
+    dados = buffer.getvalue()
+    return gzip.compress(dados, compresslevel=NIVEL_GZIP) if comprimir else dados
+
+
+def gravar_csv(df, caminho, comprimir=True, n_threads=None, linhas_por_bloco=LINHAS_POR_BLOCO_CSV):
+    """
+    CSV em blocos convertidos e comprimidos em paralelo (threads), gravados na ordem das linhas.
+    """
+    n_threads = n_threads or os.cpu_count() or 1
+    temporario = caminho + ".tmp"
+    inicios = range(0, max(len(df), 1), linhas_por_bloco)
+    with open(temporario, "wb") as arquivo, ThreadPoolExecutor(max_workers=n_threads) as executor:
+        # No máximo 2 blocos por thread em memória
+        pendentes = deque()
+        for inicio in inicios:
+            pendentes.append(executor.submit(_bloco_csv, df.iloc[inicio:inicio + linhas_por_bloco],
+                                             inicio == 0, comprimir))
+            if len(pendentes) >= 2 * n_threads:
+                arquivo.write(pendentes.popleft().result())
+        while pendentes:
+            arquivo.write(pendentes.popleft().result())
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def gravar_parquet(df, caminho):
+    temporario = caminho + ".tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temporario, compression=COMPRESSAO_PARQUET)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def exportar_resultados(df, caminho_base, coluna_indice, formato=None, colunas=None, top_k=TOP_K_RESUMO,
+                        n_threads=None):
+    """
+    Grava a projeção do resultado (já ordenado pelo ranking) em `caminho_base.<formato>` e o resumo Top-K
+    em `caminho_base_top<K>.csv`. Retorna os caminhos gravados ({"resultado", "resumo"}).
+    """
+    formato = formato or formato_padrao()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de resultados desconhecido: {formato} (opções: {FORMATOS})")
+    colunas = colunas if colunas is not None else colunas_padrao()
+
+    projetado = projetar(df, coluna_indice, colunas)
+    caminho = f"{caminho_base}.{formato}"
+    if formato == "parquet":
+        gravar_parquet(projetado, caminho)
+    else:
+        gravar_csv(projetado, caminho, comprimir=formato == "csv.gz", n_threads=n_threads)
+
+    caminhos = {"resultado": caminho}
+    if top_k:
+        caminhos["resumo"] = gravar_csv(projetar(df.head(top_k), coluna_indice), f"{caminho_base}_top{top_k}.csv",
+                                        comprimir=False, n_threads=1)
+    return caminhos
@@ -25,6 +25,11 @@
 import pandas as pd
 import random
 import numpy as np
+import io
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 # Configurar caminho da pasta DADOS
@@ -109,6 +114,121 @@ def gerar_base_simulada(output_path, qtd_registros=200):
     print(df.head())
 
 
+# Modo vetorizado: cada coluna é gerada com sorteios NumPy sobre o bloco inteiro,
+# os blocos são gravados em sequência (memória constante) e cada bloco usa um
+# fluxo aleatório próprio derivado da semente, de modo que a mesma semente gera
+# o mesmo arquivo byte a byte, independentemente do número de processos.
+
+TAMANHO_BLOCO_PADRAO = 1_000_000
+
+
+def gerar_lognormal_vetorizado(rng, qtd, media, sigma, outlier_ratio=0.05):
+    """
+    Versão vetorizada de gerar_lognormal usando um gerador NumPy dedicado.
+    """
+    valores = rng.lognormal(mean=media, sigma=sigma, size=qtd)
+    # Adicionar outliers (índices podem se repetir, como no laço original)
+    n_outliers = int(outlier_ratio * qtd)
+    if n_outliers > 0:
+        indices = rng.integers(0, qtd, size=n_outliers)
+        np.multiply.at(valores, indices, rng.uniform(2, 4, size=n_outliers))
+    return valores
+
+
+def gerar_bloco_vetorizado(inicio, qtd, semente, data_inicio="2023-01-01", data_fim="2024-12-31"):
+    """
+    Gera um bloco de registros a partir da linha global `inicio`.
+    A semente deve identificar o bloco (ver _semente_bloco).
+    """
+    rng = np.random.default_rng(semente)
+
+    tempo_operacao = gerar_lognormal_vetorizado(
+        rng, qtd, media=3, sigma=0.7, outlier_ratio=0.05)
+    clientes_afetados = gerar_lognormal_vetorizado(
+        rng, qtd, media=7, sigma=1, outlier_ratio=0.05)
+    freq_falhas = rng.integers(1, 10, size=qtd)
+
+    # Datas como deslocamento em dias a partir da data inicial
+    d_inicio = np.datetime64(data_inicio, "D")
+    n_dias = int((np.datetime64(data_fim, "D") - d_inicio).astype(int))
+    datas = d_inicio + rng.integers(0, n_dias + 1, size=qtd)
+
+    fator_dec = rng.uniform(0.5, 2.5, size=qtd)
+    fator_fec = rng.uniform(0.5, 2.0, size=qtd)
+
+    dados = {
+        "Trecho": np.char.add("Trecho ", np.arange(inicio + 1, inicio + qtd + 1).astype(str)),
+        "Ativo": np.asarray(ativos)[rng.integers(0, len(ativos), size=qtd)],
+        "Data_Interrupcao": datas,
+        "Tempo_Operacao": np.round(tempo_operacao, 0).astype(int),
+        "Freq_Falhas": freq_falhas,
+        "Clientes_Afetados": np.round(clientes_afetados, 0).astype(int),
+        "Impacto_DEC": np.round((tempo_operacao / 600) * (clientes_afetados / 2000) * fator_dec, 2),
+        "Impacto_FEC": np.round((freq_falhas / 10) * (clientes_afetados / 1500) * fator_fec, 2),
+        "Causa": np.asarray(causas)[rng.integers(0, len(causas), size=qtd)],
+        "Status_Ativo": np.asarray(status)[rng.integers(0, len(status), size=qtd)]
+    }
+    return pd.DataFrame(dados)
+
+
+def _semente_bloco(semente, indice_bloco):
+    # Fluxo independente por bloco: equivale ao filho `indice_bloco` de SeedSequence(semente).spawn()
+    return np.random.SeedSequence(semente, spawn_key=(indice_bloco,))
+
+
+def _gerar_bloco_csv(args):
+    """
+    Tarefa executada nos processos: gera um bloco e devolve o CSV em bytes.
+    O CSV é escrito pelo pyarrow (bem mais rápido que DataFrame.to_csv);
+    os valores categóricos não contêm vírgulas, então dispensam aspas.
+    """
+    indice_bloco, inicio, qtd, semente, incluir_cabecalho = args
+    df = gerar_bloco_vetorizado(inicio, qtd, _semente_bloco(semente, indice_bloco))
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    tabela = tabela.set_column(
+        2, "Data_Interrupcao", tabela.column("Data_Interrupcao").cast(pa.date32()))
+
+    buffer = io.BytesIO()
+    if incluir_cabecalho:
+        buffer.write((",".join(df.columns) + "\n").encode("utf-8"))
+    pa_csv.write_csv(tabela, buffer, pa_csv.WriteOptions(
+        include_header=False, quoting_style="none"))
+    return buffer.getvalue()
+
+
+def gerar_base_simulada_vetorizada(output_path, qtd_registros=200, semente=0,
+                                   tamanho_bloco=TAMANHO_BLOCO_PADRAO, n_processos=1):
+    """
+    Gera a base simulada em blocos de tamanho fixo, gravando cada bloco no
+    arquivo assim que fica pronto. Com n_processos > 1 os blocos são gerados
+    em paralelo; a saída é a mesma para qualquer número de processos.
+    """
+    print(f"Gerando base de dados simulada (modo vetorizado, {qtd_registros} registros)...")
+
+    tarefas = [
+        (i, inicio, min(tamanho_bloco, qtd_registros - inicio), semente, i == 0)
+        for i, inicio in enumerate(range(0, qtd_registros, tamanho_bloco))
+    ]
+
+    with open(output_path, "wb") as arquivo:
+        if n_processos <= 1:
+            for tarefa in tarefas:
+                arquivo.write(_gerar_bloco_csv(tarefa))
+        else:
+            # Janela limitada de blocos em andamento para manter a memória estável
+            with ProcessPoolExecutor(max_workers=n_processos) as executor:
+                pendentes = deque()
+                for tarefa in tarefas:
+                    if len(pendentes) >= 2 * n_processos:
+                        arquivo.write(pendentes.popleft().result())
+                    pendentes.append(executor.submit(_gerar_bloco_csv, tarefa))
+                while pendentes:
+                    arquivo.write(pendentes.popleft().result())
+
+    print(f"Base de dados gerada com sucesso: {output_path}")
+    return output_path
+
+
 # Executar geração da base de dados
 if __name__ == "__main__":
     gerar_base_simulada(output_path)
@@ -0,0 +1,155 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: ingestão incremental de novos eventos de interrupção, sem reprocessar todo o histórico.
+
+    |> O que o Script Faz
+        Acrescenta os novos eventos a um histórico append-only (um arquivo Parquet por lote em historico/eventos).
+        Mantém, em historico/estado.json, os mínimos e máximos globais de cada variável numérica.
+        Mantém, em historico/ativos.parquet, agregados por ativo (Trecho): número de eventos e somas das variáveis.
+        O índice de cada ativo é a média do Índice de Criticidade (Min-Max, como em matriz_prioridade.py) dos seus eventos:
+            Indice = soma_j Peso_j * (Soma_j / Eventos - Min_j) / (Max_j - Min_j)
+        Como o índice depende só dos agregados e dos extremos globais:
+            Extremos inalterados -> recalcula apenas os ativos afetados pelo lote.
+            Algum mínimo/máximo de variável ponderada mudou (ou os pesos mudaram) -> recalcula todos os ativos,
+            a partir dos agregados, sem reler os eventos.
+'''
+
+# Importar bibliotecas
+import json
+import os
+import numpy as np
+import pandas as pd
+from ranking_criticidade import ordenar_por_criticidade
+
+# Caminho do histórico incremental
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+HISTORICO_PATH = os.path.join(output_path, "historico")
+
+CHAVE_ATIVO = "Trecho"
+
+
+def _caminhos(diretorio):
+    return (os.path.join(diretorio, "eventos"),
+            os.path.join(diretorio, "estado.json"),
+            os.path.join(diretorio, "ativos.parquet"))
+
+
+def carregar_estado(diretorio=HISTORICO_PATH):
+    """
+    Carrega o estado do histórico (extremos globais, pesos e contadores).
+    """
+    _, estado_path, _ = _caminhos(diretorio)
+    if not os.path.exists(estado_path):
+        return {"partes": 0, "linhas": 0, "minimos": {}, "maximos": {}, "pesos": {}}
+    with open(estado_path, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _salvar_estado(diretorio, estado):
+    _, estado_path, _ = _caminhos(diretorio)
+    temporario = estado_path + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(estado, arquivo, indent=2)
+    os.replace(temporario, estado_path)
+
+
+def calcular_indice_ativos(ativos, pesos_dict, minimos, maximos):
+    """
+    Índice de criticidade médio dos eventos de cada ativo, a partir dos agregados.
+    """
+    eventos = ativos["Eventos"].to_numpy(dtype=np.float64)
+    indice = np.zeros(len(ativos))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for col, peso in pesos_dict.items():
+            media = ativos["Soma_" + col].to_numpy(dtype=np.float64) / eventos
+            indice += (media - minimos[col]) / (maximos[col] - minimos[col]) * peso
+    return indice
+
+
+def ingerir_eventos(novos_df, pesos_df, diretorio=HISTORICO_PATH):
+    """
+    Acrescenta um lote de eventos ao histórico e atualiza o índice dos ativos.
+    Retorna a tabela de ativos, os ativos afetados e se houve recálculo completo.
+    """
+    eventos_dir, _, ativos_path = _caminhos(diretorio)
+    os.makedirs(eventos_dir, exist_ok=True)
+
+    pesos_dict = dict(zip(pesos_df["Variavel"], pesos_df["Peso"]))
+    novos_df = novos_df.copy()
+    if "Impacto_DEC" in novos_df.columns and "Impacto_FEC" in novos_df.columns:
+        novos_df["Impacto_DEC_FEC"] = novos_df["Impacto_DEC"] + novos_df["Impacto_FEC"]
+    faltantes = [var for var in list(pesos_dict) + [CHAVE_ATIVO] if var not in novos_df.columns]
+    if faltantes:
+        raise ValueError(f"Variáveis faltantes no lote de eventos: {faltantes}")
+
+    estado = carregar_estado(diretorio)
+    numericas = novos_df.select_dtypes(include=[np.number]).columns.tolist()
+
+    # Atualizar extremos globais
+    minimos, maximos = dict(estado["minimos"]), dict(estado["maximos"])
+    for col in numericas:
+        minimo, maximo = float(novos_df[col].min()), float(novos_df[col].max())
+        minimos[col] = min(minimos.get(col, minimo), minimo)
+        maximos[col] = max(maximos.get(col, maximo), maximo)
+    mudou_extremo = any(
+        minimos[col] != estado["minimos"].get(col) or maximos[col] != estado["maximos"].get(col)
+        for col in pesos_dict
+    )
+    recalculo_total = mudou_extremo or pesos_dict != estado["pesos"]
+
+    # Gravar o lote (append-only)
+    parte_path = os.path.join(eventos_dir, f"parte_{estado['partes'] + 1:06d}.parquet")
+    novos_df.to_parquet(parte_path, index=False)
+
+    # Agregados do lote por ativo
+    agregacoes = {"Eventos": (CHAVE_ATIVO, "size")}
+    if "Ativo" in novos_df.columns:
+        agregacoes["Ativo"] = ("Ativo", "last")
+    agregacoes.update({"Soma_" + col: (col, "sum") for col in numericas})
+    lote = novos_df.groupby(CHAVE_ATIVO, sort=False, observed=True).agg(**agregacoes)
+    colunas_soma = [col for col in lote.columns if col.startswith("Soma_")]
+    lote[colunas_soma] = lote[colunas_soma].astype(np.float64)
+    colunas_soma = ["Eventos"] + colunas_soma
+
+    # Mesclar com os agregados existentes
+    if os.path.exists(ativos_path):
+        ativos = pd.read_parquet(ativos_path).set_index(CHAVE_ATIVO)
+        for col in colunas_soma:
+            if col not in ativos.columns:
+                ativos[col] = 0.0
+        comuns = lote.index.intersection(ativos.index)
+        ativos.loc[comuns, colunas_soma] += lote.loc[comuns, colunas_soma]
+        if "Ativo" in lote.columns:
+            ativos.loc[comuns, "Ativo"] = lote.loc[comuns, "Ativo"]
+        ativos = pd.concat([ativos, lote.loc[lote.index.difference(ativos.index, sort=False)]])
+    else:
+        ativos = lote
+        ativos["Indice_Criticidade"] = np.nan
+
+    # Recalcular somente o necessário
+    afetados = lote.index
+    if recalculo_total:
+        ativos["Indice_Criticidade"] = calcular_indice_ativos(ativos, pesos_dict, minimos, maximos)
+    else:
+        ativos.loc[afetados, "Indice_Criticidade"] = calcular_indice_ativos(
+            ativos.loc[afetados], pesos_dict, minimos, maximos)
+
+    ativos.reset_index().to_parquet(ativos_path + ".tmp", index=False)
+    os.replace(ativos_path + ".tmp", ativos_path)
+    estado.update(partes=estado["partes"] + 1, linhas=estado["linhas"] + len(novos_df),
+                  minimos=minimos, maximos=maximos, pesos=pesos_dict)
+    _salvar_estado(diretorio, estado)
+
+    print(f"Lote ingerido: {len(novos_df)} eventos, {len(afetados)} ativos afetados "
+          f"({'recálculo completo' if recalculo_total else 'recálculo parcial'}).")
+    return ativos.reset_index(), afetados, recalculo_total
+
+
+def carregar_ranking(diretorio=HISTORICO_PATH, top_k=None):
+    """
+    Retorna o ranking de ativos mantido pelo histórico incremental.
+    """
+    _, _, ativos_path = _caminhos(diretorio)
+    ativos = pd.read_parquet(ativos_path)
+    return ordenar_por_criticidade(ativos, "Indice_Criticidade", top_k)
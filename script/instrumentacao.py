@@ -0,0 +1,276 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: medir onde o tempo e a memória são gastos em cada etapa das execuções.
+
+    |> O que o Script Faz
+        Instrumentacao registra:
+            Etapas (with etapa("nome", linhas=n)): tempo de parede, linhas por segundo e pico de memória.
+                Memória por amostragem do RSS do processo (padrão) ou pelo tracemalloc (apenas alocações Python/NumPy).
+            Contadores (contar("nome")): por exemplo, acertos e falhas dos caches.
+            Perfil cProfile de uma única etapa escolhida (arquivo .prof e as funções mais custosas no relatório).
+        Emissão das métricas:
+            JSON lines (.jsonl): uma linha por etapa e por contador, acrescentadas ao arquivo.
+            Texto no formato Prometheus (.prom), gravado de forma atômica (coletor textfile do node_exporter).
+        Uma instância global é criada a partir de variáveis de ambiente, sem alterar os scripts:
+            REDE_AEREA_METRICAS     Caminho(s) de saída separados por vírgula (.jsonl e/ou .prom).
+            REDE_AEREA_MEMORIA      rss (padrão), tracemalloc ou nenhuma.
+            REDE_AEREA_PERFIL       Nome da etapa para captura com cProfile.
+        Sem REDE_AEREA_METRICAS as medições continuam em memória e emitir() não grava nada.
+'''
+
+# Importar bibliotecas
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+PREFIXO_PROMETHEUS = "rede_aerea"
+
+INTERVALO_AMOSTRAGEM_RSS = 0.01
+
+
+def rss_atual_mb():
+    """
+    Memória residente atual do processo (MB). Sem /proc, usa o pico do processo.
+    """
+    try:
+        with open("/proc/self/statm") as arquivo:
+            paginas = int(arquivo.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+class _AmostradorRSS(threading.Thread):
+    """
+    Amostra o RSS em segundo plano e guarda o maior valor observado.
+    """
+
+    def __init__(self, intervalo=INTERVALO_AMOSTRAGEM_RSS):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.pico = rss_atual_mb()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, rss_atual_mb())
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+        self.pico = max(self.pico, rss_atual_mb())
+        return self.pico
+
+
+class Instrumentacao:
+    """
+    Coleta de métricas de etapas e contadores de uma execução.
+    """
+
+    def __init__(self, destinos=(), memoria="rss", etapa_perfil=None, diretorio_perfil=None, execucao=None):
+        if memoria not in ("rss", "tracemalloc", "nenhuma"):
+            raise ValueError(f"Modo de memória desconhecido: {memoria}")
+        self.destinos = list(destinos)
+        self.memoria = memoria
+        self.etapa_perfil = etapa_perfil
+        self.diretorio_perfil = diretorio_perfil
+        self.execucao = execucao or uuid.uuid4().hex[:12]
+        self.etapas = []
+        self.contadores = {}
+        self._emitidas = {}
+        self._trava = threading.Lock()
+
+    @contextmanager
+    def etapa(self, nome, linhas=None):
+        """
+        Mede uma etapa. O registro retornado aceita `registro["linhas"] = n` quando o total só é
+        conhecido ao final.
+        """
+        registro = {"tipo": "etapa", "execucao": self.execucao, "etapa": nome,
+                    "inicio": datetime.now().isoformat(timespec="milliseconds"), "linhas": linhas}
+        amostrador = None
+        if self.memoria == "rss":
+            amostrador = _AmostradorRSS()
+            amostrador.start()
+        elif self.memoria == "tracemalloc":
+            ja_ativo = tracemalloc.is_tracing()
+            if not ja_ativo:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        perfil = cProfile.Profile() if nome == self.etapa_perfil else None
+
+        inicio = time.perf_counter()
+        if perfil is not None:
+            perfil.enable()
+        try:
+            yield registro
+        finally:
+            if perfil is not None:
+                perfil.disable()
+            duracao = time.perf_counter() - inicio
+            registro["duracao_s"] = duracao
+            if amostrador is not None:
+                registro["pico_memoria_mb"] = amostrador.parar()
+            elif self.memoria == "tracemalloc":
+                registro["pico_memoria_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+                if not ja_ativo:
+                    tracemalloc.stop()
+            registro["metodo_memoria"] = self.memoria
+            linhas = registro.get("linhas")
+            registro["linhas_por_s"] = linhas / duracao if linhas and duracao > 0 else None
+            if perfil is not None:
+                registro["perfil"] = self._salvar_perfil(nome, perfil)
+            with self._trava:
+                self.etapas.append(registro)
+
+    def _salvar_perfil(self, nome, perfil):
+        diretorio = self.diretorio_perfil or os.getcwd()
+        os.makedirs(diretorio, exist_ok=True)
+        caminho = os.path.join(diretorio, f"perfil_{nome}_{self.execucao}.prof")
+        perfil.dump_stats(caminho)
+        resumo = io.StringIO()
+        pstats.Stats(perfil, stream=resumo).sort_stats("cumulative").print_stats(15)
+        print(f"\nPerfil da etapa '{nome}' salvo em: {caminho}\n{resumo.getvalue()}")
+        return caminho
+
+    def contar(self, nome, valor=1):
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + valor
+
+    def incorporar(self, etapas=(), contadores=None):
+        """
+        Acrescenta métricas medidas em outro processo.
+        """
+        with self._trava:
+            for registro in etapas:
+                self.etapas.append(dict(registro, execucao=self.execucao))
+        for nome, valor in (contadores or {}).items():
+            self.contar(nome, valor)
+
+    def resumo(self):
+        """
+        Tabela textual das etapas medidas.
+        """
+        linhas = [f"{'Etapa':28s} {'Tempo (s)':>10s} {'Linhas/s':>14s} {'Pico mem. (MB)':>15s}"]
+        for r in self.etapas:
+            vazao = f"{r['linhas_por_s']:14.0f}" if r.get("linhas_por_s") else f"{'-':>14s}"
+            memoria = f"{r['pico_memoria_mb']:15.1f}" if r.get("pico_memoria_mb") is not None else f"{'-':>15s}"
+            linhas.append(f"{r['etapa']:28s} {r['duracao_s']:10.3f} {vazao} {memoria}")
+        for nome, valor in sorted(self.contadores.items()):
+            linhas.append(f"{nome:28s} {valor:>10d}")
+        return "\n".join(linhas)
+
+    # Emissão
+
+    def emitir(self, destinos=None):
+        """
+        Grava as métricas em cada destino (.prom -> Prometheus; demais -> JSON lines).
+        """
+        for destino in destinos if destinos is not None else self.destinos:
+            if destino.endswith(".prom"):
+                self.emitir_prometheus(destino)
+            else:
+                self.emitir_jsonl(destino)
+
+    def emitir_jsonl(self, caminho):
+        """
+        Acrescenta ao arquivo as etapas ainda não emitidas e o valor atual dos contadores.
+        """
+        agora = datetime.now().isoformat(timespec="milliseconds")
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            for registro in self.etapas[self._emitidas.get(caminho, 0):]:
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            for nome, valor in sorted(self.contadores.items()):
+                arquivo.write(json.dumps({"tipo": "contador", "execucao": self.execucao, "nome": nome,
+                                          "valor": valor, "momento": agora}, ensure_ascii=False) + "\n")
+        self._emitidas[caminho] = len(self.etapas)
+
+    def emitir_prometheus(self, caminho):
+        """
+        Grava as métricas no formato texto do Prometheus (totais por etapa desta execução).
+        """
+        por_etapa = {}
+        for r in self.etapas:
+            total = por_etapa.setdefault(r["etapa"], {"duracao": 0.0, "linhas": 0, "pico": None})
+            total["duracao"] += r["duracao_s"]
+            total["linhas"] += r.get("linhas") or 0
+            if r.get("pico_memoria_mb") is not None:
+                total["pico"] = max(total["pico"] or 0.0, r["pico_memoria_mb"])
+
+        metricas = [
+            ("etapa_duracao_segundos", "Tempo de parede da etapa",
+             [(nome, t["duracao"]) for nome, t in por_etapa.items()]),
+            ("etapa_linhas_total", "Linhas processadas pela etapa",
+             [(nome, t["linhas"]) for nome, t in por_etapa.items() if t["linhas"]]),
+            ("etapa_linhas_por_segundo", "Vazão da etapa",
+             [(nome, t["linhas"] / t["duracao"]) for nome, t in por_etapa.items()
+              if t["linhas"] and t["duracao"] > 0]),
+            ("etapa_pico_memoria_bytes", "Pico de memória durante a etapa",
+             [(nome, t["pico"] * 1024 ** 2) for nome, t in por_etapa.items() if t["pico"] is not None]),
+        ]
+        texto = []
+        for nome, ajuda, valores in metricas:
+            if not valores:
+                continue
+            texto += [f"# HELP {PREFIXO_PROMETHEUS}_{nome} {ajuda}", f"# TYPE {PREFIXO_PROMETHEUS}_{nome} gauge"]
+            texto += [f'{PREFIXO_PROMETHEUS}_{nome}{{etapa="{etapa}"}} {valor:.6g}' for etapa, valor in valores]
+        texto += [f"# HELP {PREFIXO_PROMETHEUS}_eventos_total Contadores da execução (acertos e falhas de cache etc.)",
+                  f"# TYPE {PREFIXO_PROMETHEUS}_eventos_total counter"]
+        texto += [f'{PREFIXO_PROMETHEUS}_eventos_total{{nome="{nome}"}} {valor}'
+                  for nome, valor in sorted(self.contadores.items())]
+        texto.append(f"{PREFIXO_PROMETHEUS}_ultima_execucao_timestamp_segundos {time.time():.3f}")
+
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write("\n".join(texto) + "\n")
+        os.replace(temporario, caminho)
+
+
+def _criar_por_ambiente():
+    destinos = [d for d in os.environ.get("REDE_AEREA_METRICAS", "").split(",") if d]
+    return Instrumentacao(
+        destinos=destinos,
+        memoria=os.environ.get("REDE_AEREA_MEMORIA", "rss"),
+        etapa_perfil=os.environ.get("REDE_AEREA_PERFIL") or None,
+    )
+
+
+# Instância global usada pelos scripts
+_ATIVA = _criar_por_ambiente()
+
+
+def instrumentacao_ativa():
+    return _ATIVA
+
+
+def configurar(**parametros):
+    """
+    Substitui a instância global (ex.: configurar(destinos=["metricas.prom"], etapa_perfil="eda")).
+    """
+    global _ATIVA
+    _ATIVA = Instrumentacao(**parametros)
+    return _ATIVA
+
+
+def etapa(nome, linhas=None):
+    return _ATIVA.etapa(nome, linhas)
+
+
+def contar(nome, valor=1):
+    _ATIVA.contar(nome, valor)
+
+
+def emitir(destinos=None):
+    _ATIVA.emitir(destinos)
@@ -10,53 +10,174 @@
         eda_analise_estatitica_descritiva_light.py → Para análise exploratória.
         matriz_prioridade.py → Para geração da matriz de priorização.
 
-    |> Execução Sequencial Integrada:
-        Gerar a base (caso necessário).
-        Carregar pesos e validar a base.
-        Calcular o índice de criticidade.
-        Gerar estatísticas descritivas.
-        Apresentar a matriz de priorização em gráfico e salvar os resultados.
+    |> Execução Integrada (pipeline_estagios.py):
+        As etapas formam um grafo com entradas e saídas declaradas:
+            gerar_base -> cache_colunar -> eda
+            gerar_pesos + cache_colunar -> validar -> criticidade, matriz_priorizacao
+            gerar_pesos -> ingestao (opcional)
+        Cada etapa tem cache pela combinação de entradas, parâmetros e código: alterar apenas os pesos
+        recalcula validar, criticidade e matriz_priorizacao, sem repetir a EDA nem a ingestão.
+        Etapas independentes podem executar em paralelo (n_processos).
+        Tempo, vazão e memória de cada etapa são medidos (instrumentacao.py) e emitidos em JSON lines
+        ou no formato Prometheus (REDE_AEREA_METRICAS).
+        Ingerir um lote de novos eventos no histórico incremental (opcional, ingestao_incremental.py);
+        o mesmo lote não é ingerido duas vezes.
+        Com REDE_AEREA_RELATORIO, as figuras da EDA, da criticidade e da matriz são geradas a partir das saídas
+        das etapas (inclusive as reaproveitadas do cache) e gravadas uma única vez no relatório HTML.
 '''
 
 # Importar bibliotecas
 
 import os
+import sys
 import pandas as pd
+import instrumentacao
+import criterio_definido_classificar_criticidade as criterio
+import eda_analise_estatitica_descritiva_light as eda
+import matriz_prioridade
+import relatorio_html
+from acesso_dados import atualizar_cache, carregar_base, linhas_base
+from ingestao_incremental import ingerir_eventos
 from pesos_analise_criticidade import gerar_pesos_iniciais, validar_pesos
 from geracao_base_dados import gerar_base_simulada
+from estatisticas_eda import calcular_estatisticas
+from pipeline_estagios import Estagio, executar_pipeline
 
 # Caminhos para arquivos
 OUTPUT_PATH = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
 BASE_FILE_PATH = os.path.join(OUTPUT_PATH, "interrupcoes_light.csv")
 PESOS_FILE_PATH = os.path.join(OUTPUT_PATH, "pesos_anal_criticidade.csv")
+HISTORICO_PATH = os.path.join(OUTPUT_PATH, "historico")
+EDA_FILE_PATH = os.path.join(OUTPUT_PATH, "estatisticas_eda.csv")
+CRITICIDADE_FILE_PATH = os.path.join(OUTPUT_PATH, "resultado_criticidade.csv")
+MATRIZ_FILE_PATH = os.path.join(OUTPUT_PATH, "matriz_priorizacao.csv")
+TOPOLOGIA_FILE_PATH = os.path.join(OUTPUT_PATH, "topologia_trechos.csv")
 
+# Registros da base simulada gerada quando a base não existe
+QTD_REGISTROS_BASE = 200
 
-def main():
+
+# Funções das etapas (nível de módulo, para execução em outros processos)
+# Cada uma retorna o número de linhas processadas (vazão nas métricas da etapa)
+
+def etapa_gerar_base(output_path, qtd_registros):
+    gerar_base_simulada(output_path, qtd_registros)
+    return qtd_registros
+
+
+def etapa_gerar_pesos():
+    return len(gerar_pesos_iniciais())
+
+
+def etapa_cache_colunar(base_path):
+    atualizar_cache(base_path)
+    return linhas_base(base_path)
+
+
+def etapa_validar(base_path, pesos_path):
+    pesos_df = pd.read_csv(pesos_path)
+    validar_pesos(base_path, pesos_df)
+    return linhas_base(base_path)
+
+
+def etapa_eda(base_path, saida_path):
+    estatisticas = calcular_estatisticas(base_path)
+    estatisticas.resumo().to_csv(saida_path)
+    return estatisticas.n_linhas
+
+
+def etapa_criticidade(base_path, pesos_path, saida_path):
+    df, pesos_df = criterio.carregar_dados_pesos(base_path, pesos_path)
+    criterio.validar_pesos(df, pesos_df)
+    criterio.calcular_criticidade(df, pesos_df).to_csv(saida_path, index=False)
+    return len(df)
+
+
+def etapa_matriz(base_path, pesos_path, saida_path):
+    df, pesos_df = matriz_prioridade.carregar_dados_e_pesos(base_path, pesos_path)
+    matriz_prioridade.validar_pesos(df, pesos_df)
+    matriz_prioridade.calcular_criticidade(df, pesos_df).to_csv(saida_path, index=False)
+    return len(df)
+
+
+def etapa_ingestao(novos_eventos_path, pesos_path, historico_path):
+    novos_df = carregar_base(novos_eventos_path)
+    ingerir_eventos(novos_df, pd.read_csv(pesos_path), historico_path)
+    return len(novos_df)
+
+
+def gerar_relatorio():
     """
-    Script principal que integra a geração da base, os pesos e validação.
+    Figuras da EDA, da criticidade e da matriz no relatório HTML ativo (REDE_AEREA_RELATORIO).
     """
-    print("### Executando Sistema Integrado ###\n")
+    if relatorio_html.relatorio_ativo() is None:
+        return None
+    with instrumentacao.etapa("graficos"):
+        eda.gerar_graficos(calcular_estatisticas(BASE_FILE_PATH))
+        criterio.gerar_graficos(pd.read_csv(CRITICIDADE_FILE_PATH))
+        matriz_prioridade.gerar_matriz_priorizacao(pd.read_csv(MATRIZ_FILE_PATH))
+    return relatorio_html.gravar()
+
 
-    # Gerar base de dados simulada
-    if not os.path.exists(BASE_FILE_PATH):
-        print("Gerando a base de dados simulada...\n")
-        gerar_base_simulada(BASE_FILE_PATH)
-    else:
-        print("Base de dados já existente. Prosseguindo...\n")
+def montar_estagios(novos_eventos_path=None):
+    """
+    Grafo de etapas do estudo, com entradas, saídas e parâmetros de cada etapa.
+    """
+    # Topologia (opcional): lida pelos carregadores quando os pesos citam métricas de topologia
+    topologia = [TOPOLOGIA_FILE_PATH] if os.path.exists(TOPOLOGIA_FILE_PATH) else []
+    estagios = [
+        Estagio("gerar_base", etapa_gerar_base, saidas=[BASE_FILE_PATH],
+                parametros={"output_path": BASE_FILE_PATH, "qtd_registros": QTD_REGISTROS_BASE},
+                somente_se_ausente=True),
+        Estagio("gerar_pesos", etapa_gerar_pesos, saidas=[PESOS_FILE_PATH], somente_se_ausente=True),
+        Estagio("cache_colunar", etapa_cache_colunar, entradas=[BASE_FILE_PATH],
+                parametros={"base_path": BASE_FILE_PATH}),
+        Estagio("validar", etapa_validar, entradas=[BASE_FILE_PATH, PESOS_FILE_PATH],
+                parametros={"base_path": BASE_FILE_PATH, "pesos_path": PESOS_FILE_PATH},
+                dependencias=["cache_colunar"]),
+        Estagio("eda", etapa_eda, entradas=[BASE_FILE_PATH], saidas=[EDA_FILE_PATH],
+                parametros={"base_path": BASE_FILE_PATH, "saida_path": EDA_FILE_PATH},
+                dependencias=["cache_colunar"]),
+        Estagio("criticidade", etapa_criticidade, entradas=[BASE_FILE_PATH, PESOS_FILE_PATH] + topologia,
+                saidas=[CRITICIDADE_FILE_PATH],
+                parametros={"base_path": BASE_FILE_PATH, "pesos_path": PESOS_FILE_PATH,
+                            "saida_path": CRITICIDADE_FILE_PATH},
+                dependencias=["validar"]),
+        Estagio("matriz_priorizacao", etapa_matriz, entradas=[BASE_FILE_PATH, PESOS_FILE_PATH] + topologia,
+                saidas=[MATRIZ_FILE_PATH],
+                parametros={"base_path": BASE_FILE_PATH, "pesos_path": PESOS_FILE_PATH,
+                            "saida_path": MATRIZ_FILE_PATH},
+                dependencias=["validar"]),
+    ]
+    if novos_eventos_path is not None:
+        # A chave depende só do lote: o mesmo lote não é ingerido de novo quando os pesos mudam
+        estagios.append(Estagio(
+            "ingestao", etapa_ingestao, entradas=[novos_eventos_path],
+            parametros={"novos_eventos_path": novos_eventos_path, "pesos_path": PESOS_FILE_PATH,
+                        "historico_path": HISTORICO_PATH},
+            dependencias=["gerar_pesos"]))
+    return estagios
+
+
+def main(novos_eventos_path=None, n_processos=1, forcar=()):
+    """
+    Script principal que integra todas as etapas do estudo (geração, pesos, validação, EDA,
+    criticidade e matriz de priorização), reaproveitando as etapas em cache.
+    Se `novos_eventos_path` for informado, o lote é ingerido no histórico incremental.
+    """
+    print("### Executando Sistema Integrado ###\n")
 
-    # Gerar ou carregar os pesos
-    if not os.path.exists(PESOS_FILE_PATH):
-        print("Gerando a base de pesos iniciais...\n")
-        gerar_pesos_iniciais()
-    else:
-        print("Base de pesos existente. Prosseguindo...\n")
+    estados = executar_pipeline(montar_estagios(novos_eventos_path), OUTPUT_PATH,
+                                n_processos=n_processos, forcar=forcar)
+    gerar_relatorio()
 
-    # Validar os pesos com a base de dados
-    print("Validando os pesos com a base de dados...\n")
-    validar_pesos(BASE_FILE_PATH, pd.read_csv(PESOS_FILE_PATH))
+    # Métricas por etapa (destinos em REDE_AEREA_METRICAS)
+    print("\n" + instrumentacao.instrumentacao_ativa().resumo())
+    instrumentacao.emitir()
 
     print("\n### Sistema Integrado Finalizado com Sucesso ###")
+    return estados
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -28,13 +28,34 @@
     2. Inclusão de validação automática entre pesos e colunas da base de dados.
     3. Cálculo do Índice de Criticidade atualizado com variáveis reais, incluindo Impacto_FEC.
     4. Geração da coluna "Impacto_DEC_FEC" combinando valores de DEC e FEC.
+    5. Modo out-of-core (calcular_criticidade_streaming): duas passagens em blocos sobre a base,
+       a primeira coleta mínimos/máximos globais e a segunda normaliza, pontua e grava bloco a bloco.
+    6. Modo headless (REDE_AEREA_HEADLESS=1): apenas o cálculo, sem importar o Plotly.
+       Com REDE_AEREA_RELATORIO, a matriz vai para um único relatório HTML (relatorio_html.py).
+    7. Normalização e soma ponderada pelo núcleo comum nucleo_criticidade.py (em blocos, sem temporários
+       do tamanho da base), o mesmo usado em criterio_definido_classificar_criticidade.py.
+    8. Normalizações robustas a valores extremos (normalizacao="percentil", "quantis" ou "z_robusto"),
+       com parâmetros de sketches de quantis mescláveis (normalizacao_robusta.py), sem ordenar as colunas.
+    9. Recorte opcional da base na carga (inicio, fim, ativos, colunas), lendo apenas as partições ano/mês
+       que cruzam o filtro (armazenamento_particionado.py).
+    10. Resultado gravado por exportacao_resultados.py: apenas chaves do ativo, índice e posição
+       (Parquet por padrão; colunas *_Norm com REDE_AEREA_COLUNAS_RESULTADOS=todas) e um resumo Top-K.
 '''
 
 # Importar bibliotecas
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
 import os
+import instrumentacao
+import relatorio_html
+from acesso_dados import colunas_base, iterar_blocos
+from armazenamento_particionado import carregar_base_filtrada
+from exportacao_resultados import exportar_resultados
+from normalizacao_robusta import NormalizadorRobusto, construir_sketches, sketches_da_base
+from nucleo_criticidade import calcular_pontuacao, colunas_variaveis
+from ranking_criticidade import ordenar_por_criticidade
+from topologia_rede import juntar_topologia_pesos
+from visualizacao_escalavel import ORCAMENTO_PONTOS, graficos_habilitados, selecionar_top_n, tabela_paginada
 
 # Caminhos para arquivos
 output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
@@ -44,12 +65,15 @@ dados_path = os.path.join(output_path, "interrupcoes_light.csv")
 # Funções do Script
 
 
-def carregar_dados_e_pesos(dados_path, pesos_path):
+def carregar_dados_e_pesos(dados_path, pesos_path, inicio=None, fim=None, ativos=None, colunas=None):
     """
     Carrega a base de dados e os pesos fornecidos no arquivo externo.
+    Filtros opcionais: intervalo de datas (fim inclusivo), tipos de ativo e subconjunto de colunas.
     """
-    df = pd.read_csv(dados_path)
+    df = carregar_base_filtrada(dados_path, inicio, fim, ativos, colunas)
     pesos_df = pd.read_csv(pesos_path)
+    # Métricas de topologia (topologia_rede.py) citadas nos pesos
+    df = juntar_topologia_pesos(df, pesos_df, dados_path)
     print("Base de dados e pesos carregados com sucesso!\n")
     return df, pesos_df
 
@@ -68,9 +92,12 @@ def validar_pesos(df, pesos_df):
     print("Validação bem-sucedida: Todas as variáveis estão presentes na base de dados.\n")
 
 
-def calcular_criticidade(df, pesos_df):
+def calcular_criticidade(df, pesos_df, top_k=None, normalizacao="minmax"):
     """
     Calcula o Índice de Criticidade utilizando os pesos fornecidos.
+    Com top_k, retorna apenas os K ativos mais críticos (seleção parcial,
+    mesma ordem e desempate da ordenação completa).
+    normalizacao: "minmax" (padrão) ou uma normalização robusta de normalizacao_robusta.METODOS.
     """
     # Dicionário de pesos
     pesos_dict = dict(zip(pesos_df["Variavel"], pesos_df["Peso"]))
@@ -82,68 +109,141 @@ def calcular_criticidade(df, pesos_df):
         raise KeyError(
             "As colunas 'Impacto_DEC' e 'Impacto_FEC' são necessárias para calcular 'Impacto_DEC_FEC'.")
 
-    # Normalização Min-Max
-    for col in pesos_dict.keys():
-        if col in df.columns:
-            df[col + "_Norm"] = (df[col] - df[col].min()) / \
-                (df[col].max() - df[col].min())
-
-    # Cálculo do índice
-    df["Indice_Criticidade"] = sum(
-        df[col + "_Norm"] * peso for col, peso in pesos_dict.items()
-    )
+    # Normalização e cálculo do índice pelo núcleo comum (nucleo_criticidade.py)
+    if normalizacao != "minmax":
+        # Parâmetros robustos a partir de sketches de quantis, sem ordenar as colunas
+        normalizacao = NormalizadorRobusto(normalizacao, construir_sketches(colunas_variaveis(df, pesos_dict)))
+    _pontuar(df, pesos_dict, normalizacao)
 
     # Ordena por criticidade
-    df = df.sort_values(by="Indice_Criticidade", ascending=False)
-    return df
+    return ordenar_por_criticidade(df, "Indice_Criticidade", top_k)
+
+
+def _pontuar(df, pesos_dict, normalizacao="minmax", minimos=None, maximos=None):
+    """
+    Grava as colunas *_Norm e o Indice_Criticidade de df (no Min-Max, extremos da própria df se omitidos).
+    """
+    colunas = colunas_variaveis(df, pesos_dict)
+    normalizadas = [np.empty(len(df)) for _ in colunas]
+    indice = calcular_pontuacao(colunas, list(pesos_dict.values()), normalizacao=normalizacao,
+                                minimos=minimos, maximos=maximos, normalizadas=normalizadas)
+    for col, valores in zip(pesos_dict, normalizadas):
+        df[col + "_Norm"] = valores
+    df["Indice_Criticidade"] = indice
 
 
-def gerar_matriz_priorizacao(df):
+def _calcular_extremos_globais(dados_path, pesos_dict, tamanho_bloco):
+    """
+    1ª passagem: mínimos e máximos globais de cada variável ponderada.
+    """
+    minimos = {col: [] for col in pesos_dict}
+    maximos = {col: [] for col in pesos_dict}
+    for bloco in iterar_blocos(dados_path, tamanho_bloco):
+        bloco["Impacto_DEC_FEC"] = bloco["Impacto_DEC"] + bloco["Impacto_FEC"]
+        for col in pesos_dict.keys():
+            if col in bloco.columns:
+                minimos[col].append(bloco[col].min())
+                maximos[col].append(bloco[col].max())
+
+    # O mínimo global é o mínimo dos mínimos por bloco (idem para o máximo)
+    return ({col: pd.Series(v).min() for col, v in minimos.items() if v},
+            {col: pd.Series(v).max() for col, v in maximos.items() if v})
+
+
+def calcular_criticidade_streaming(dados_path, pesos_df, saida_path, tamanho_bloco=1_000_000,
+                                   normalizacao="minmax", n_processos=1):
+    """
+    Calcula o Índice de Criticidade fora da memória, em duas passagens sobre a base.
+    A memória fica limitada ao tamanho do bloco, independentemente do tamanho da base.
+    Cada linha gravada é idêntica (bit a bit) à de calcular_criticidade; as linhas
+    seguem a ordem da base, pois a ordenação global exigiria a base inteira em memória.
+    Com uma normalização robusta, a 1ª passagem constrói sketches de quantis (em paralelo com n_processos).
+    """
+    pesos_dict = dict(zip(pesos_df["Variavel"], pesos_df["Peso"]))
+
+    colunas = colunas_base(dados_path)
+    if "Impacto_DEC" not in colunas or "Impacto_FEC" not in colunas:
+        raise KeyError(
+            "As colunas 'Impacto_DEC' e 'Impacto_FEC' são necessárias para calcular 'Impacto_DEC_FEC'.")
+
+    # 1ª passagem: extremos globais ou sketches de quantis
+    if normalizacao == "minmax":
+        minimos, maximos = _calcular_extremos_globais(dados_path, pesos_dict, tamanho_bloco)
+        minimos, maximos = [minimos[col] for col in pesos_dict], [maximos[col] for col in pesos_dict]
+    else:
+        normalizacao = NormalizadorRobusto(normalizacao, sketches_da_base(dados_path, list(pesos_dict), n_processos))
+        minimos = maximos = None
+
+    # 2ª passagem: normalizar, pontuar e gravar bloco a bloco
+    linhas = 0
+    for bloco in iterar_blocos(dados_path, tamanho_bloco):
+        bloco["Impacto_DEC_FEC"] = bloco["Impacto_DEC"] + bloco["Impacto_FEC"]
+        _pontuar(bloco, pesos_dict, normalizacao, minimos, maximos)
+        bloco.to_csv(saida_path, index=False, mode="w" if linhas == 0 else "a",
+                     header=linhas == 0)
+        linhas += len(bloco)
+
+    print(f"Índice de Criticidade calculado em blocos para {linhas} registros: {saida_path}")
+    return saida_path
+
+
+def gerar_matriz_priorizacao(df, orcamento_tabela=None):
     """
     Gera a tabela interativa da Matriz de Priorizacao usando Plotly.
+    Apenas os ativos mais críticos (orçamento da tabela) são enviados, em páginas.
     """
-    fig = go.Figure(
-        data=[go.Table(
-            columnwidth=[10, 5, 5, 5, 5, 5],
-            header=dict(values=[
-                "<b>Ativo</b>", "<b>Freq. Falhas (Norm)</b>", "<b>Tempo Operação (Norm)</b>",
-                "<b>Impacto DEC/FEC (Norm)</b>", "<b>Índice de Criticidade</b>"
-            ], fill_color='lightgrey', align='center'),
-            cells=dict(values=[
-                df["Ativo"],
-                np.round(df.get("Freq_Falhas_Norm", 0), 2),
-                np.round(df.get("Tempo_Operacao_Norm", 0), 2),
-                np.round(df.get("Impacto_DEC_FEC_Norm", 0), 2),
-                np.round(df["Indice_Criticidade"], 2)
-            ], fill_color='white', align='center')
-        )]
-    )
-    fig.update_layout(
-        title_text="Matriz de Priorizacao dos Ativos",
-        title_x=0.5, margin=dict(l=10, r=10, t=50, b=10), width=800
+    top_df = selecionar_top_n(df, "Indice_Criticidade", orcamento_tabela or ORCAMENTO_PONTOS["tabela"])
+
+    def coluna_norm(nome):
+        return np.round(top_df[nome], 2) if nome in top_df.columns else np.zeros(len(top_df))
+
+    fig = tabela_paginada(
+        colunas=[
+            top_df["Ativo"],
+            coluna_norm("Freq_Falhas_Norm"),
+            coluna_norm("Tempo_Operacao_Norm"),
+            coluna_norm("Impacto_DEC_FEC_Norm"),
+            np.round(top_df["Indice_Criticidade"], 2)
+        ],
+        cabecalhos=[
+            "<b>Ativo</b>", "<b>Freq. Falhas (Norm)</b>", "<b>Tempo Operação (Norm)</b>",
+            "<b>Impacto DEC/FEC (Norm)</b>", "<b>Índice de Criticidade</b>"
+        ],
+        titulo="Matriz de Priorizacao dos Ativos",
+        total_linhas=len(df),
+        columnwidth=[10, 5, 5, 5, 5, 5]
     )
-    fig.show()
+    relatorio_html.exibir(fig, "Matriz de Priorização")
 
 
 # Script Principal
 if __name__ == "__main__":
     # Carregar dados e pesos
-    df, pesos_df = carregar_dados_e_pesos(dados_path, pesos_file_path)
+    with instrumentacao.etapa("carregamento") as registro:
+        df, pesos_df = carregar_dados_e_pesos(dados_path, pesos_file_path)
+        registro["linhas"] = len(df)
 
     # Validar os pesos
-    validar_pesos(df, pesos_df)
+    with instrumentacao.etapa("validar_pesos"):
+        validar_pesos(df, pesos_df)
 
     # Calcular criticidade
-    df = calcular_criticidade(df, pesos_df)
+    with instrumentacao.etapa("criticidade", linhas=len(df)):
+        df = calcular_criticidade(df, pesos_df)
 
     # Exibir matriz no terminal
     print("Matriz de Priorizacao dos Ativos:\n")
     print(df[["Ativo", "Indice_Criticidade"]].to_string(index=False))
 
-    # Gerar matriz interativa
-    gerar_matriz_priorizacao(df)
+    # Gerar matriz interativa (exceto no modo headless)
+    if graficos_habilitados():
+        with instrumentacao.etapa("graficos"):
+            gerar_matriz_priorizacao(df)
 
     # Salvar resultados
-    resultado_path = os.path.join(output_path, "matriz_priorizacao.csv")
-    df.to_csv(resultado_path, index=False)
-    print(f"\nResultados salvos em: {resultado_path}")
+    with instrumentacao.etapa("gravacao", linhas=len(df)):
+        caminhos = exportar_resultados(df, os.path.join(output_path, "matriz_priorizacao"), "Indice_Criticidade")
+    print(f"\nResultados salvos em: {caminhos['resultado']}")
+    print(f"Resumo dos mais críticos salvo em: {caminhos['resumo']}")
+    relatorio_html.gravar()
+    instrumentacao.emitir()
@@ -0,0 +1,76 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: compartilhar arrays NumPy entre processos sem serializá-los (pickle) para cada tarefa.
+
+    |> O que o Script Faz
+        Copia um array para um bloco de multiprocessing.shared_memory e devolve um descritor pequeno (nome, forma, tipo).
+        alocar_array_compartilhado cria o bloco vazio, para ser preenchido diretamente (ex.: np.take(..., out=)).
+        Os processos de trabalho recebem apenas o descritor e reconstroem uma visão do array sobre a mesma memória.
+        iniciar_trabalhador serve de initializer do ProcessPoolExecutor: anexa os arrays uma vez por processo,
+        e as tarefas os obtêm por nome com arrays_trabalhador().
+        O processo principal é responsável por liberar os blocos (liberar_arrays) ao final.
+'''
+
+# Importar bibliotecas
+import numpy as np
+from multiprocessing import shared_memory
+
+# Arrays anexados em cada processo de trabalho (nome -> (bloco, array))
+_ARRAYS_TRABALHADOR = {}
+
+
+def criar_array_compartilhado(array):
+    """
+    Copia o array para memória compartilhada e retorna (bloco, descritor).
+    """
+    array = np.ascontiguousarray(array)
+    bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    destino = np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)
+    destino[...] = array
+    return bloco, (bloco.name, array.shape, array.dtype.str)
+
+
+def alocar_array_compartilhado(forma, tipo=np.float64):
+    """
+    Cria um array vazio em memória compartilhada (para ser preenchido sem cópia intermediária).
+    Retorna (bloco, descritor, array).
+    """
+    tipo = np.dtype(tipo)
+    forma = tuple(np.atleast_1d(forma))
+    bloco = shared_memory.SharedMemory(create=True, size=max(int(np.prod(forma)) * tipo.itemsize, 1))
+    return bloco, (bloco.name, forma, tipo.str), np.ndarray(forma, dtype=tipo, buffer=bloco.buf)
+
+
+def anexar_array(descritor):
+    """
+    Reconstrói, a partir do descritor, uma visão do array compartilhado.
+    Retorna (bloco, array); o bloco deve permanecer referenciado enquanto o array for usado.
+    """
+    nome, forma, tipo = descritor
+    bloco = shared_memory.SharedMemory(name=nome)
+    return bloco, np.ndarray(forma, dtype=np.dtype(tipo), buffer=bloco.buf)
+
+
+def iniciar_trabalhador(descritores):
+    """
+    Initializer do pool de processos: anexa os arrays compartilhados ({nome: descritor}).
+    """
+    for nome, descritor in descritores.items():
+        _ARRAYS_TRABALHADOR[nome] = anexar_array(descritor)
+
+
+def arrays_trabalhador():
+    """
+    Arrays anexados por iniciar_trabalhador no processo atual, por nome.
+    """
+    return {nome: array for nome, (_, array) in _ARRAYS_TRABALHADOR.items()}
+
+
+def liberar_arrays(blocos):
+    """
+    Fecha e remove os blocos de memória compartilhada criados pelo processo principal.
+    """
+    for bloco in blocos:
+        bloco.close()
+        bloco.unlink()
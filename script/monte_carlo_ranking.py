@@ -0,0 +1,216 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: medir a incerteza do ranking de criticidade por simulação de Monte Carlo.
+
+    |> O que o Script Faz
+        Os pesos de pesos_anal_criticidade.csv são estimativas pontuais e os impactos medidos têm ruído.
+        Cada réplica:
+            Perturba os pesos com um fator lognormal (desvio `variacao_pesos`).
+            Reamostra os eventos por bootstrap de Poisson (cada evento recebe um peso ~ Poisson(1)).
+            Calcula o índice de cada ativo (média do índice Min-Max dos seus eventos) e o ranking dos ativos.
+        As réplicas são processadas em lotes vetorizados (produto matricial + np.add.reduceat por ativo).
+        Os lotes são divididos em sequências contíguas, uma por processo do pool:
+            Cada processo acumula os lotes da sua sequência e devolve um único conjunto de acumuladores
+            (histograma de ranks em uint32), em vez de um histograma por lote.
+        A base normalizada fica em memória compartilhada (memoria_compartilhada.py); os processos recebem
+        apenas descritores, sem cópia serializada dos dados.
+        Cada lote usa um gerador derivado da semente e do número do lote: o resultado independe do número de processos.
+        Resultado por ativo:
+            Rank observado (pesos originais, sem bootstrap), rank médio e desvio padrão.
+            Percentis 5/50/95 do rank (a partir de um histograma de ranks em `n_faixas` faixas, com interpolação
+            dentro da faixa; exatos quando n_faixas >= número de ativos).
+            Probabilidade de estar no Top-K.
+
+    |> Nota:
+        Variáveis constantes (máximo = mínimo) não contribuem para o índice nas réplicas.
+        Ativos sem eventos sorteados em uma réplica mantêm o índice médio sem bootstrap daquela réplica.
+        Eventos sem a chave do ativo (ex.: Trecho vazio) entram na normalização, mas não no ranking.
+'''
+
+# Importar bibliotecas
+import os
+import numpy as np
+import pandas as pd
+import instrumentacao
+from concurrent.futures import ProcessPoolExecutor
+from acesso_dados import carregar_base_compacta
+from analise_cenarios import normalizar_variaveis
+from memoria_compartilhada import arrays_trabalhador, criar_array_compartilhado, iniciar_trabalhador, liberar_arrays
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+pesos_file_path = os.path.join(output_path, "pesos_anal_criticidade.csv")
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+
+# Número máximo de elementos (eventos x réplicas) por lote
+ELEMENTOS_POR_LOTE = 1 << 23
+
+def _simular_lote(matriz, inicios, pesos, config, lote, n_replicas, histograma):
+    """
+    Executa `n_replicas` réplicas, soma o histograma de ranks em `histograma` e devolve os demais
+    acumuladores de rank por ativo.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(config["semente"], spawn_key=(lote,)))
+    n_ativos = len(inicios)
+    eventos_por_ativo = np.diff(np.append(inicios, len(matriz)))
+
+    fatores = rng.lognormal(mean=0.0, sigma=config["variacao_pesos"], size=(n_replicas, len(pesos)))
+    indices = matriz @ (pesos * fatores).T  # eventos x réplicas
+
+    soma_sem_bootstrap = np.add.reduceat(indices, inicios, axis=0)
+    if config["bootstrap"]:
+        contagens = rng.poisson(1.0, size=indices.shape).astype(np.float64)
+        soma = np.add.reduceat(indices * contagens, inicios, axis=0)
+        n = np.add.reduceat(contagens, inicios, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media = np.where(n > 0, soma / n, soma_sem_bootstrap / eventos_por_ativo[:, None])
+    else:
+        media = soma_sem_bootstrap / eventos_por_ativo[:, None]
+
+    # Rank de cada ativo em cada réplica (0 = mais crítico; empates pela ordem dos ativos)
+    ordem = np.argsort(-media, axis=0, kind="stable")
+    ranks = np.empty_like(ordem)
+    np.put_along_axis(ranks, ordem, np.arange(n_ativos)[:, None], axis=0)
+
+    n_faixas = config["n_faixas"]
+    faixas = ranks * n_faixas // n_ativos
+    histograma += np.bincount(
+        (np.arange(n_ativos)[:, None] * n_faixas + faixas).ravel(), minlength=n_ativos * n_faixas
+    ).reshape(n_ativos, n_faixas)
+    return {
+        "soma_rank": ranks.sum(axis=1),
+        "soma_rank2": (ranks * ranks).sum(axis=1),
+        "top_k": (ranks < config["k"]).sum(axis=1),
+    }
+
+
+def _simular_lotes(matriz, inicios, pesos, config, lotes):
+    """
+    Executa uma sequência de lotes, acumulando no próprio processo; devolve um único conjunto de acumuladores.
+    """
+    histograma = np.zeros((len(inicios), config["n_faixas"]), dtype=np.int64)
+    total = {}
+    for lote, n_replicas in lotes:
+        for nome, valor in _simular_lote(matriz, inicios, pesos, config, lote, n_replicas, histograma).items():
+            total[nome] = total[nome] + valor if nome in total else valor
+    # Cada contagem do histograma é no máximo o número de réplicas: uint32 basta
+    total["histograma"] = histograma.astype(np.uint32)
+    return total
+
+
+def _executar_lotes_trabalhador(pesos, config, lotes):
+    arrays = arrays_trabalhador()
+    return _simular_lotes(arrays["matriz"], arrays["inicios"], pesos, config, lotes)
+
+
+def _percentil_histograma(histograma, q, n_ativos):
+    """
+    Rank (1 = mais crítico) do percentil q de cada ativo: primeira faixa em que a frequência acumulada
+    atinge q, com interpolação linear entre os ranks da faixa (faixa de um só rank: exato).
+    """
+    n_faixas = histograma.shape[1]
+    acumulado = np.cumsum(histograma, axis=1, dtype=np.int64)
+    alvo = q * acumulado[:, -1]
+    faixa = (acumulado >= alvo[:, None]).argmax(axis=1)
+    linhas = np.arange(len(histograma))
+    contagem = histograma[linhas, faixa].astype(np.float64)
+    fracao = (alvo - (acumulado[linhas, faixa] - contagem)) / np.maximum(contagem, 1.0)
+
+    # Ranks (base 0) da faixa f: de ceil(f * n_ativos / n_faixas) até ceil((f + 1) * n_ativos / n_faixas) - 1
+    primeiro = -(-faixa * n_ativos // n_faixas)
+    ranks_faixa = -(-(faixa + 1) * n_ativos // n_faixas) - primeiro
+    deslocamento = np.maximum(np.ceil(fracao * ranks_faixa).astype(np.int64) - 1, 0)
+    return primeiro + deslocamento + 1
+
+
+def simular_ranking(df, pesos_df, n_replicas=10_000, k=20, variacao_pesos=0.2, bootstrap=True,
+                    chave="Trecho", n_processos=None, semente=0, n_faixas=200,
+                    elementos_por_lote=ELEMENTOS_POR_LOTE):
+    """
+    Distribuição do rank de cada ativo sob perturbação dos pesos e bootstrap dos eventos.
+    """
+    variaveis = pesos_df["Variavel"].tolist()
+    pesos = pesos_df["Peso"].to_numpy(dtype=np.float64)
+
+    # Normalização única; eventos ordenados por ativo para o reduceat
+    codigos, rotulos = pd.factorize(df[chave], sort=False)
+    ordem = np.argsort(codigos, kind="stable")
+    # Eventos sem chave (código -1, no início da ordem) ficam fora do ranking
+    ordem = ordem[np.count_nonzero(codigos < 0):]
+    matriz = np.nan_to_num(normalizar_variaveis(df, variaveis)[ordem], nan=0.0)
+    inicios = np.flatnonzero(np.r_[True, np.diff(codigos[ordem]) != 0])
+    n_ativos = len(inicios)
+    n_faixas = min(n_faixas, n_ativos)
+
+    config = {"semente": semente, "variacao_pesos": variacao_pesos, "bootstrap": bootstrap,
+              "k": k, "n_faixas": n_faixas}
+    replicas_por_lote = max(1, min(n_replicas, elementos_por_lote // max(len(matriz), 1)))
+    lotes = [(lote, min(replicas_por_lote, n_replicas - inicio))
+             for lote, inicio in enumerate(range(0, n_replicas, replicas_por_lote))]
+
+    # Uma sequência contígua de lotes por processo; somas inteiras: independe da divisão dos lotes
+    total = {}
+
+    def acumular(resultado):
+        for nome, valor in resultado.items():
+            total[nome] = total[nome] + valor if nome in total else valor
+
+    n_processos = min(n_processos or os.cpu_count() or 1, len(lotes))
+    if n_processos == 1:
+        acumular(_simular_lotes(matriz, inicios, pesos, config, lotes))
+    else:
+        limites = np.linspace(0, len(lotes), n_processos + 1).astype(np.int64)
+        sequencias = [lotes[inicio:fim] for inicio, fim in zip(limites[:-1], limites[1:])]
+        blocos, descritores = [], {}
+        try:
+            for nome, array in (("matriz", matriz), ("inicios", inicios)):
+                bloco, descritores[nome] = criar_array_compartilhado(array)
+                blocos.append(bloco)
+            with ProcessPoolExecutor(max_workers=n_processos, initializer=iniciar_trabalhador,
+                                     initargs=(descritores,)) as executor:
+                futuros = [executor.submit(_executar_lotes_trabalhador, pesos, config, sequencia)
+                           for sequencia in sequencias]
+                for futuro in futuros:
+                    acumular(futuro.result())
+        finally:
+            liberar_arrays(blocos)
+
+    media_rank = total["soma_rank"] / n_replicas
+    variancia = np.maximum(total["soma_rank2"] / n_replicas - media_rank ** 2, 0.0)
+
+    # Rank observado: pesos originais, sem bootstrap
+    observado = np.add.reduceat(matriz @ pesos, inicios) / np.diff(np.append(inicios, len(matriz)))
+    rank_observado = np.empty(n_ativos, dtype=np.int64)
+    rank_observado[np.argsort(-observado, kind="stable")] = np.arange(1, n_ativos + 1)
+
+    resultado = pd.DataFrame({
+        chave: rotulos[codigos[ordem][inicios]],
+        "Indice_Observado": observado,
+        "Rank_Observado": rank_observado,
+        "Rank_Medio": media_rank + 1,
+        "Rank_Desvio": np.sqrt(variancia),
+        "Rank_P05": _percentil_histograma(total["histograma"], 0.05, n_ativos),
+        "Rank_P50": _percentil_histograma(total["histograma"], 0.50, n_ativos),
+        "Rank_P95": _percentil_histograma(total["histograma"], 0.95, n_ativos),
+        f"Prob_Top{k}": total["top_k"] / n_replicas,
+    })
+    return resultado.sort_values("Rank_Observado", kind="stable").reset_index(drop=True)
+
+
+# Script Principal
+if __name__ == "__main__":
+    with instrumentacao.etapa("carregamento") as registro:
+        df = carregar_base_compacta(dados_path)
+        pesos_df = pd.read_csv(pesos_file_path)
+        registro["linhas"] = len(df)
+
+    with instrumentacao.etapa("simular_ranking", linhas=len(df) * 10_000):
+        resultado = simular_ranking(df, pesos_df, n_replicas=10_000, k=20)
+    print("Incerteza do Ranking de Criticidade (Monte Carlo):\n")
+    print(resultado.head(30).to_string(index=False))
+
+    resultado_path = os.path.join(output_path, "incerteza_ranking.csv")
+    resultado.to_csv(resultado_path, index=False)
+    print(f"\nResultados salvos em: {resultado_path}")
+    instrumentacao.emitir()
@@ -0,0 +1,146 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: normalizações robustas a valores extremos para o índice de criticidade.
+
+    |> O que o Script Faz
+        Na normalização Min-Max um único valor extremo (gerar_lognormal injeta outliers de 2 a 4 vezes)
+        comprime todos os demais ativos perto de zero. Alternativas:
+            percentil   Rank percentual do valor na distribuição da variável (0 a 1).
+            quantis     Valor limitado aos quantis QUANTIS_CORTE (1% e 99%) e escalado entre eles (0 a 1).
+            z_robusto   (valor - mediana) / (IQR / 1,349): z-score com mediana e desvio estimado pelo IQR.
+        Os parâmetros vêm de sketches de quantis KLL (sketch_quantis.py), um por variável:
+            Construídos em blocos (TAMANHO_BLOCO_SKETCH linhas), sem ordenar as colunas inteiras.
+            sketches_da_base: um sketch por grupo de linhas do cache colunar, em paralelo, mesclados na ordem
+            dos grupos (o resultado não depende do número de processos).
+            Erro de rank limitado, dependente apenas de k (K_SKETCH = 400: abaixo de 1%).
+        NormalizadorRobusto.normalizar(j, valores) normaliza no próprio bloco; é usado pelo núcleo de pontuação
+        (nucleo_criticidade.calcular_pontuacao) no lugar do Min-Max.
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from acesso_dados import atualizar_cache
+from sketch_quantis import SketchQuantis
+
+METODOS = ("percentil", "quantis", "z_robusto")
+
+# Quantis de corte da normalização "quantis"
+QUANTIS_CORTE = (0.01, 0.99)
+
+# IQR de uma normal padrão (IQR / 1,349 estima o desvio padrão)
+ESCALA_IQR_NORMAL = 1.349
+
+K_SKETCH = 400
+
+TAMANHO_BLOCO_SKETCH = 1 << 16
+
+# Variáveis derivadas que não estão na base (como em matriz_prioridade.py)
+VARIAVEIS_DERIVADAS = {"Impacto_DEC_FEC": ("Impacto_DEC", "Impacto_FEC")}
+
+
+def construir_sketches(colunas, k=K_SKETCH, semente=0, tamanho_bloco=TAMANHO_BLOCO_SKETCH, sketches=None):
+    """
+    Sketches das colunas (um por variável), alimentados em blocos. Com `sketches`, atualiza os existentes.
+    """
+    if sketches is None:
+        sketches = [SketchQuantis(k, semente=semente + j) for j in range(len(colunas))]
+    for sketch, coluna in zip(sketches, colunas):
+        for inicio in range(0, len(coluna), tamanho_bloco):
+            sketch.atualizar(coluna[inicio:inicio + tamanho_bloco])
+    return sketches
+
+
+def colunas_bloco(bloco, variaveis):
+    """
+    Vetores das variáveis de um bloco, calculando as derivadas (VARIAVEIS_DERIVADAS) ausentes.
+    """
+    colunas = []
+    for var in variaveis:
+        if var in VARIAVEIS_DERIVADAS and var not in bloco.columns:
+            a, b = VARIAVEIS_DERIVADAS[var]
+            colunas.append((bloco[a] + bloco[b]).to_numpy())
+        else:
+            colunas.append(bloco[var].to_numpy())
+    return colunas
+
+
+def colunas_leitura(variaveis):
+    """
+    Colunas da base que precisam ser lidas para obter as variáveis.
+    """
+    leitura = []
+    for var in variaveis:
+        leitura.extend(VARIAVEIS_DERIVADAS.get(var, (var,)))
+    return list(dict.fromkeys(leitura))
+
+
+def _sketches_grupo(parquet_path, grupo, variaveis, k):
+    """
+    Tarefa dos processos: sketches de um grupo de linhas do Parquet (semente própria do grupo).
+    """
+    bloco = pq.ParquetFile(parquet_path).read_row_group(grupo, columns=colunas_leitura(variaveis)).to_pandas()
+    return construir_sketches(colunas_bloco(bloco, variaveis), k, semente=grupo * len(variaveis))
+
+
+def sketches_da_base(base_path, variaveis, n_processos=1, k=K_SKETCH):
+    """
+    Sketches das variáveis sobre a base inteira (via cache colunar), por grupo de linhas e em paralelo.
+    """
+    parquet_path, _ = atualizar_cache(base_path)
+    grupos = range(pq.ParquetFile(parquet_path).num_row_groups)
+    argumentos = ([parquet_path] * len(grupos), grupos, [list(variaveis)] * len(grupos), [k] * len(grupos))
+    if n_processos > 1 and len(grupos) > 1:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            parciais = list(executor.map(_sketches_grupo, *argumentos))
+    else:
+        parciais = list(map(_sketches_grupo, *argumentos))
+
+    if not parciais:
+        return [SketchQuantis(k, semente=j) for j in range(len(variaveis))]
+    total = parciais[0]
+    for parcial in parciais[1:]:
+        for sketch, outro in zip(total, parcial):
+            sketch.mesclar(outro)
+    return total
+
+
+class NormalizadorRobusto:
+    """
+    Normalização robusta de cada variável a partir dos seus sketches de quantis.
+    """
+
+    def __init__(self, metodo, sketches, quantis_corte=QUANTIS_CORTE):
+        if metodo not in METODOS:
+            raise ValueError(f"Normalização desconhecida: {metodo} (opções: {METODOS})")
+        self.metodo = metodo
+        if metodo == "percentil":
+            self.tabelas = [sketch.distribuicao() if sketch.n else (np.empty(0), np.array([np.nan]))
+                            for sketch in sketches]
+        elif metodo == "quantis":
+            limites = np.array([sketch.quantis(quantis_corte) for sketch in sketches])
+            self.inferiores, self.superiores = limites[:, 0], limites[:, 1]
+        else:
+            quartis = np.array([sketch.quantis([0.25, 0.5, 0.75]) for sketch in sketches])
+            self.medianas = quartis[:, 1]
+            self.escalas = (quartis[:, 2] - quartis[:, 0]) / ESCALA_IQR_NORMAL
+
+    def normalizar(self, j, valores):
+        """
+        Normaliza, no próprio array (float64), os valores da variável j. NaN permanecem NaN.
+        """
+        if self.metodo == "percentil":
+            tabela, fracao = self.tabelas[j]
+            nulos = np.isnan(valores)
+            valores[:] = fracao[np.searchsorted(tabela, valores, side="right")]
+            valores[nulos] = np.nan
+        elif self.metodo == "quantis":
+            np.clip(valores, self.inferiores[j], self.superiores[j], out=valores)
+            np.subtract(valores, self.inferiores[j], out=valores)
+            np.divide(valores, self.superiores[j] - self.inferiores[j], out=valores)
+        else:
+            np.subtract(valores, self.medianas[j], out=valores)
+            np.divide(valores, self.escalas[j], out=valores)
+        return valores
@@ -0,0 +1,103 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: um único núcleo de cálculo da pontuação de criticidade para todos os scripts.
+
+    |> O que o Script Faz
+        calcular_pontuacao soma as variáveis ponderadas de cada linha:
+            normalizacao="bruta"   soma ponderada dos valores (criterio_definido_classificar_criticidade.py).
+            normalizacao="minmax"  soma ponderada de (valor - mínimo) / (máximo - mínimo) (matriz_prioridade.py).
+            normalizacao=NormalizadorRobusto(...)  percentil, quantis limitados ou z robusto (normalizacao_robusta.py).
+        As linhas são processadas em blocos do tamanho da cache (TAMANHO_BLOCO_CACHE):
+            As variáveis do bloco são copiadas para uma matriz float64 contígua (variáveis x linhas).
+            A normalização é feita no próprio bloco e a soma é acumulada no vetor de saída pré-alocado.
+            Nenhum vetor temporário do tamanho da base é criado (apenas os buffers de um bloco).
+        As operações são as mesmas, na mesma ordem, da soma original com pandas, portanto o resultado
+        é idêntico bit a bit: ((0 + v1*p1) + v2*p2) + ...
+        Opcionalmente grava as variáveis normalizadas (colunas *_Norm da matriz de priorização).
+'''
+
+# Importar bibliotecas
+import numpy as np
+
+# 32768 linhas x 8 bytes = 256 KB por variável no bloco
+TAMANHO_BLOCO_CACHE = 32768
+
+NORMALIZACOES = ("bruta", "minmax")
+
+
+def colunas_variaveis(df, variaveis):
+    """
+    Vetores NumPy das variáveis (sem cópia quando possível). KeyError se alguma não existir.
+    """
+    return [df[var].to_numpy() for var in variaveis]
+
+
+def calcular_extremos(colunas):
+    """
+    Mínimo e máximo de cada variável, ignorando NaN (como Series.min/max).
+    """
+    minimos = np.full(len(colunas), np.nan)
+    maximos = np.full(len(colunas), np.nan)
+    for j, coluna in enumerate(colunas):
+        if len(coluna):
+            minimos[j] = np.nanmin(coluna)
+            maximos[j] = np.nanmax(coluna)
+    return minimos, maximos
+
+
+def calcular_pontuacao(colunas, pesos, normalizacao="bruta", minimos=None, maximos=None, saida=None,
+                       normalizadas=None, tamanho_bloco=TAMANHO_BLOCO_CACHE):
+    """
+    Pontuação de criticidade de cada linha.
+    colunas: lista de vetores (um por variável) ou matriz (linhas x variáveis).
+    minimos/maximos: extremos da normalização Min-Max (calculados sobre as colunas se omitidos).
+    saida: vetor float64 pré-alocado para o resultado; normalizadas: vetores que recebem as variáveis normalizadas.
+    tamanho_bloco=None processa todas as linhas de uma vez.
+    """
+    # Objetos com normalizar(j, valores) (ex.: NormalizadorRobusto) normalizam cada variável no bloco
+    robusta = not isinstance(normalizacao, str)
+    if not robusta and normalizacao not in NORMALIZACOES:
+        raise ValueError(f"Normalização desconhecida: {normalizacao}")
+    if isinstance(colunas, np.ndarray) and colunas.ndim == 2:
+        colunas = [colunas[:, j] for j in range(colunas.shape[1])]
+    pesos = np.asarray(pesos, dtype=np.float64)
+    if len(pesos) != len(colunas):
+        raise ValueError(f"{len(colunas)} variáveis e {len(pesos)} pesos.")
+
+    n = len(colunas[0]) if colunas else 0
+    if saida is None:
+        saida = np.empty(n, dtype=np.float64)
+    if not robusta and normalizacao == "minmax":
+        if minimos is None or maximos is None:
+            minimos, maximos = calcular_extremos(colunas)
+        minimos = np.asarray(minimos, dtype=np.float64)
+        amplitudes = np.asarray(maximos, dtype=np.float64) - minimos
+    if not colunas:
+        saida[:] = 0.0
+        return saida
+
+    bloco = min(tamanho_bloco or n, n) or 1
+    matriz = np.empty((len(colunas), bloco), dtype=np.float64)
+    produto = np.empty(bloco, dtype=np.float64)
+
+    # Amplitude zero gera NaN/inf como na divisão do pandas, sem avisos
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for inicio in range(0, n, bloco):
+            fim = min(inicio + bloco, n)
+            m = fim - inicio
+            destino = saida[inicio:fim]
+            destino[:] = 0.0
+            for j, coluna in enumerate(colunas):
+                valores = matriz[j, :m]
+                valores[:] = coluna[inicio:fim]
+                if robusta:
+                    normalizacao.normalizar(j, valores)
+                elif normalizacao == "minmax":
+                    np.subtract(valores, minimos[j], out=valores)
+                    np.divide(valores, amplitudes[j], out=valores)
+                if normalizadas is not None and (robusta or normalizacao == "minmax"):
+                    normalizadas[j][inicio:fim] = valores
+                np.multiply(valores, pesos[j], out=produto[:m])
+                np.add(destino, produto[:m], out=destino)
+    return saida
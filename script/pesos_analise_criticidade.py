@@ -12,6 +12,8 @@
 # Importar bibliotecas
 import pandas as pd
 import os
+from acesso_dados import colunas_base
+from topologia_rede import COLUNAS_TOPOLOGIA
 
 # Caminho para o diretório de saída
 OUTPUT_PATH = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
@@ -57,13 +59,12 @@ def validar_pesos(base_path, pesos_df):
         print("Base de dados não encontrada para validação.")
         return
 
-    # Carregar base de dados
-    df = pd.read_csv(base_path)
-    colunas_base = df.columns.tolist()
+    # Ler apenas o esquema da base (cache colunar); as métricas de topologia são calculadas na carga
+    colunas = colunas_base(base_path) + list(COLUNAS_TOPOLOGIA)
 
     # Variáveis faltantes
     variaveis_faltantes = [
-        var for var in pesos_df["Variavel"] if var not in colunas_base]
+        var for var in pesos_df["Variavel"] if var not in colunas]
     if variaveis_faltantes:
         print("\nAviso: As seguintes variáveis estão nos pesos, mas não existem na base de dados:")
         print(variaveis_faltantes)
@@ -0,0 +1,334 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: executar as etapas do estudo como um grafo (DAG), reaproveitando resultados já calculados.
+
+    |> O que o Script Faz
+        Cada etapa (Estagio) declara seus arquivos de entrada e saída e seus parâmetros.
+        As dependências são deduzidas dos arquivos (quem grava uma entrada executa antes) ou declaradas por nome.
+        Cache endereçado por conteúdo:
+            A chave da etapa é o SHA-256 de: nome, parâmetros, hash do código e hash de cada entrada.
+            O código da etapa é deduzido da função: o seu próprio código-fonte e os módulos locais (arquivos .py
+            da pasta dos scripts) que ela usa, seguindo os imports desses módulos transitivamente. Alterar
+            qualquer módulo do qual a etapa depende (mesmo indiretamente) invalida a chave.
+            Após executar, cada saída é copiada para objetos/<sha256 do conteúdo> e um manifesto associa a chave às saídas.
+            Com a mesma chave, a etapa não executa: as saídas são conferidas e, se alteradas ou apagadas,
+            restauradas a partir dos objetos.
+            Os hashes dos arquivos são memorizados por (tamanho, mtime), como no cache colunar (acesso_dados.py).
+        Etapas independentes executam ao mesmo tempo em um pool de processos (n_processos > 1).
+        Etapas "somente_se_ausente" (ex.: gerar a base) só executam quando alguma saída não existe.
+        Cada etapa executada é medida pela instrumentação (instrumentacao.py), também nos processos do pool;
+        a função da etapa pode retornar o número de linhas processadas (vazão em linhas/s nas métricas);
+        etapas em cache e executadas são contadas (estagios_em_cache, estagios_executados).
+'''
+
+# Importar bibliotecas
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import instrumentacao
+from acesso_dados import DIRETORIO_CACHE, calcular_hash_arquivo
+
+# Versão do formato do cache de etapas: alterar invalida todas as chaves
+VERSAO_PIPELINE = 1
+
+
+# Valores globais incorporados à chave pelo seu conteúdo (ex.: caminhos e limites usados pela etapa)
+TIPOS_CONSTANTES = (str, int, float, bool, bytes, tuple, list, dict, frozenset, type(None))
+
+
+def _nomes_usados(codigo):
+    # Nomes globais referenciados, incluindo os de funções internas e compreensões
+    nomes = set(codigo.co_names)
+    for constante in codigo.co_consts:
+        if isinstance(constante, types.CodeType):
+            nomes |= _nomes_usados(constante)
+    return nomes
+
+
+def _globais_usados(funcao):
+    return {nome: funcao.__globals__[nome] for nome in sorted(_nomes_usados(funcao.__code__))
+            if nome in funcao.__globals__}
+
+
+def _arquivo_modulo(nome):
+    # Pelo módulo já carregado (e não por importlib.util.find_spec): vale também para __main__
+    arquivo = getattr(sys.modules.get(nome), "__file__", None)
+    return os.path.abspath(arquivo) if arquivo else None
+
+
+def _imports_locais(caminho):
+    """
+    Arquivos da mesma pasta importados pelo módulo (em qualquer ponto do arquivo).
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read(), filename=caminho)
+    nomes = set()
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.Import):
+            nomes.update(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.level == 0 and no.module:
+            nomes.add(no.module)
+    pasta = os.path.dirname(caminho)
+    candidatos = (os.path.join(pasta, nome.split(".")[0] + ".py") for nome in nomes)
+    return {candidato for candidato in candidatos if os.path.exists(candidato)}
+
+
+def arquivos_codigo(funcao):
+    """
+    Módulos locais (pasta da função) dos quais a função depende: os módulos dos objetos globais que ela usa
+    (módulos, funções e classes) e, transitivamente, os módulos locais importados por eles.
+    """
+    pasta = os.path.dirname(os.path.abspath(inspect.getsourcefile(funcao)))
+    pendentes = set()
+    for valor in _globais_usados(funcao).values():
+        nome = valor.__name__ if isinstance(valor, types.ModuleType) else getattr(valor, "__module__", None)
+        arquivo = _arquivo_modulo(nome) if isinstance(nome, str) else None
+        if arquivo and os.path.dirname(arquivo) == pasta:
+            pendentes.add(arquivo)
+    arquivos = set()
+    while pendentes:
+        arquivo = pendentes.pop()
+        arquivos.add(arquivo)
+        pendentes |= _imports_locais(arquivo) - arquivos
+    return sorted(arquivos)
+
+
+class Estagio:
+    """
+    Etapa do pipeline: `funcao(**parametros)` lê `entradas` e grava `saidas` (caminhos de arquivos).
+    Se `funcao` retornar um inteiro, ele é registrado como o número de linhas processadas.
+    """
+
+    def __init__(self, nome, funcao, entradas=(), saidas=(), parametros=None, dependencias=(),
+                 somente_se_ausente=False):
+        self.nome = nome
+        self.funcao = funcao
+        self.entradas = [os.path.abspath(p) for p in entradas]
+        self.saidas = [os.path.abspath(p) for p in saidas]
+        self.parametros = parametros or {}
+        self.dependencias = tuple(dependencias)
+        self.somente_se_ausente = somente_se_ausente
+
+
+class CacheEstagios:
+    """
+    Manifestos, objetos e memória de hashes de arquivos (em <diretorio>/.cache/estagios).
+    """
+
+    def __init__(self, diretorio):
+        self.pasta = os.path.join(diretorio, DIRETORIO_CACHE, "estagios")
+        self.pasta_objetos = os.path.join(self.pasta, "objetos")
+        self.pasta_manifestos = os.path.join(self.pasta, "manifestos")
+        self.memo_path = os.path.join(self.pasta, "arquivos.json")
+        os.makedirs(self.pasta_objetos, exist_ok=True)
+        os.makedirs(self.pasta_manifestos, exist_ok=True)
+        self.memo = _ler_json(self.memo_path) or {}
+
+    def hash_arquivo(self, caminho):
+        """
+        SHA-256 do arquivo, relido apenas se tamanho ou mtime mudaram.
+        """
+        info = os.stat(caminho)
+        registro = self.memo.get(caminho)
+        if registro and registro["tamanho"] == info.st_size and registro["mtime_ns"] == info.st_mtime_ns:
+            return registro["sha256"]
+        sha = calcular_hash_arquivo(caminho)
+        self.memo[caminho] = {"tamanho": info.st_size, "mtime_ns": info.st_mtime_ns, "sha256": sha}
+        return sha
+
+    def hash_codigo(self, funcao):
+        """
+        Versão do código da etapa: fonte da função, valores das constantes que ela usa e hash de cada
+        módulo local do qual depende.
+        """
+        fonte = inspect.getsource(funcao)
+        constantes = {nome: repr(valor) for nome, valor in _globais_usados(funcao).items()
+                      if isinstance(valor, TIPOS_CONSTANTES)}
+        return {
+            "fonte": hashlib.sha256(fonte.encode("utf-8")).hexdigest(),
+            "constantes": constantes,
+            "modulos": {os.path.splitext(os.path.basename(arquivo))[0]: self.hash_arquivo(arquivo)
+                        for arquivo in arquivos_codigo(funcao)},
+        }
+
+    def chave(self, estagio):
+        """
+        Chave da etapa: hash de nome, parâmetros, versão do código e conteúdo das entradas.
+        """
+        for entrada in estagio.entradas:
+            if not os.path.exists(entrada):
+                raise FileNotFoundError(f"Entrada da etapa '{estagio.nome}' não encontrada: {entrada}")
+        descricao = {
+            "versao": VERSAO_PIPELINE,
+            "estagio": estagio.nome,
+            "parametros": estagio.parametros,
+            "codigo": self.hash_codigo(estagio.funcao),
+            "entradas": {entrada: self.hash_arquivo(entrada) for entrada in estagio.entradas},
+        }
+        texto = json.dumps(descricao, sort_keys=True, default=str)
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+    def _objeto(self, sha):
+        return os.path.join(self.pasta_objetos, sha[:2], sha)
+
+    def restaurar(self, chave):
+        """
+        Se há manifesto para a chave, garante que as saídas têm o conteúdo registrado.
+        Retorna False quando a etapa precisa executar.
+        """
+        manifesto = _ler_json(os.path.join(self.pasta_manifestos, chave + ".json"))
+        if manifesto is None:
+            return False
+        for saida, sha in manifesto["saidas"].items():
+            if os.path.exists(saida) and self.hash_arquivo(saida) == sha:
+                continue
+            objeto = self._objeto(sha)
+            if not os.path.exists(objeto):
+                return False
+            temporario = saida + ".tmp"
+            shutil.copyfile(objeto, temporario)
+            os.replace(temporario, saida)
+            self.memo.pop(saida, None)
+        return True
+
+    def registrar(self, chave, estagio):
+        """
+        Guarda as saídas como objetos (endereçados pelo conteúdo) e grava o manifesto da chave.
+        """
+        saidas = {}
+        for saida in estagio.saidas:
+            if not os.path.exists(saida):
+                raise FileNotFoundError(f"A etapa '{estagio.nome}' não gerou a saída declarada: {saida}")
+            sha = self.hash_arquivo(saida)
+            objeto = self._objeto(sha)
+            if not os.path.exists(objeto):
+                os.makedirs(os.path.dirname(objeto), exist_ok=True)
+                shutil.copyfile(saida, objeto + ".tmp")
+                os.replace(objeto + ".tmp", objeto)
+            saidas[saida] = sha
+        _gravar_json(os.path.join(self.pasta_manifestos, chave + ".json"),
+                     {"estagio": estagio.nome, "saidas": saidas})
+
+    def salvar(self):
+        _gravar_json(self.memo_path, self.memo)
+
+
+def _ler_json(caminho):
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _gravar_json(caminho, conteudo):
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(conteudo, arquivo, indent=2)
+    os.replace(temporario, caminho)
+
+
+def _executar_etapa(funcao, parametros, registro):
+    # Linhas processadas informadas pela etapa (retorno inteiro), para a vazão
+    linhas = funcao(**parametros)
+    if isinstance(linhas, int) and not isinstance(linhas, bool):
+        registro["linhas"] = linhas
+
+
+def _executar_instrumentado(funcao, parametros, nome, configuracao):
+    """
+    Tarefa dos processos: executa a etapa com instrumentação própria e devolve as métricas.
+    """
+    ativa = instrumentacao.configurar(**configuracao)
+    with ativa.etapa(nome) as registro:
+        _executar_etapa(funcao, parametros, registro)
+    return ativa.etapas, ativa.contadores
+
+
+def ordenar_estagios(estagios):
+    """
+    Dependências de cada etapa (por arquivos e por nome) e verificação de ciclos.
+    """
+    nomes = {e.nome for e in estagios}
+    produtores = {saida: e.nome for e in estagios for saida in e.saidas}
+    dependencias = {}
+    for e in estagios:
+        desconhecidas = set(e.dependencias) - nomes
+        if desconhecidas:
+            raise ValueError(f"Etapa '{e.nome}' depende de etapas inexistentes: {sorted(desconhecidas)}")
+        dependencias[e.nome] = set(e.dependencias) | {
+            produtores[entrada] for entrada in e.entradas if entrada in produtores and produtores[entrada] != e.nome}
+
+    # Kahn: todas as etapas devem ser alcançáveis sem ciclos
+    concluidas, restantes = set(), set(nomes)
+    while restantes:
+        prontas = {nome for nome in restantes if dependencias[nome] <= concluidas}
+        if not prontas:
+            raise ValueError(f"Ciclo entre as etapas: {sorted(restantes)}")
+        concluidas |= prontas
+        restantes -= prontas
+    return dependencias
+
+
+def executar_pipeline(estagios, diretorio_cache, n_processos=1, forcar=()):
+    """
+    Executa as etapas na ordem do grafo, pulando as que estão em cache.
+    `forcar` lista etapas a executar mesmo com cache válido.
+    Retorna o estado de cada etapa: "executada", "cache" ou "existente".
+    """
+    dependencias = ordenar_estagios(estagios)
+    por_nome = {e.nome: e for e in estagios}
+    cache = CacheEstagios(diretorio_cache)
+    estados, chaves, em_execucao = {}, {}, {}
+    executor = ProcessPoolExecutor(max_workers=n_processos) if n_processos > 1 else None
+    ativa = instrumentacao.instrumentacao_ativa()
+    configuracao = {"memoria": ativa.memoria, "etapa_perfil": ativa.etapa_perfil,
+                    "diretorio_perfil": ativa.diretorio_perfil, "execucao": ativa.execucao}
+
+    def concluir(nome):
+        estagio = por_nome[nome]
+        cache.registrar(chaves[nome], estagio)
+        estados[nome] = "executada"
+        instrumentacao.contar("estagios_executados")
+        print(f"[pipeline] {nome}: executada")
+
+    try:
+        while len(estados) < len(estagios):
+            prontas = [e for e in estagios if e.nome not in estados and e.nome not in em_execucao
+                       and dependencias[e.nome] <= set(estados)]
+            for estagio in prontas:
+                if estagio.somente_se_ausente and all(os.path.exists(s) for s in estagio.saidas):
+                    estados[estagio.nome] = "existente"
+                    print(f"[pipeline] {estagio.nome}: saídas já existentes")
+                    continue
+                chaves[estagio.nome] = cache.chave(estagio)
+                if estagio.nome not in forcar and cache.restaurar(chaves[estagio.nome]):
+                    estados[estagio.nome] = "cache"
+                    instrumentacao.contar("estagios_em_cache")
+                    print(f"[pipeline] {estagio.nome}: em cache")
+                    continue
+                if executor is None:
+                    with instrumentacao.etapa(estagio.nome) as registro:
+                        _executar_etapa(estagio.funcao, estagio.parametros, registro)
+                    concluir(estagio.nome)
+                else:
+                    em_execucao[estagio.nome] = executor.submit(
+                        _executar_instrumentado, estagio.funcao, estagio.parametros, estagio.nome, configuracao)
+
+            if em_execucao:
+                feitas, _ = wait(em_execucao.values(), return_when=FIRST_COMPLETED)
+                for nome in [n for n, futuro in em_execucao.items() if futuro in feitas]:
+                    instrumentacao.instrumentacao_ativa().incorporar(*em_execucao.pop(nome).result())
+                    concluir(nome)
+            cache.salvar()
+    finally:
+        cache.salvar()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return estados
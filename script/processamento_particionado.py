@@ -0,0 +1,327 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: usar todos os núcleos do servidor no cálculo da criticidade, particionando a base.
+
+    |> O que o Script Faz
+        Particiona os eventos por tipo de ativo (por="Ativo") ou por mês (por="mes"):
+            As linhas são reordenadas uma vez (ordenação estável pela partição), de modo que cada partição
+            é uma fatia contígua das colunas; partições grandes são divididas em tarefas de LINHAS_POR_TAREFA linhas.
+            As colunas das variáveis, os códigos de Trecho e os vetores de saída ficam em memória compartilhada
+            (memoria_compartilhada.py): os processos recebem apenas descritores, sem cópia serializada (pickle).
+            Eventos sem a chave da partição (sem Ativo ou sem Data_Interrupcao) formam a última partição
+            (sem_ativo / sem_data), como em armazenamento_particionado.py.
+        Duas fases no pool de processos, cada uma seguida de uma redução global determinística:
+            1ª fase: mínimos e máximos de cada variável por tarefa -> extremos globais (mínimo dos mínimos etc.).
+            2ª fase: normalização e pontuação pelo núcleo comum (nucleo_criticidade.py) com os extremos globais,
+                     Top-K local de cada tarefa e agregação por ativo (Trecho) da tarefa.
+                     Os candidatos Top-K de todas as tarefas são mesclados (mesmo desempate de ranking_criticidade.py)
+                     e as agregações parciais são somadas na ordem das tarefas.
+                     Eventos sem Trecho entram no ranking, mas não na agregação por Trecho.
+        O índice de cada linha é idêntico (bit a bit) ao de calcular_criticidade; o ranking e o Top-K também.
+        As tarefas não dependem do número de processos, portanto as agregações também não.
+        normalizacao="minmax" reproduz matriz_prioridade.py (colunas *_Norm e Indice_Criticidade);
+        normalizacao="bruta" reproduz criterio_definido_classificar_criticidade.py (Criticidade_Calculada).
+
+    |> Uso
+        python processamento_particionado.py --por Ativo --processos 32 --top-k 100
+        python processamento_particionado.py --por mes --inicio 2023-01-01 --fim 2023-06-30 --ativos Transformador
+'''
+
+# Importar bibliotecas
+import argparse
+import contextlib
+import os
+import numpy as np
+import pandas as pd
+import instrumentacao
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from armazenamento_particionado import PARTICAO_SEM_DATA, carregar_base_filtrada
+from agregacao_ativos import VARIAVEIS_JANELA
+from memoria_compartilhada import alocar_array_compartilhado, arrays_trabalhador, iniciar_trabalhador, \
+    liberar_arrays
+from nucleo_criticidade import calcular_pontuacao
+from ranking_criticidade import ordenar_por_criticidade, selecionar_top_k
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+pesos_file_path = os.path.join(output_path, "pesos_anal_criticidade.csv")
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+
+# Tamanho máximo de uma tarefa (fixo: as agregações não dependem do número de processos)
+LINHAS_POR_TAREFA = 1 << 20
+
+PARTICOES = ("Ativo", "mes")
+
+# Rótulo da partição dos eventos sem a chave
+PARTICAO_SEM_CHAVE = {"Ativo": "sem_ativo", "mes": PARTICAO_SEM_DATA}
+
+COLUNA_INDICE = {"bruta": "Criticidade_Calculada", "minmax": "Indice_Criticidade"}
+
+def particionar(df, por="Ativo"):
+    """
+    Ordem das linhas agrupadas por partição (estável), limites de cada partição e rótulos.
+    """
+    if por == "Ativo":
+        codigos, rotulos = pd.factorize(df["Ativo"], sort=True)
+        rotulos = [str(r) for r in rotulos]
+    elif por == "mes":
+        datas = pd.to_datetime(df["Data_Interrupcao"])
+        codigos, meses = pd.factorize((datas.dt.year * 12 + datas.dt.month - 1).astype("Int64"), sort=True)
+        rotulos = [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in meses]
+    else:
+        raise ValueError(f"Partição desconhecida: {por} (opções: {PARTICOES})")
+    # Chave ausente (factorize devolve -1): partição própria, depois das demais
+    sem_chave = codigos < 0
+    if sem_chave.any():
+        codigos = np.where(sem_chave, len(rotulos), codigos)
+        rotulos.append(PARTICAO_SEM_CHAVE[por])
+    ordem = np.argsort(codigos, kind="stable")
+    limites = np.concatenate([[0], np.cumsum(np.bincount(codigos, minlength=len(rotulos)))])
+    return ordem, limites, rotulos
+
+
+def _tarefas(limites, linhas_por_tarefa):
+    # Fatias (início, fim) de no máximo linhas_por_tarefa, sem atravessar partições
+    return [(inicio, min(inicio + linhas_por_tarefa, fim))
+            for fim_anterior, fim in zip(limites[:-1], limites[1:])
+            for inicio in range(int(fim_anterior), int(fim), linhas_por_tarefa)]
+
+
+def _colunas(dados, n_variaveis):
+    return [dados[f"var_{j}"] for j in range(n_variaveis)]
+
+
+def _extremos_tarefa(dados, n_variaveis, inicio, fim):
+    """
+    1ª fase: mínimo e máximo de cada variável na fatia.
+    """
+    colunas = [c[inicio:fim] for c in _colunas(dados, n_variaveis)]
+    return (np.array([np.nanmin(c) for c in colunas], dtype=np.float64),
+            np.array([np.nanmax(c) for c in colunas], dtype=np.float64))
+
+
+def _pontuar_tarefa(dados, pesos, normalizacao, minimos, maximos, top_k, inicio, fim):
+    """
+    2ª fase: pontua a fatia (gravando nos vetores compartilhados), Top-K local e agregação por Trecho.
+    """
+    n_variaveis = len(pesos)
+    colunas = [c[inicio:fim] for c in _colunas(dados, n_variaveis)]
+    normalizadas = None
+    if normalizacao == "minmax":
+        normalizadas = [dados[f"norm_{j}"][inicio:fim] for j in range(n_variaveis)]
+    indice = calcular_pontuacao(colunas, pesos, normalizacao=normalizacao, minimos=minimos, maximos=maximos,
+                                saida=dados["indice"][inicio:fim], normalizadas=normalizadas)
+
+    resultado = {}
+    if top_k is not None:
+        locais = selecionar_top_k(indice, top_k)
+        resultado["top_posicoes"] = locais + inicio
+        resultado["top_valores"] = indice[locais]
+
+    if "trecho" in dados:
+        # Código -1 = evento sem Trecho: fica fora da agregação
+        com_trecho = dados["trecho"][inicio:fim] >= 0
+        codigos, inverso = np.unique(dados["trecho"][inicio:fim][com_trecho], return_inverse=True)
+        indice_trecho = indice[com_trecho]
+        maximos_trecho = np.full(len(codigos), -np.inf)
+        np.fmax.at(maximos_trecho, inverso, indice_trecho)
+        resultado["agregado"] = {
+            "codigos": codigos,
+            "eventos": np.bincount(inverso, minlength=len(codigos)),
+            "soma_indice": np.bincount(inverso, weights=indice_trecho, minlength=len(codigos)),
+            "maximo_indice": maximos_trecho,
+            "somas": [np.bincount(inverso, weights=dados[f"soma_{j}"][inicio:fim][com_trecho],
+                                  minlength=len(codigos))
+                      for j in range(sum(nome.startswith("soma_") for nome in dados))],
+        }
+    return resultado
+
+
+def _tarefa_trabalhador(funcao, *args):
+    return funcao(arrays_trabalhador(), *args)
+
+
+def _executar(executor, funcao, argumentos, dados, n_processos):
+    """
+    Executa as tarefas (no processo atual ou no pool, com janela limitada) e devolve os
+    resultados na ordem das tarefas.
+    """
+    if executor is None:
+        return [funcao(dados, *args) for args in argumentos]
+    resultados, pendentes = [], deque()
+    for args in argumentos:
+        if len(pendentes) >= 2 * n_processos:
+            resultados.append(pendentes.popleft().result())
+        pendentes.append(executor.submit(_tarefa_trabalhador, funcao, *args))
+    while pendentes:
+        resultados.append(pendentes.popleft().result())
+    return resultados
+
+
+def _mesclar_top_k(resultados, ordem, top_k):
+    """
+    Top-K global a partir dos candidatos de cada tarefa: maiores primeiro, empates e NaN pela ordem das linhas.
+    """
+    posicoes = np.concatenate([r["top_posicoes"] for r in resultados])
+    valores = np.concatenate([r["top_valores"] for r in resultados])
+    linhas = ordem[posicoes]
+    nulos = np.isnan(valores)
+    selecao = np.lexsort((linhas, -np.where(nulos, 0.0, valores), nulos))[:top_k]
+    return linhas[selecao]
+
+
+def _mesclar_agregados(resultados, df, nomes_somas):
+    """
+    Soma as agregações parciais na ordem das tarefas e monta a tabela por Trecho.
+    """
+    partes = [r["agregado"] for r in resultados]
+    codigos = np.concatenate([p["codigos"] for p in partes])
+    unicos, inverso = np.unique(codigos, return_inverse=True)
+    eventos = np.bincount(inverso, weights=np.concatenate([p["eventos"] for p in partes]),
+                          minlength=len(unicos)).astype(np.int64)
+    soma_indice = np.bincount(inverso, weights=np.concatenate([p["soma_indice"] for p in partes]),
+                              minlength=len(unicos))
+    maximo_indice = np.full(len(unicos), -np.inf)
+    np.fmax.at(maximo_indice, inverso, np.concatenate([p["maximo_indice"] for p in partes]))
+
+    trechos = df["Trecho"]
+    rotulos = trechos.cat.categories if isinstance(trechos.dtype, pd.CategoricalDtype) \
+        else pd.factorize(trechos)[1]
+    agregado = pd.DataFrame({"Trecho": np.asarray(rotulos)[unicos], "Eventos": eventos})
+    for j, nome in enumerate(nomes_somas):
+        agregado[nome] = np.bincount(inverso, weights=np.concatenate([p["somas"][j] for p in partes]),
+                                     minlength=len(unicos))
+    agregado["Indice_Medio"] = soma_indice / eventos
+    agregado["Indice_Maximo"] = maximo_indice
+    return agregado
+
+
+def _codigos_trecho(df):
+    trechos = df["Trecho"]
+    if isinstance(trechos.dtype, pd.CategoricalDtype):
+        return trechos.cat.codes.to_numpy()
+    return pd.factorize(trechos)[0]
+
+
+def calcular_criticidade_particionada(df, pesos_df, normalizacao="minmax", por="Ativo", top_k=None,
+                                      n_processos=None, linhas_por_tarefa=LINHAS_POR_TAREFA):
+    """
+    Criticidade calculada por partições em um pool de processos.
+    Retorna (ranking, agregado): o ranking é o mesmo de calcular_criticidade (com top_k, apenas os K primeiros);
+    agregado tem uma linha por Trecho, sem os eventos sem Trecho (None se a base não tem Trecho).
+    """
+    if normalizacao not in COLUNA_INDICE:
+        raise ValueError(f"Normalização desconhecida: {normalizacao}")
+    pesos_dict = dict(zip(pesos_df["Variavel"], pesos_df["Peso"]))
+    variaveis = list(pesos_dict)
+    pesos = np.array(list(pesos_dict.values()), dtype=np.float64)
+    if normalizacao == "minmax":
+        if "Impacto_DEC" not in df.columns or "Impacto_FEC" not in df.columns:
+            raise KeyError(
+                "As colunas 'Impacto_DEC' e 'Impacto_FEC' são necessárias para calcular 'Impacto_DEC_FEC'.")
+        df["Impacto_DEC_FEC"] = df["Impacto_DEC"] + df["Impacto_FEC"]
+
+    ordem, limites, rotulos = particionar(df, por)
+    tarefas = _tarefas(limites, linhas_por_tarefa)
+    n = len(df)
+    nomes_somas = [v for v in VARIAVEIS_JANELA if v in df.columns]
+
+    n_processos = n_processos or os.cpu_count() or 1
+    print(f"{len(rotulos)} partições por {por}, {len(tarefas)} tarefas, {n_processos} processos.")
+    blocos, descritores, dados = [], {}, {}
+
+    def alocar(nome, tipo=np.float64):
+        if n_processos == 1:
+            dados[nome] = np.empty(n, dtype=tipo)
+        else:
+            bloco, descritores[nome], dados[nome] = alocar_array_compartilhado(n, tipo)
+            blocos.append(bloco)
+        return dados[nome]
+
+    try:
+        # Colunas reordenadas pela partição (cada tarefa lê fatias contíguas), gravadas direto na memória compartilhada
+        for j, var in enumerate(variaveis):
+            coluna = df[var].to_numpy()
+            np.take(coluna, ordem, out=alocar(f"var_{j}", coluna.dtype))
+        if "Trecho" in df.columns:
+            codigos = _codigos_trecho(df)
+            np.take(codigos, ordem, out=alocar("trecho", codigos.dtype))
+            for j, nome in enumerate(nomes_somas):
+                np.take(df[nome].to_numpy(dtype=np.float64), ordem, out=alocar(f"soma_{j}"))
+        alocar("indice")
+        if normalizacao == "minmax":
+            for j in range(len(variaveis)):
+                alocar(f"norm_{j}")
+
+        contexto = contextlib.nullcontext() if n_processos == 1 else ProcessPoolExecutor(
+            max_workers=n_processos, initializer=iniciar_trabalhador, initargs=(descritores,))
+        with contexto as executor:
+            extremos = _executar(executor, _extremos_tarefa, [(len(variaveis), *t) for t in tarefas],
+                                 dados, n_processos)
+            # Redução global dos extremos (fmin/fmax ignoram NaN, como Series.min/max)
+            minimos = np.fmin.reduce([e[0] for e in extremos]) if extremos else np.full(len(variaveis), np.nan)
+            maximos = np.fmax.reduce([e[1] for e in extremos]) if extremos else np.full(len(variaveis), np.nan)
+            resultados = _executar(executor, _pontuar_tarefa,
+                                   [(pesos, normalizacao, minimos, maximos, top_k, *t) for t in tarefas],
+                                   dados, n_processos)
+
+        # Vetores de saída de volta à ordem original das linhas
+        coluna_indice = COLUNA_INDICE[normalizacao]
+        if normalizacao == "minmax":
+            for j, var in enumerate(variaveis):
+                valores = np.empty(n)
+                valores[ordem] = dados[f"norm_{j}"]
+                df[var + "_Norm"] = valores
+        indice = np.empty(n)
+        indice[ordem] = dados["indice"]
+        df[coluna_indice] = indice
+    finally:
+        dados.clear()
+        liberar_arrays(blocos)
+
+    agregado = _mesclar_agregados(resultados, df, nomes_somas) if resultados and "Trecho" in df.columns else None
+    if top_k is None:
+        return ordenar_por_criticidade(df, coluna_indice), agregado
+    if not resultados:
+        return df.iloc[:0], agregado
+    return df.iloc[_mesclar_top_k(resultados, ordem, top_k)], agregado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Criticidade calculada por partições em paralelo.")
+    parser.add_argument("--por", choices=PARTICOES, default="Ativo")
+    parser.add_argument("--normalizacao", choices=tuple(COLUNA_INDICE), default="minmax")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--inicio", help="Data inicial do recorte (AAAA-MM-DD).")
+    parser.add_argument("--fim", help="Data final do recorte (inclusiva).")
+    parser.add_argument("--ativos", nargs="+", help="Tipos de ativo do recorte.")
+    args = parser.parse_args()
+
+    with instrumentacao.etapa("carregamento") as registro:
+        df = carregar_base_filtrada(dados_path, args.inicio, args.fim, args.ativos)
+        pesos_df = pd.read_csv(pesos_file_path)
+        registro["linhas"] = len(df)
+
+    with instrumentacao.etapa("criticidade_particionada", linhas=len(df)):
+        ranking, agregado = calcular_criticidade_particionada(
+            df, pesos_df, normalizacao=args.normalizacao, por=args.por, top_k=args.top_k,
+            n_processos=args.processos)
+    print(f"\nTop {args.top_k} ativos mais críticos:\n")
+    print(ranking[["Ativo", "Trecho", COLUNA_INDICE[args.normalizacao]]].head(30).to_string(index=False))
+
+    ranking_path = os.path.join(output_path, "ranking_particionado.csv")
+    ranking.to_csv(ranking_path, index=False)
+    print(f"\nRanking salvo em: {ranking_path}")
+    if agregado is not None:
+        agregado_path = os.path.join(output_path, "criticidade_por_trecho.csv")
+        agregado.to_csv(agregado_path, index=False)
+        print(f"Agregação por Trecho salva em: {agregado_path}")
+    instrumentacao.emitir()
+
+
+# Script Principal
+if __name__ == "__main__":
+    main()
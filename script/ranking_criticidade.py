@@ -0,0 +1,53 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: ranking dos ativos pelo índice de criticidade sem ordenar a base inteira.
+
+    |> O que o Script Faz
+        Seleciona os K ativos mais críticos por seleção parcial (np.partition) e ordena apenas esses K.
+        A ordem é exatamente a de DataFrame.sort_values(ascending=False, kind="stable"):
+            Valores maiores primeiro.
+            Empates na ordem original das linhas.
+            NaN no final, também na ordem original.
+        Sem K, faz a ordenação completa estável (mesmo critério de desempate).
+'''
+
+# Importar bibliotecas
+import numpy as np
+
+
+def selecionar_top_k(valores, k):
+    """
+    Retorna as posições dos K maiores valores, na ordem do ranking.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    nulos = np.isnan(valores)
+    validos = np.flatnonzero(~nulos)
+    k = max(0, min(k, len(valores)))
+
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= len(validos):
+        ordem = validos[np.argsort(-valores[validos], kind="stable")]
+        return np.concatenate([ordem, np.flatnonzero(nulos)[:k - len(validos)]])
+
+    # Limiar = K-ésimo maior valor; empates no limiar ficam com as primeiras linhas
+    v = valores[validos]
+    limiar = -np.partition(-v, k - 1)[k - 1]
+    maiores = v > limiar
+    iguais = v == limiar
+    vagas = k - np.count_nonzero(maiores)
+    selecionados = validos[maiores | (iguais & (np.cumsum(iguais) <= vagas))]
+
+    # Ordenação estável apenas dos K selecionados (já em ordem de linha)
+    return selecionados[np.argsort(-valores[selecionados], kind="stable")]
+
+
+def ordenar_por_criticidade(df, coluna, top_k=None):
+    """
+    Ordena o DataFrame pela coluna de criticidade (decrescente).
+    Com top_k, retorna apenas as K primeiras linhas do ranking, sem ordenar nem copiar o restante.
+    """
+    if top_k is None:
+        return df.sort_values(by=coluna, ascending=False, kind="stable")
+    return df.iloc[selecionar_top_k(df[coluna].to_numpy(dtype=np.float64, na_value=np.nan), top_k)]
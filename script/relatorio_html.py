@@ -0,0 +1,265 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: reunir os gráficos de todas as etapas de uma execução em um único arquivo HTML.
+
+    |> O que o Script Faz
+        Substitui as chamadas fig.show() (uma renderização no navegador por figura, cada uma com sua cópia do
+        plotly.js) por um relatório estático:
+            O plotly.js é embutido uma única vez no arquivo.
+            Os vetores numéricos dos traços são gravados como arrays tipados em base64 ({"dtype", "bdata", "shape"},
+            decodificados pelo plotly.js >= 2.28) em vez de listas de números em JSON.
+            Inteiros de 64 bits (sem equivalente tipado no navegador) viram int32/uint32 quando cabem, senão float64.
+            As figuras são serializadas ao serem adicionadas (a figura Plotly pode ser liberada em seguida) e
+            desenhadas pelo navegador apenas quando aparecem na tela.
+        Um relatório por execução, ativado sem alterar os scripts pela variável de ambiente:
+            REDE_AEREA_RELATORIO    Caminho do arquivo HTML do relatório.
+        Com o relatório ativo, exibir(fig) adiciona a figura ao relatório (mesmo no modo headless, em que os
+        gráficos passam a ser gerados apenas para o arquivo); sem ele, exibir(fig) equivale a fig.show().
+        gravar() escreve o arquivo (de forma atômica) e informa o tamanho e o tempo de montagem.
+        Vários scripts podem gravar no mesmo relatório (ex.: EDA -> criticidade -> matriz em uma execução noturna):
+            As figuras já serializadas ficam em <relatorio>.figuras/, um arquivo JSON por seção e um manifesto
+            com a ordem das seções.
+            gravar() substitui apenas as seções que o processo atual gerou (uma nova execução do mesmo script
+            não duplica as figuras), mantém as demais e remonta o HTML com todas.
+'''
+
+# Importar bibliotecas
+import base64
+import html
+import json
+import os
+import time
+import numpy as np
+import instrumentacao
+
+# Códigos de tipo dos arrays tipados do plotly.js
+TIPOS_ARRAY = {
+    np.dtype(np.float64): "f8", np.dtype(np.float32): "f4",
+    np.dtype(np.int8): "i1", np.dtype(np.uint8): "u1",
+    np.dtype(np.int16): "i2", np.dtype(np.uint16): "u2",
+    np.dtype(np.int32): "i4", np.dtype(np.uint32): "u4",
+}
+
+_SCRIPT_DESENHO = """
+const figuras = document.querySelectorAll("div.figura");
+function desenhar(div) {
+    if (div.dataset.desenhada) return;
+    div.dataset.desenhada = "1";
+    const figura = JSON.parse(document.getElementById("dados-" + div.id).textContent);
+    Plotly.newPlot(div, figura.data, figura.layout, {responsive: true});
+}
+if ("IntersectionObserver" in window) {
+    const observador = new IntersectionObserver(function (entradas) {
+        entradas.forEach(function (e) { if (e.isIntersecting) desenhar(e.target); });
+    }, {rootMargin: "400px"});
+    figuras.forEach(function (div) { observador.observe(div); });
+} else {
+    figuras.forEach(desenhar);
+}
+"""
+
+
+def array_tipado(valores):
+    """
+    Especificação de array tipado do plotly.js para um ndarray numérico (None se o tipo não for suportado).
+    """
+    tipo = valores.dtype
+    if tipo.kind in "iu" and tipo.itemsize == 8:
+        if valores.size == 0:
+            tipo = np.dtype(np.int32)
+        else:
+            minimo, maximo = valores.min(), valores.max()
+            for candidato in (np.int32, np.uint32):
+                limites = np.iinfo(candidato)
+                if limites.min <= minimo and maximo <= limites.max:
+                    tipo = np.dtype(candidato)
+                    break
+            else:
+                tipo = np.dtype(np.float64)
+    if tipo.newbyteorder("=") not in TIPOS_ARRAY:
+        return None
+    tipo = tipo.newbyteorder("=")
+    dados = np.ascontiguousarray(valores, dtype=tipo.newbyteorder("<"))
+    especificacao = {"dtype": TIPOS_ARRAY[tipo], "bdata": base64.b64encode(dados.tobytes()).decode("ascii")}
+    if dados.ndim > 1:
+        especificacao["shape"] = ",".join(str(d) for d in dados.shape)
+    return especificacao
+
+
+def _converter_arrays(objeto):
+    # Percorre o JSON da figura trocando os ndarrays numéricos por arrays tipados
+    if isinstance(objeto, dict):
+        return {chave: _converter_arrays(valor) for chave, valor in objeto.items()}
+    if isinstance(objeto, (list, tuple)):
+        return [_converter_arrays(valor) for valor in objeto]
+    if isinstance(objeto, np.ndarray):
+        especificacao = array_tipado(objeto)
+        return objeto if especificacao is None else especificacao
+    return objeto
+
+
+def codificar_figura(fig):
+    """
+    JSON da figura (data e layout) com os vetores numéricos em arrays tipados base64.
+    """
+    from plotly.utils import PlotlyJSONEncoder
+
+    figura = fig.to_plotly_json()
+    conteudo = {"data": _converter_arrays(figura.get("data", [])), "layout": figura.get("layout", {})}
+    # "</" encerraria o bloco <script> do HTML
+    return json.dumps(conteudo, cls=PlotlyJSONEncoder, separators=(",", ":")).replace("</", "<\\/")
+
+
+class RelatorioHTML:
+    """
+    Figuras de uma execução, serializadas para um único arquivo HTML.
+    """
+
+    def __init__(self, caminho=None, titulo="Relatório REDE_AEREA"):
+        self.caminho = caminho
+        self.titulo = titulo
+        self.figuras = []
+        self.segundos_codificacao = 0.0
+
+    def adicionar(self, fig, secao=None):
+        inicio = time.perf_counter()
+        titulo = fig.layout.title.text if fig.layout.title and fig.layout.title.text else f"Figura {len(self.figuras) + 1}"
+        self.figuras.append((secao or "Gráficos", titulo, codificar_figura(fig)))
+        self.segundos_codificacao += time.perf_counter() - inicio
+        return self
+
+    def montar(self, figuras=None):
+        """
+        Conteúdo HTML do relatório (plotly.js embutido uma única vez).
+        """
+        from plotly.offline import get_plotlyjs
+
+        figuras = self.figuras if figuras is None else figuras
+        partes = [
+            "<!DOCTYPE html>\n<html lang=\"pt-BR\">\n<head>\n<meta charset=\"utf-8\">\n",
+            f"<title>{html.escape(self.titulo)}</title>\n",
+            "<style>body{font-family:sans-serif;margin:2em}div.figura{min-height:450px;margin-bottom:2em}</style>\n",
+            "<script type=\"text/javascript\">", get_plotlyjs(), "</script>\n</head>\n<body>\n",
+            f"<h1>{html.escape(self.titulo)}</h1>\n<ul>\n",
+        ]
+        partes.extend(f"<li><a href=\"#fig-{i}\">{html.escape(secao)}: {html.escape(titulo)}</a></li>\n"
+                      for i, (secao, titulo, _) in enumerate(figuras))
+        partes.append("</ul>\n")
+        secao_atual = None
+        for i, (secao, _, dados) in enumerate(figuras):
+            if secao != secao_atual:
+                partes.append(f"<h2>{html.escape(secao)}</h2>\n")
+                secao_atual = secao
+            partes.append(f"<div class=\"figura\" id=\"fig-{i}\"></div>\n"
+                          f"<script type=\"application/json\" id=\"dados-fig-{i}\">{dados}</script>\n")
+        partes.extend(["<script type=\"text/javascript\">", _SCRIPT_DESENHO, "</script>\n</body>\n</html>\n"])
+        return "".join(partes)
+
+    def gravar(self, caminho=None):
+        """
+        Grava o relatório e retorna caminho, número de figuras, tamanho (bytes) e tempo de montagem (s).
+        """
+        caminho = caminho or self.caminho
+        inicio = time.perf_counter()
+        figuras = self.mesclar_gravadas(caminho)
+        conteudo = self.montar(figuras).encode("utf-8")
+        _gravar_atomico(caminho, conteudo)
+        return {
+            "caminho": caminho,
+            "figuras": len(figuras),
+            "bytes": len(conteudo),
+            "segundos": self.segundos_codificacao + time.perf_counter() - inicio,
+        }
+
+
+    def mesclar_gravadas(self, caminho):
+        """
+        Grava as seções deste processo em pasta_figuras(caminho), substituindo as de mesmo nome, e
+        retorna as figuras de todas as seções gravadas, na ordem do manifesto.
+        """
+        pasta = pasta_figuras(caminho)
+        manifesto_path = os.path.join(pasta, "manifesto.json")
+        secoes = []
+        if os.path.exists(manifesto_path):
+            with open(manifesto_path, encoding="utf-8") as arquivo:
+                secoes = json.load(arquivo)["secoes"]
+        arquivos = {item["secao"]: item["arquivo"] for item in secoes}
+
+        novas = {}
+        for secao, titulo, dados in self.figuras:
+            novas.setdefault(secao, []).append([titulo, dados])
+        for secao, figuras in novas.items():
+            if secao not in arquivos:
+                arquivos[secao] = f"secao_{len(secoes):03d}.json"
+                secoes.append({"secao": secao, "arquivo": arquivos[secao]})
+            _gravar_atomico(os.path.join(pasta, arquivos[secao]), json.dumps(figuras).encode("utf-8"))
+        _gravar_atomico(manifesto_path, json.dumps({"secoes": secoes}, ensure_ascii=False).encode("utf-8"))
+
+        todas = []
+        for item in secoes:
+            with open(os.path.join(pasta, item["arquivo"]), encoding="utf-8") as arquivo:
+                todas.extend((item["secao"], titulo, dados) for titulo, dados in json.load(arquivo))
+        return todas
+
+
+def pasta_figuras(caminho):
+    """
+    Pasta com as figuras já gravadas no relatório `caminho` (uma lista JSON por seção).
+    """
+    return caminho + ".figuras"
+
+
+def _gravar_atomico(caminho, conteudo):
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def _criar_por_ambiente():
+    caminho = os.environ.get("REDE_AEREA_RELATORIO")
+    return RelatorioHTML(caminho) if caminho else None
+
+
+# Relatório global da execução (None quando desativado)
+_ATIVO = _criar_por_ambiente()
+
+
+def relatorio_ativo():
+    return _ATIVO
+
+
+def configurar(caminho, titulo="Relatório REDE_AEREA"):
+    """
+    Ativa o relatório da execução (substitui o definido por REDE_AEREA_RELATORIO).
+    """
+    global _ATIVO
+    _ATIVO = RelatorioHTML(caminho, titulo)
+    return _ATIVO
+
+
+def exibir(fig, secao=None):
+    """
+    Adiciona a figura ao relatório ativo ou, sem relatório, abre a figura no navegador.
+    """
+    if _ATIVO is None:
+        fig.show()
+    else:
+        _ATIVO.adicionar(fig, secao)
+
+
+def gravar():
+    """
+    Grava o relatório ativo (se houver figuras) e informa o tamanho e o tempo de montagem.
+    """
+    if _ATIVO is None or not _ATIVO.figuras:
+        return None
+    with instrumentacao.etapa("relatorio_html") as registro:
+        resultado = _ATIVO.gravar()
+        registro["figuras"] = resultado["figuras"]
+        registro["bytes"] = resultado["bytes"]
+    print(f"Relatório gravado em: {resultado['caminho']} ({resultado['figuras']} figuras, "
+          f"{resultado['bytes'] / 1024 ** 2:.1f} MB, montado em {resultado['segundos']:.2f} s)")
+    return resultado
@@ -0,0 +1,364 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: servir o ranking de criticidade a outras ferramentas sem recarregar os CSV a cada consulta.
+
+    |> O que o Script Faz
+        Serviço HTTP local (asyncio, apenas a biblioteca padrão) que mantém em memória:
+            A base (tipos compactos), as variáveis normalizadas (Min-Max) e o Indice_Criticidade,
+            calculados pelo núcleo comum (nucleo_criticidade.py): os mesmos valores de matriz_prioridade.py
+            (Impacto_DEC_FEC é derivado de Impacto_DEC + Impacto_FEC quando aparece nos pesos).
+            O ranking completo (ordem estável, como matriz_priorizacao.csv), o ranking por tipo de ativo
+            e as posições dos eventos de cada Trecho.
+        Consultas (respostas em JSON):
+            GET  /saude                       Linhas carregadas, pesos e estado do cache.
+            GET  /ranking?k=20&ativo=Chave     Top-K (opcionalmente de um tipo de ativo).
+            GET  /ativo/<Trecho>               Eventos do Trecho, com índice e posição no ranking.
+            POST /what-if                      {"pesos": {"Impacto_DEC": 0.5, ...}, "k": 20, "ativo": "Chave"}
+            POST /recarregar                   Relê a base e os pesos (as consultas continuam sendo atendidas).
+        What-if:
+            Os pesos são normalizados (soma dos valores absolutos = 1; variáveis omitidas = 0) e o vetor normalizado
+            é a chave de um cache LRU com os índices de todos os eventos e os K_MAXIMO primeiros do ranking
+            (geral e por tipo de ativo), para CAPACIDADE_CACHE_WHAT_IF vetores de pesos.
+            O índice what-if usa os pesos normalizados; o ranking é o mesmo que com os pesos originais.
+            Pedidos simultâneos com os mesmos pesos compartilham um único cálculo, feito fora do laço de eventos.
+        Acertos e falhas do cache são contados pela instrumentação (instrumentacao.py).
+
+    |> Uso
+        python servico_consultas.py --porta 8765
+        curl "http://127.0.0.1:8765/ranking?k=10&ativo=Religador"
+        curl -X POST http://127.0.0.1:8765/what-if -d '{"pesos": {"Impacto_DEC": 1, "Clientes_Afetados": 1}, "k": 10}'
+'''
+
+# Importar bibliotecas
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+import pandas as pd
+import instrumentacao
+from acesso_dados import carregar_base_compacta
+from normalizacao_robusta import colunas_bloco
+from nucleo_criticidade import calcular_extremos, calcular_pontuacao
+from ranking_criticidade import selecionar_top_k
+from topologia_rede import juntar_topologia_pesos
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+pesos_file_path = os.path.join(output_path, "pesos_anal_criticidade.csv")
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+
+PORTA_PADRAO = 8765
+
+# Vetores de pesos what-if mantidos em cache (cada um guarda um float64 por evento)
+CAPACIDADE_CACHE_WHAT_IF = 16
+
+K_PADRAO = 20
+K_MAXIMO = 10_000
+
+CASAS_CHAVE_PESOS = 12
+
+MOTIVOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                500: "Internal Server Error"}
+
+
+class ErroConsulta(Exception):
+    """
+    Erro de uma consulta, com o código HTTP da resposta.
+    """
+
+    def __init__(self, mensagem, status=400):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class IndiceCriticidade:
+    """
+    Base normalizada, índice de criticidade e índices de ranking em memória.
+    """
+
+    def __init__(self, df, pesos_df, capacidade_cache=CAPACIDADE_CACHE_WHAT_IF):
+        pesos_dict = dict(zip(pesos_df["Variavel"], pesos_df["Peso"]))
+        self.df = df
+        self.variaveis = list(pesos_dict)
+        self.pesos = np.array(list(pesos_dict.values()), dtype=np.float64)
+        self.carregado_em = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+        # Variáveis normalizadas (uma linha contígua por variável) e índice da matriz de priorização
+        colunas = colunas_bloco(df, self.variaveis)
+        self.minimos, self.maximos = calcular_extremos(colunas)
+        self.normalizadas = np.empty((len(self.variaveis), len(df)))
+        self.indice = calcular_pontuacao(colunas, self.pesos, normalizacao="minmax", minimos=self.minimos,
+                                         maximos=self.maximos, normalizadas=list(self.normalizadas))
+
+        # Ranking completo (decrescente, estável, NaN no final) e posição de cada evento
+        self.ordem = np.argsort(-self.indice, kind="stable")
+        self.posicao = np.empty(len(df), dtype=np.int64)
+        self.posicao[self.ordem] = np.arange(1, len(df) + 1)
+
+        # Por tipo de ativo: linhas (ordem da base) e ranking do tipo
+        codigos_tipo, tipos = pd.factorize(df["Ativo"])
+        self.linhas_tipo = {str(t): np.flatnonzero(codigos_tipo == c) for c, t in enumerate(tipos)}
+        tipo_ordenado = codigos_tipo[self.ordem]
+        self.ranking_tipo = {str(t): self.ordem[tipo_ordenado == c] for c, t in enumerate(tipos)}
+
+        # Por Trecho: eventos agrupados (ordem da base dentro de cada Trecho)
+        codigos_trecho, trechos = pd.factorize(df["Trecho"])
+        self.linhas_trecho = np.argsort(codigos_trecho, kind="stable")
+        self.inicios_trecho = np.searchsorted(codigos_trecho[self.linhas_trecho], np.arange(len(trechos) + 1))
+        self.codigo_trecho = {str(t): c for c, t in enumerate(trechos)}
+
+        self.capacidade_cache = capacidade_cache
+        self._cache = OrderedDict()
+        self._trava = threading.Lock()
+
+    # Consultas
+
+    def _registros(self, linhas, valores, nome_valor):
+        registros = self.df.iloc[linhas].to_dict("records")
+        for registro, linha, valor in zip(registros, linhas, valores):
+            registro[nome_valor] = float(valor)
+            registro["Posicao_Ranking"] = int(self.posicao[linha])
+        return registros
+
+    def _tipo(self, ativo):
+        if ativo is not None and ativo not in self.linhas_tipo:
+            raise ErroConsulta(f"Tipo de ativo desconhecido: {ativo}", 404)
+        return ativo
+
+    def ranking(self, k=K_PADRAO, ativo=None):
+        """
+        Top-K do ranking (fatia do índice pré-calculado).
+        """
+        ordem = self.ordem if self._tipo(ativo) is None else self.ranking_tipo[ativo]
+        linhas = ordem[:k]
+        return self._registros(linhas, self.indice[linhas], "Indice_Criticidade")
+
+    def consultar_trecho(self, trecho):
+        """
+        Eventos de um Trecho.
+        """
+        if trecho not in self.codigo_trecho:
+            raise ErroConsulta(f"Trecho não encontrado: {trecho}", 404)
+        c = self.codigo_trecho[trecho]
+        linhas = self.linhas_trecho[self.inicios_trecho[c]:self.inicios_trecho[c + 1]]
+        return self._registros(linhas, self.indice[linhas], "Indice_Criticidade")
+
+    # What-if
+
+    def chave_pesos(self, pesos):
+        """
+        Vetor de pesos normalizado (ordem das variáveis da base, soma dos valores absolutos = 1).
+        """
+        desconhecidas = set(pesos) - set(self.variaveis)
+        if desconhecidas:
+            raise ErroConsulta(f"Variáveis sem dados normalizados: {sorted(desconhecidas)}")
+        try:
+            vetor = np.array([float(pesos.get(var, 0.0)) for var in self.variaveis])
+        except (TypeError, ValueError):
+            raise ErroConsulta("Os pesos devem ser números.")
+        total = np.abs(vetor).sum()
+        if not np.isfinite(total) or total == 0:
+            raise ErroConsulta("Os pesos devem ser finitos e não todos nulos.")
+        return tuple(np.round(vetor / total, CASAS_CHAVE_PESOS).tolist())
+
+    def what_if_em_cache(self, chave):
+        with self._trava:
+            entrada = self._cache.get(chave)
+            if entrada is not None:
+                self._cache.move_to_end(chave)
+        instrumentacao.contar("what_if_cache_acertos" if entrada is not None else "what_if_cache_falhas")
+        return entrada
+
+    def calcular_what_if(self, chave):
+        """
+        Índice de todos os eventos com os pesos da chave (variáveis já normalizadas) e os K_MAXIMO primeiros
+        do ranking geral e de cada tipo de ativo, guardados no cache LRU.
+        """
+        indice = calcular_pontuacao(list(self.normalizadas), np.array(chave), normalizacao="bruta")
+        rankings = {None: selecionar_top_k(indice, K_MAXIMO)}
+        for tipo, linhas_tipo in self.linhas_tipo.items():
+            rankings[tipo] = linhas_tipo[selecionar_top_k(indice[linhas_tipo], K_MAXIMO)]
+        entrada = {"indice": indice, "rankings": rankings}
+        with self._trava:
+            self._cache[chave] = entrada
+            self._cache.move_to_end(chave)
+            while len(self._cache) > self.capacidade_cache:
+                self._cache.popitem(last=False)
+        return entrada
+
+    def ranking_what_if(self, entrada, k=K_PADRAO, ativo=None):
+        """
+        Top-K de uma entrada what-if (prefixo do ranking guardado; mesmo desempate do ranking da base).
+        """
+        linhas = entrada["rankings"][self._tipo(ativo)][:k]
+        return self._registros(linhas, entrada["indice"][linhas], "Indice_WhatIf")
+
+    def estado(self):
+        return {"linhas": len(self.df), "carregado_em": self.carregado_em,
+                "pesos": dict(zip(self.variaveis, self.pesos.tolist())),
+                "tipos_ativo": sorted(self.linhas_tipo), "cache_what_if": len(self._cache),
+                "capacidade_cache_what_if": self.capacidade_cache}
+
+
+def carregar_indice(base_path=dados_path, pesos_path=pesos_file_path, capacidade_cache=CAPACIDADE_CACHE_WHAT_IF):
+    with instrumentacao.etapa("carregar_indice") as registro:
+        df = carregar_base_compacta(base_path)
+        pesos_df = pd.read_csv(pesos_path)
+        indice = IndiceCriticidade(juntar_topologia_pesos(df, pesos_df, base_path), pesos_df, capacidade_cache)
+        registro["linhas"] = len(df)
+    return indice
+
+
+def _ler_k(valor):
+    try:
+        k = int(valor)
+    except (TypeError, ValueError):
+        raise ErroConsulta(f"k inválido: {valor}")
+    if not 1 <= k <= K_MAXIMO:
+        raise ErroConsulta(f"k deve estar entre 1 e {K_MAXIMO}.")
+    return k
+
+
+class ServicoConsultas:
+    """
+    Servidor HTTP mínimo (HTTP/1.1, uma requisição por conexão) sobre asyncio.
+    """
+
+    def __init__(self, base_path=dados_path, pesos_path=pesos_file_path, capacidade_cache=CAPACIDADE_CACHE_WHAT_IF):
+        self.base_path = base_path
+        self.pesos_path = pesos_path
+        self.capacidade_cache = capacidade_cache
+        self.indice = carregar_indice(base_path, pesos_path, capacidade_cache)
+        self._em_andamento = {}
+
+    async def _what_if(self, corpo):
+        try:
+            pedido = json.loads(corpo or b"{}")
+        except json.JSONDecodeError:
+            raise ErroConsulta("Corpo JSON inválido.")
+        if not isinstance(pedido, dict) or not isinstance(pedido.get("pesos"), dict):
+            raise ErroConsulta('Informe {"pesos": {"Variavel": peso, ...}}.')
+        indice_base = self.indice
+        # Pedido inválido é recusado antes do cálculo (e do cache)
+        ativo = indice_base._tipo(pedido.get("ativo"))
+        chave = indice_base.chave_pesos(pedido["pesos"])
+        k = _ler_k(pedido.get("k", K_PADRAO))
+
+        entrada = indice_base.what_if_em_cache(chave)
+        em_cache = entrada is not None
+        if entrada is None:
+            # Pedidos simultâneos com a mesma chave aguardam o mesmo cálculo
+            chave_calculo = (id(indice_base), chave)
+            futuro = self._em_andamento.get(chave_calculo)
+            if futuro is None:
+                futuro = asyncio.get_running_loop().run_in_executor(None, indice_base.calcular_what_if, chave)
+                self._em_andamento[chave_calculo] = futuro
+                futuro.add_done_callback(lambda _: self._em_andamento.pop(chave_calculo, None))
+            entrada = await asyncio.shield(futuro)
+        return {"pesos_normalizados": dict(zip(indice_base.variaveis, chave)), "em_cache": em_cache,
+                "ativos": indice_base.ranking_what_if(entrada, k, ativo)}
+
+    async def _recarregar(self):
+        # A base é relida em outra thread; as consultas usam o índice anterior até a troca
+        self.indice = await asyncio.get_running_loop().run_in_executor(
+            None, carregar_indice, self.base_path, self.pesos_path, self.capacidade_cache)
+        return self.indice.estado()
+
+    async def rotear(self, metodo, alvo, corpo):
+        """
+        Resposta (objeto JSON) para a requisição.
+        """
+        url = urlsplit(alvo)
+        caminho = unquote(url.path).rstrip("/") or "/"
+        parametros = {nome: valores[-1] for nome, valores in parse_qs(url.query).items()}
+        rotas_get = ("/saude", "/ranking")
+        if caminho in rotas_get or caminho.startswith("/ativo/"):
+            if metodo != "GET":
+                raise ErroConsulta(f"Use GET em {caminho}.", 405)
+        elif caminho in ("/what-if", "/recarregar"):
+            if metodo != "POST":
+                raise ErroConsulta(f"Use POST em {caminho}.", 405)
+        else:
+            raise ErroConsulta(f"Rota desconhecida: {caminho}", 404)
+
+        indice = self.indice
+        if caminho == "/saude":
+            return indice.estado()
+        if caminho == "/ranking":
+            return {"ativos": indice.ranking(_ler_k(parametros.get("k", K_PADRAO)), parametros.get("ativo"))}
+        if caminho.startswith("/ativo/"):
+            return {"eventos": indice.consultar_trecho(caminho[len("/ativo/"):])}
+        if caminho == "/what-if":
+            return await self._what_if(corpo)
+        return await self._recarregar()
+
+    async def atender(self, leitor, escritor):
+        status, resposta = 200, None
+        try:
+            linha = await leitor.readline()
+            partes = linha.decode("latin-1").split()
+            if len(partes) != 3:
+                raise ErroConsulta("Requisição HTTP inválida.")
+            metodo, alvo, _ = partes
+            cabecalhos = {}
+            while True:
+                linha = await leitor.readline()
+                if linha in (b"\r\n", b"\n", b""):
+                    break
+                nome, _, valor = linha.decode("latin-1").partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+            corpo = await leitor.readexactly(int(cabecalhos.get("content-length") or 0))
+            inicio = time.perf_counter()
+            resposta = await self.rotear(metodo.upper(), alvo, corpo)
+            resposta["tempo_ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+        except ErroConsulta as erro:
+            status, resposta = erro.status, {"erro": str(erro)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            escritor.close()
+            return
+        except Exception as erro:
+            status, resposta = 500, {"erro": f"{type(erro).__name__}: {erro}"}
+
+        dados = json.dumps(resposta, ensure_ascii=False, default=str).encode("utf-8")
+        escritor.write((f"HTTP/1.1 {status} {MOTIVOS_HTTP[status]}\r\n"
+                        "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(dados)}\r\n"
+                        "Connection: close\r\n\r\n").encode("latin-1") + dados)
+        try:
+            await escritor.drain()
+        finally:
+            escritor.close()
+
+    async def servir(self, host="127.0.0.1", porta=PORTA_PADRAO):
+        servidor = await asyncio.start_server(self.atender, host, porta)
+        print(f"Serviço de consultas em http://{host}:{porta} ({len(self.indice.df)} eventos)")
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço local de consultas ao ranking de criticidade.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--cache", type=int, default=CAPACIDADE_CACHE_WHAT_IF,
+                        help="Vetores de pesos what-if mantidos em cache")
+    args = parser.parse_args()
+
+    servico = ServicoConsultas(capacidade_cache=args.cache)
+    try:
+        asyncio.run(servico.servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        print("\nServiço encerrado.")
+    finally:
+        instrumentacao.emitir()
+
+
+# Script Principal
+if __name__ == "__main__":
+    main()
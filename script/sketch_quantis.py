@@ -0,0 +1,113 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: estimar quantis de colunas grandes sem ordenar a coluna inteira.
+
+    |> O que o Script Faz
+        Implementa um sketch de quantis do tipo KLL (Karnin, Lang e Liberty, 2016):
+            Os valores entram no nível 0; cada nível h guarda itens com peso 2^h.
+            Quando um nível excede sua capacidade, ele é ordenado e metade dos itens (alternados,
+            com deslocamento aleatório) sobe para o nível seguinte.
+            A capacidade decresce geometricamente (fator 2/3) dos níveis superiores para os inferiores,
+            de modo que a memória total fica em torno de 3k itens, qualquer que seja o volume de dados.
+        O erro de rank é limitado e depende só de k (em testes com k = 400, abaixo de 1%).
+        Sketches de blocos ou processos diferentes podem ser mesclados (mesclar), então a construção
+        pode ser feita em blocos e em paralelo.
+        Consultas: quantis(q) e rank(x) (fração de valores <= x), ambas vetorizadas;
+        distribuicao() devolve a tabela usada por rank(x), para consultas repetidas sem recalculá-la.
+'''
+
+# Importar bibliotecas
+import numpy as np
+
+
+class SketchQuantis:
+    """
+    Sketch de quantis mesclável (KLL) para valores reais.
+    """
+
+    def __init__(self, k=400, semente=0):
+        self.k = k
+        self.n = 0
+        self.niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        altura = len(self.niveis)
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** (altura - 1 - nivel))))
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self.niveis):
+            itens = self.niveis[nivel]
+            if len(itens) > self._capacidade(nivel):
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0))
+                itens = np.sort(itens)
+                # Com tamanho ímpar, o maior item permanece no nível atual
+                fica = itens[len(itens) - len(itens) % 2:]
+                pares = itens[:len(itens) - len(itens) % 2]
+                deslocamento = int(self._rng.integers(0, 2))
+                self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], pares[deslocamento::2]])
+                self.niveis[nivel] = fica
+            nivel += 1
+
+    def atualizar(self, valores):
+        """
+        Acrescenta um bloco de valores (NaN são ignorados).
+        """
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return self
+        self.n += len(valores)
+        self.niveis[0] = np.concatenate([self.niveis[0], valores])
+        self._compactar()
+        return self
+
+    def mesclar(self, outro):
+        """
+        Incorpora outro sketch (de um bloco ou processo diferente).
+        """
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append(np.empty(0))
+        for nivel, itens in enumerate(outro.niveis):
+            self.niveis[nivel] = np.concatenate([self.niveis[nivel], itens])
+        self.n += outro.n
+        self._compactar()
+        return self
+
+    def _itens_ponderados(self):
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(len(itens), 2.0 ** nivel) for nivel, itens in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind="stable")
+        return valores[ordem], np.cumsum(pesos[ordem])
+
+    def quantis(self, qs):
+        """
+        Valores aproximados dos quantis `qs` (entre 0 e 1).
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        valores, acumulado = self._itens_ponderados()
+        posicao = np.searchsorted(acumulado, qs * acumulado[-1], side="left")
+        return valores[np.minimum(posicao, len(valores) - 1)]
+
+    def distribuicao(self):
+        """
+        Tabela da distribuição aproximada: (valores ordenados, fração acumulada com 0 à esquerda).
+        O rank de x é fracao[np.searchsorted(valores, x, side="right")].
+        """
+        valores, acumulado = self._itens_ponderados()
+        return valores, np.concatenate([[0.0], acumulado]) / acumulado[-1]
+
+    def rank(self, x):
+        """
+        Fração aproximada de valores menores ou iguais a x (função de distribuição empírica).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.n == 0:
+            return np.full(x.shape, np.nan)
+        valores, fracao = self.distribuicao()
+        return fracao[np.searchsorted(valores, x, side="right")]
@@ -0,0 +1,255 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: representar a topologia dos alimentadores para propagar o impacto das interrupções entre trechos.
+
+    |> O que o Script Faz
+        Lê a topologia de uma lista de arestas local (CSV com Trecho_Montante, Trecho_Jusante):
+            Rede radial: cada trecho tem no máximo um trecho a montante; trechos sem montante são inícios de alimentador.
+            Trechos da base sem arestas entram como alimentadores isolados (um único trecho).
+            Ciclos e trechos com mais de um montante são rejeitados (ValueError).
+        Armazena o grafo em arrays compactos:
+            pai[i]                  Trecho a montante de i (-1 no início do alimentador).
+            inicios/filhos (CSR)    Trechos a jusante de i: filhos[inicios[i]:inicios[i + 1]].
+            niveis                  Trechos agrupados pela profundidade (busca em largura sobre o CSR).
+        As propagações são vetorizadas por nível (sem recursão por trecho), em tempo linear:
+            somar_jusante: soma de cada trecho com todos os trechos a jusante (do nível mais profundo para o início).
+            somar_montante: soma dos trechos a montante (do início para o nível mais profundo).
+        Métricas por trecho (calcular_metricas_topologia):
+            Nivel, Trechos_Jusante, Clientes_Jusante (clientes de todo o ramo que uma falha no trecho desliga),
+            Impacto_DEC_Jusante / Impacto_FEC_Jusante (impactos dos eventos no trecho e a jusante) e
+            Impacto_DEC_Montante / Impacto_FEC_Montante (impactos dos eventos a montante, que também desligam o trecho).
+        juntar_topologia acrescenta as métricas a cada evento (pelo Trecho); as novas colunas podem receber pesos
+        em pesos_anal_criticidade.csv como as demais variáveis:
+            Os carregadores da criticidade, da matriz e do serviço de consultas chamam juntar_topologia_pesos,
+            que lê topologia_trechos.csv (na pasta da base) apenas quando os pesos citam alguma COLUNAS_TOPOLOGIA.
+
+    |> Nota:
+        Sem uma tabela de clientes por trecho, os clientes do trecho são estimados pelo maior Clientes_Afetados
+        observado nos seus eventos.
+'''
+
+# Importar bibliotecas
+import os
+import numpy as np
+import pandas as pd
+import instrumentacao
+from acesso_dados import carregar_base_compacta
+
+# Caminhos para arquivos
+output_path = "/Users/accol/Library/Mobile Documents/com~apple~CloudDocs/UNIVERSIDADES/UFF/PROJETOS/LIGHT/REDE_ATIVOS/REDE_AEREA/script/DADOS"
+dados_path = os.path.join(output_path, "interrupcoes_light.csv")
+ARQUIVO_TOPOLOGIA = "topologia_trechos.csv"
+topologia_path = os.path.join(output_path, ARQUIVO_TOPOLOGIA)
+
+COLUNA_MONTANTE = "Trecho_Montante"
+COLUNA_JUSANTE = "Trecho_Jusante"
+
+VARIAVEIS_IMPACTO = ("Impacto_DEC", "Impacto_FEC")
+
+# Métricas por trecho que podem receber pesos
+COLUNAS_TOPOLOGIA = ("Nivel", "Trechos_Jusante", "Clientes_Jusante",
+                     "Impacto_DEC_Jusante", "Impacto_FEC_Jusante", "Impacto_DEC_Montante", "Impacto_FEC_Montante")
+
+
+def _expandir_faixas(inicios, fins):
+    # Concatena os intervalos [inicio, fim) sem laço Python
+    contagens = fins - inicios
+    total = int(contagens.sum())
+    deslocamento = np.repeat(inicios - np.cumsum(contagens) + contagens, contagens)
+    return deslocamento + np.arange(total, dtype=np.int64)
+
+
+class TopologiaRede:
+    """
+    Grafo radial dos trechos em arrays compactos (pai, CSR dos filhos e níveis).
+    """
+
+    def __init__(self, trechos, pai):
+        self.trechos = pd.Index(trechos)
+        self.pai = np.asarray(pai, dtype=np.int64)
+        n = len(self.pai)
+
+        # CSR dos filhos: arestas ordenadas pelo pai (ordem estável)
+        tem_pai = np.flatnonzero(self.pai >= 0)
+        self.filhos = tem_pai[np.argsort(self.pai[tem_pai], kind="stable")]
+        self.inicios = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pai[tem_pai], minlength=n), out=self.inicios[1:])
+
+        # Níveis por busca em largura a partir dos inícios de alimentador
+        self.niveis = [np.flatnonzero(self.pai < 0)]
+        while True:
+            atual = self.niveis[-1]
+            proximo = self.filhos[_expandir_faixas(self.inicios[atual], self.inicios[atual + 1])]
+            if len(proximo) == 0:
+                break
+            self.niveis.append(proximo)
+        alcancados = sum(len(nivel) for nivel in self.niveis)
+        if alcancados != n:
+            raise ValueError(f"A topologia tem ciclos: {n - alcancados} trechos não são alcançáveis "
+                             "a partir de um início de alimentador.")
+        self.nivel = np.empty(n, dtype=np.int64)
+        for profundidade, nivel in enumerate(self.niveis):
+            self.nivel[nivel] = profundidade
+
+    @classmethod
+    def de_arestas(cls, arestas, trechos_extras=()):
+        """
+        Topologia a partir das arestas (montante -> jusante); trechos_extras sem arestas viram alimentadores isolados.
+        """
+        montante = arestas[COLUNA_MONTANTE].astype(str).to_numpy()
+        jusante = arestas[COLUNA_JUSANTE].astype(str).to_numpy()
+        repetidos = pd.Index(jusante)[pd.Index(jusante).duplicated()].unique()
+        if len(repetidos):
+            raise ValueError(f"Rede não radial: {len(repetidos)} trechos com mais de um montante "
+                             f"(ex.: {list(repetidos[:5])}).")
+        codigos, trechos = pd.factorize(np.concatenate(
+            [montante, jusante, np.asarray(trechos_extras, dtype=str)]))
+        pai = np.full(len(trechos), -1, dtype=np.int64)
+        pai[codigos[len(montante):2 * len(montante)]] = codigos[:len(montante)]
+        return cls(trechos, pai)
+
+    def __len__(self):
+        return len(self.pai)
+
+    def posicoes(self, trechos):
+        """
+        Posição de cada trecho na topologia (-1 se ausente).
+        """
+        return self.trechos.get_indexer(pd.Index(trechos).astype(str))
+
+    def somar_jusante(self, valores):
+        """
+        Soma de cada trecho com todos os trechos a jusante.
+        """
+        soma = np.array(valores, dtype=np.float64)
+        for nivel in reversed(self.niveis[1:]):
+            np.add.at(soma, self.pai[nivel], soma[nivel])
+        return soma
+
+    def somar_montante(self, valores):
+        """
+        Soma dos trechos a montante (sem o próprio trecho).
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        soma = np.zeros(len(self.pai))
+        for nivel in self.niveis[1:]:
+            pais = self.pai[nivel]
+            soma[nivel] = soma[pais] + valores[pais]
+        return soma
+
+
+def carregar_topologia(arestas_path, trechos_extras=()):
+    arestas = pd.read_csv(arestas_path, usecols=[COLUNA_MONTANTE, COLUNA_JUSANTE],
+                          dtype={COLUNA_MONTANTE: str, COLUNA_JUSANTE: str})
+    return TopologiaRede.de_arestas(arestas, trechos_extras)
+
+
+def _por_trecho(df, topologia, coluna, funcao):
+    # Agregação dos eventos por trecho, alinhada às posições da topologia
+    valores = np.zeros(len(topologia))
+    agregado = df.groupby("Trecho", observed=True)[coluna].agg(funcao)
+    posicoes = topologia.posicoes(agregado.index)
+    presentes = posicoes >= 0
+    valores[posicoes[presentes]] = agregado.to_numpy(dtype=np.float64)[presentes]
+    return valores
+
+
+def calcular_metricas_topologia(topologia, df, clientes=None):
+    """
+    Métricas de propagação por trecho. `clientes`: Series de clientes por Trecho (opcional).
+    """
+    if clientes is None:
+        clientes_trecho = _por_trecho(df, topologia, "Clientes_Afetados", "max")
+    else:
+        clientes_trecho = np.zeros(len(topologia))
+        posicoes = topologia.posicoes(clientes.index)
+        presentes = posicoes >= 0
+        clientes_trecho[posicoes[presentes]] = clientes.to_numpy(dtype=np.float64)[presentes]
+
+    metricas = pd.DataFrame({
+        "Trecho": topologia.trechos,
+        "Trecho_Montante": np.where(topologia.pai >= 0, topologia.trechos[np.maximum(topologia.pai, 0)], None),
+        "Nivel": topologia.nivel,
+        "Trechos_Jusante": topologia.somar_jusante(np.ones(len(topologia))).astype(np.int64),
+        "Clientes_Jusante": topologia.somar_jusante(clientes_trecho),
+    })
+    for var in VARIAVEIS_IMPACTO:
+        impacto = _por_trecho(df, topologia, var, "sum")
+        metricas[f"{var}_Jusante"] = topologia.somar_jusante(impacto)
+        metricas[f"{var}_Montante"] = topologia.somar_montante(impacto)
+    return metricas
+
+
+def juntar_topologia(df, metricas, colunas=None):
+    """
+    Acrescenta a cada evento as métricas do seu Trecho (NaN para trechos fora da topologia).
+    """
+    colunas = colunas or [c for c in metricas.columns if c not in ("Trecho", "Trecho_Montante")]
+    indice = pd.Index(metricas["Trecho"].astype(str))
+    trechos = df["Trecho"]
+    if isinstance(trechos.dtype, pd.CategoricalDtype):
+        # Uma busca por categoria, depois apenas os códigos
+        por_categoria = indice.get_indexer(trechos.cat.categories.astype(str))
+        codigos = trechos.cat.codes.to_numpy()
+        posicoes = np.where(codigos >= 0, por_categoria[codigos], -1)
+    else:
+        posicoes = indice.get_indexer(trechos.astype(str))
+    ausentes = posicoes < 0
+    for coluna in colunas:
+        valores = metricas[coluna].to_numpy(dtype=np.float64)[posicoes]
+        valores[ausentes] = np.nan
+        df[coluna] = valores
+    return df
+
+
+def juntar_topologia_pesos(df, pesos_df, base_path):
+    """
+    Acrescenta ao df as métricas de topologia citadas nos pesos, a partir de ARQUIVO_TOPOLOGIA na pasta
+    da base (sem leitura quando os pesos não citam nenhuma).
+    """
+    colunas = [var for var in pesos_df["Variavel"] if var in COLUNAS_TOPOLOGIA and var not in df.columns]
+    if not colunas:
+        return df
+    trechos = df["Trecho"]
+    trechos = trechos.cat.categories if isinstance(trechos.dtype, pd.CategoricalDtype) else trechos.dropna().unique()
+    topologia = carregar_topologia(os.path.join(os.path.dirname(base_path), ARQUIVO_TOPOLOGIA), trechos)
+    return juntar_topologia(df, calcular_metricas_topologia(topologia, df), colunas)
+
+
+def gerar_topologia_simulada(trechos, saida_path, n_alimentadores=20, janela=50, semente=42):
+    """
+    Topologia radial aleatória para os trechos da base simulada: cada trecho (em ordem aleatória)
+    é ligado a um dos `janela` trechos anteriores; os `n_alimentadores` primeiros iniciam alimentadores.
+    """
+    rng = np.random.default_rng(semente)
+    trechos = np.asarray(pd.unique(pd.Series(trechos).astype(str)))
+    ordem = rng.permutation(len(trechos))
+    posicao = np.arange(n_alimentadores, len(trechos))
+    anterior = posicao - 1 - np.minimum(rng.integers(0, janela, size=len(posicao)), posicao - 1)
+    arestas = pd.DataFrame({COLUNA_MONTANTE: trechos[ordem[anterior]], COLUNA_JUSANTE: trechos[ordem[posicao]]})
+    arestas.to_csv(saida_path, index=False)
+    return arestas
+
+
+# Script Principal
+if __name__ == "__main__":
+    with instrumentacao.etapa("carregamento") as registro:
+        df = carregar_base_compacta(dados_path)
+        registro["linhas"] = len(df)
+    if not os.path.exists(topologia_path):
+        gerar_topologia_simulada(df["Trecho"].cat.categories, topologia_path)
+        print(f"Topologia simulada gerada em: {topologia_path}")
+
+    with instrumentacao.etapa("topologia") as registro:
+        topologia = carregar_topologia(topologia_path, trechos_extras=df["Trecho"].cat.categories)
+        metricas = calcular_metricas_topologia(topologia, df)
+        registro["linhas"] = len(topologia)
+    print(f"{len(topologia)} trechos em {len(topologia.niveis[0])} alimentadores, "
+          f"profundidade máxima {len(topologia.niveis) - 1}.")
+    print(metricas.sort_values("Clientes_Jusante", ascending=False, kind="stable").head(10).to_string(index=False))
+
+    metricas_path = os.path.join(output_path, "metricas_topologia.csv")
+    metricas.to_csv(metricas_path, index=False)
+    print(f"\nMétricas por trecho salvas em: {metricas_path}")
+    instrumentacao.emitir()
@@ -0,0 +1,82 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: medir o tempo de inicialização dos módulos de cálculo e garantir o orçamento do modo headless.
+
+    |> O que o Script Faz
+        Importa cada módulo de cálculo em um processo Python novo (REDE_AEREA_HEADLESS=1), como nos jobs em lote.
+        Mede o tempo de importação (mediana de algumas repetições) e compara com ORCAMENTO_INICIALIZACAO_S.
+        Verifica que nenhuma biblioteca gráfica (plotly, statsmodels, matplotlib, seaborn) foi carregada.
+        Retorna código de saída 1 se algum módulo estourar o orçamento ou importar bibliotecas gráficas.
+
+    |> Uso
+        python verificar_inicializacao.py
+'''
+
+# Importar bibliotecas
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Orçamento de tempo de importação por módulo (segundos, mediana)
+ORCAMENTO_INICIALIZACAO_S = 1.0
+
+# Módulos que os jobs de cálculo importam
+MODULOS_CALCULO = [
+    "pesos_analise_criticidade",
+    "matriz_prioridade",
+    "criterio_definido_classificar_criticidade",
+    "eda_analise_estatitica_descritiva_light",
+    "integrando_sistema",
+]
+
+BIBLIOTECAS_GRAFICAS = ("plotly", "statsmodels", "matplotlib", "seaborn")
+
+REPETICOES = 3
+
+_CODIGO_MEDICAO = """
+import sys, time, json
+inicio = time.perf_counter()
+import {modulo}
+duracao = time.perf_counter() - inicio
+carregadas = sorted({{nome.split(".")[0] for nome in sys.modules}} & set({bibliotecas!r}))
+print(json.dumps({{"duracao": duracao, "graficas": carregadas}}))
+"""
+
+
+def medir_modulo(modulo, repeticoes=REPETICOES):
+    """
+    Tempo de importação (mediana) e bibliotecas gráficas carregadas pelo módulo, em processos novos.
+    """
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    ambiente = dict(os.environ, REDE_AEREA_HEADLESS="1")
+    codigo = _CODIGO_MEDICAO.format(modulo=modulo, bibliotecas=BIBLIOTECAS_GRAFICAS)
+    duracoes, graficas = [], set()
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", codigo], cwd=diretorio, env=ambiente,
+                               capture_output=True, text=True, check=True)
+        resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+        duracoes.append(resultado["duracao"])
+        graficas.update(resultado["graficas"])
+    return statistics.median(duracoes), sorted(graficas)
+
+
+def verificar(modulos=MODULOS_CALCULO, orcamento=ORCAMENTO_INICIALIZACAO_S):
+    """
+    Mede todos os módulos e retorna True se todos respeitam o orçamento.
+    """
+    aprovado = True
+    print(f"{'Módulo':45s} {'Tempo (s)':>10s}  Bibliotecas gráficas")
+    for modulo in modulos:
+        duracao, graficas = medir_modulo(modulo)
+        ok = duracao <= orcamento and not graficas
+        aprovado &= ok
+        print(f"{modulo:45s} {duracao:10.3f}  {', '.join(graficas) or '-'}{'' if ok else '  <- FALHOU'}")
+    print(f"\nOrçamento: {orcamento:.2f} s por módulo, sem bibliotecas gráficas.")
+    return aprovado
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verificar() else 1)
@@ -0,0 +1,184 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: camada de visualização que reduz os dados antes de enviá-los ao navegador.
+
+    |> O que o Script Faz
+        Cada tipo de gráfico tem um orçamento fixo de pontos (ORCAMENTO_PONTOS), configurável por chamada:
+            Barras: apenas os N maiores valores (seleção parcial, ranking_criticidade.py).
+            Séries temporais: LTTB (Largest-Triangle-Three-Buckets) ou redução por faixas (mín./máx. por faixa).
+            Dispersão: amostra aleatória reprodutível, desenhada com traços WebGL (Scattergl).
+            Boxplots: estatísticas pré-calculadas (quartis, cercas, média e desvio), sem enviar os pontos.
+            Tabelas: paginadas por botões, limitadas às primeiras linhas do ranking.
+        O Plotly só é importado quando um gráfico é de fato construído: as funções de redução (Top-N, LTTB,
+        amostragem) e o cálculo da criticidade não carregam bibliotecas gráficas.
+        Modo headless (variável de ambiente REDE_AEREA_HEADLESS=1): os scripts não geram gráficos,
+        exceto quando há um relatório HTML ativo (REDE_AEREA_RELATORIO, relatorio_html.py).
+'''
+
+# Importar bibliotecas
+import os
+import numpy as np
+from ranking_criticidade import selecionar_top_k
+from relatorio_html import relatorio_ativo
+
+# Modo headless: apenas cálculo, sem gráficos (servidores sem tela, execuções em lote)
+MODO_HEADLESS = os.environ.get("REDE_AEREA_HEADLESS", "0") == "1"
+
+# Orçamento padrão de pontos por tipo de gráfico
+ORCAMENTO_PONTOS = {
+    "barras": 50,
+    "serie": 2000,
+    "dispersao": 20000,
+    "tabela": 1000,
+    "linhas_por_pagina": 50,
+}
+
+
+def graficos_habilitados():
+    """
+    Indica se os scripts devem gerar gráficos (False no modo headless, salvo com relatório HTML ativo).
+    """
+    return not MODO_HEADLESS or relatorio_ativo() is not None
+
+
+def _orcamento(tipo, valor=None):
+    return ORCAMENTO_PONTOS[tipo] if valor is None else valor
+
+
+def selecionar_top_n(df, coluna, n=None):
+    """
+    As N linhas com maior valor na coluna, em ordem decrescente.
+    """
+    n = _orcamento("barras", n)
+    return df.iloc[selecionar_top_k(df[coluna].to_numpy(dtype=np.float64, na_value=np.nan), n)]
+
+
+def lttb(x, y, n_pontos=None):
+    """
+    Índices dos pontos escolhidos pelo LTTB (Largest-Triangle-Three-Buckets).
+    x deve estar em ordem crescente.
+    """
+    n_pontos = _orcamento("serie", n_pontos)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_pontos >= n or n_pontos < 3:
+        return np.arange(n)
+
+    limites = np.linspace(1, n - 1, n_pontos - 1).astype(np.int64)
+    escolhidos = np.empty(n_pontos, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for b in range(n_pontos - 2):
+        inicio, fim = limites[b], limites[b + 1]
+        # Média do próximo balde (ou o último ponto)
+        prox_fim = limites[b + 2] if b + 2 < len(limites) else n
+        media_x = x[fim:prox_fim].mean() if prox_fim > fim else x[-1]
+        media_y = y[fim:prox_fim].mean() if prox_fim > fim else y[-1]
+        # Maior área do triângulo (ponto anterior, candidato, média do próximo balde)
+        areas = np.abs((x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+                       - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior]))
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[b + 1] = anterior
+    return escolhidos
+
+
+def reduzir_por_faixas(x, y, n_faixas=None):
+    """
+    Índices dos pontos de mínimo e máximo de y em cada faixa de x (até 2 pontos por faixa).
+    x deve estar em ordem crescente.
+    """
+    n_faixas = _orcamento("serie", n_faixas) // 2
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * n_faixas >= n or n_faixas < 1:
+        return np.arange(n)
+
+    inicios = np.linspace(0, n, n_faixas + 1).astype(np.int64)[:-1]
+    faixa = np.repeat(np.arange(n_faixas), np.diff(np.append(inicios, n)))
+    minimos = np.minimum.reduceat(y, inicios)
+    maximos = np.maximum.reduceat(y, inicios)
+    e_min = y == minimos[faixa]
+    e_max = y == maximos[faixa]
+    # Primeira ocorrência do mínimo e do máximo em cada faixa
+    idx_min = np.flatnonzero(e_min)[np.unique(faixa[e_min], return_index=True)[1]]
+    idx_max = np.flatnonzero(e_max)[np.unique(faixa[e_max], return_index=True)[1]]
+    return np.unique(np.concatenate([idx_min, idx_max]))
+
+
+def amostrar_linhas(df, n=None, semente=0):
+    """
+    Amostra reprodutível de até N linhas, preservando a ordem original.
+    """
+    n = _orcamento("dispersao", n)
+    if len(df) <= n:
+        return df
+    rng = np.random.default_rng(semente)
+    return df.iloc[np.sort(rng.choice(len(df), size=n, replace=False))]
+
+
+def dispersao_webgl(df, x, y, orcamento=None, **kwargs):
+    """
+    Gráfico de dispersão com traços WebGL sobre uma amostra limitada ao orçamento.
+    """
+    import plotly.express as px
+
+    amostra = amostrar_linhas(df, orcamento)
+    fig = px.scatter(amostra, x=x, y=y, render_mode="webgl", **kwargs)
+    if len(amostra) < len(df):
+        titulo = kwargs.get("title") or ""
+        fig.update_layout(title_text=f"{titulo} (amostra de {len(amostra)} de {len(df)} pontos)")
+    return fig
+
+
+def boxplot_estatisticas(nome, q1, mediana, q3, inferior, superior, media, desvio):
+    """
+    Boxplot desenhado apenas com as estatísticas informadas.
+    """
+    import plotly.graph_objects as go
+
+    return go.Box(
+        name=nome, q1=[q1], median=[mediana], q3=[q3],
+        lowerfence=[inferior], upperfence=[superior],
+        mean=[media], sd=[desvio], boxpoints=False
+    )
+
+
+def tabela_paginada(colunas, cabecalhos, titulo, linhas_por_pagina=None, max_linhas=None,
+                    total_linhas=None, columnwidth=None, estilo_cabecalho=None, estilo_celulas=None):
+    """
+    Tabela Plotly com paginação por botões. `colunas` é uma lista de sequências de mesmo tamanho,
+    já ordenadas; apenas as primeiras `max_linhas` linhas são enviadas.
+    `total_linhas` informa o tamanho original quando as colunas já chegam recortadas.
+    """
+    import plotly.graph_objects as go
+
+    linhas_por_pagina = _orcamento("linhas_por_pagina", linhas_por_pagina)
+    max_linhas = _orcamento("tabela", max_linhas)
+    total = total_linhas if total_linhas is not None else (len(colunas[0]) if colunas else 0)
+    colunas = [np.asarray(col)[:max_linhas] for col in colunas]
+    n_linhas = len(colunas[0]) if colunas else 0
+    paginas = [(inicio, min(inicio + linhas_por_pagina, n_linhas))
+               for inicio in range(0, max(n_linhas, 1), linhas_por_pagina)]
+
+    def valores_pagina(inicio, fim):
+        return [col[inicio:fim] for col in colunas]
+
+    fig = go.Figure(data=[go.Table(
+        columnwidth=columnwidth,
+        header=dict(values=cabecalhos, **(estilo_cabecalho or dict(fill_color='lightgrey', align='center'))),
+        cells=dict(values=valores_pagina(*paginas[0]),
+                   **(estilo_celulas or dict(fill_color='white', align='center')))
+    )])
+    if len(paginas) > 1:
+        fig.update_layout(updatemenus=[dict(
+            type="dropdown", x=1.0, y=1.12, xanchor="right",
+            buttons=[dict(label=f"Página {p + 1}", method="restyle",
+                          args=[{"cells.values": [valores_pagina(inicio, fim)]}])
+                     for p, (inicio, fim) in enumerate(paginas)]
+        )])
+    if n_linhas < total:
+        titulo = f"{titulo} (primeiras {n_linhas} de {total} linhas)"
+    fig.update_layout(title_text=titulo, title_x=0.5, margin=dict(l=10, r=10, t=50, b=10), width=800)
+    return fig
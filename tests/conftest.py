@@ -0,0 +1,38 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: configuração comum dos testes (pytest).
+
+    |> O que o Script Faz
+        Coloca a pasta script/ no caminho de importação (os scripts importam uns aos outros pelo nome).
+        Fixtures:
+            pasta_dados     Pasta DADOS temporária com uma base simulada pequena e os pesos iniciais.
+'''
+
+# Importar bibliotecas
+import os
+import sys
+import pandas as pd
+import pytest
+
+DIRETORIO_SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "script")
+sys.path.insert(0, DIRETORIO_SCRIPTS)
+
+from geracao_base_dados import gerar_base_simulada_vetorizada  # noqa: E402
+
+REGISTROS_TESTE = 3000
+
+PESOS_INICIAIS = pd.DataFrame({
+    "Variavel": ["Freq_Falhas", "Tempo_Operacao", "Impacto_DEC", "Impacto_FEC", "Clientes_Afetados"],
+    "Peso": [0.00, 0.08, 32.43, 20.15, 0.04],
+})
+
+
+@pytest.fixture
+def pasta_dados(tmp_path):
+    pasta = tmp_path / "DADOS"
+    pasta.mkdir()
+    gerar_base_simulada_vetorizada(str(pasta / "interrupcoes_light.csv"), REGISTROS_TESTE, semente=7,
+                                   tamanho_bloco=1000)
+    PESOS_INICIAIS.to_csv(pasta / "pesos_anal_criticidade.csv", index=False)
+    return pasta
@@ -0,0 +1,42 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do cache colunar da base (acesso_dados.py).
+'''
+
+# Importar bibliotecas
+import os
+import pandas as pd
+import instrumentacao
+from acesso_dados import atualizar_cache, carregar_base, carregar_base_compacta, linhas_base
+
+
+def test_cache_reaproveitado_e_invalidado_pelo_conteudo(pasta_dados):
+    base_path = str(pasta_dados / "interrupcoes_light.csv")
+    ativa = instrumentacao.configurar(memoria="nenhuma")
+
+    _, reaproveitado = atualizar_cache(base_path)
+    assert not reaproveitado
+    assert atualizar_cache(base_path)[1]
+
+    # Apenas "tocado" (mtime novo, mesmo conteúdo): reaproveitado após conferir o hash
+    info = os.stat(base_path)
+    os.utime(base_path, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+    assert atualizar_cache(base_path)[1]
+
+    # Conteúdo alterado: reconstruído
+    base = pd.read_csv(base_path)
+    base.head(100).to_csv(base_path, index=False)
+    assert not atualizar_cache(base_path)[1]
+    assert linhas_base(base_path) == 100
+    assert ativa.contadores == {"cache_colunar_falhas": 2, "cache_colunar_acertos": 3}
+
+
+def test_base_compacta_tem_os_mesmos_valores(pasta_dados):
+    base_path = str(pasta_dados / "interrupcoes_light.csv")
+    base = carregar_base(base_path)
+    compacta = carregar_base_compacta(base_path)
+    assert isinstance(compacta["Trecho"].dtype, pd.CategoricalDtype)
+    assert compacta.memory_usage(deep=True).sum() < base.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(compacta.astype({col: str for col in compacta.select_dtypes("category")}),
+                                  base, check_dtype=False)
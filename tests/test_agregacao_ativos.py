@@ -0,0 +1,80 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes da consolidação por ativo e das janelas móveis (agregacao_ativos.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+from acesso_dados import carregar_base
+from agregacao_ativos import agregar_por_ativo, calcular_janelas_moveis
+
+
+# A base simulada tem um trecho por evento: as janelas são testadas por tipo de ativo
+CHAVES = ("Ativo",)
+
+
+@pytest.fixture
+def base(pasta_dados):
+    return carregar_base(str(pasta_dados / "interrupcoes_light.csv"))
+
+
+def _janelas_por_laco(df, janela):
+    # Referência direta: eventos do mesmo tipo nos `janela` meses que terminam no mês do evento
+    meses = df["Data_Interrupcao"].dt.year * 12 + df["Data_Interrupcao"].dt.month
+    contagens = np.empty(len(df), dtype=np.int64)
+    for i, (ativo, mes) in enumerate(zip(df["Ativo"], meses)):
+        contagens[i] = ((df["Ativo"] == ativo) & (meses <= mes) & (meses > mes - janela)).sum()
+    return contagens
+
+
+def test_janelas_moveis_contra_referencia(base):
+    amostra = base.head(400).reset_index(drop=True)
+    resultado = calcular_janelas_moveis(amostra, CHAVES)
+    for janela in (3, 12):
+        np.testing.assert_array_equal(resultado[f"Eventos_{janela}M"].to_numpy(), _janelas_por_laco(amostra, janela))
+
+
+def test_eventos_sem_data_nao_alteram_os_demais(base):
+    referencia = agregar_por_ativo(base, CHAVES)
+
+    com_nat = base.copy()
+    com_nat.loc[5, "Data_Interrupcao"] = pd.NaT
+    eventos = calcular_janelas_moveis(com_nat, CHAVES)
+    datadas = com_nat["Data_Interrupcao"].notna()
+
+    # O evento sem data fica sem janelas; os demais só perdem a contribuição dele
+    assert eventos.loc[5, ["Eventos_12M", "Impacto_DEC_12M"]].isna().all()
+    esperado = calcular_janelas_moveis(com_nat[datadas], CHAVES)
+    for coluna in ("Eventos_3M", "Eventos_12M", "Eventos_36M", "Impacto_DEC_12M"):
+        np.testing.assert_array_equal(eventos.loc[datadas, coluna].to_numpy(), esperado[coluna].to_numpy())
+
+    # Por tipo de ativo: só o tipo do evento sem data perde um evento
+    ativos = agregar_por_ativo(com_nat, CHAVES)
+    pd.testing.assert_frame_equal(ativos, agregar_por_ativo(com_nat[datadas], CHAVES))
+    diferenca = referencia.set_index("Ativo")["Freq_Falhas"] - ativos.set_index("Ativo")["Freq_Falhas"]
+    assert diferenca.to_dict() == {ativo: int(ativo == base.loc[5, "Ativo"]) for ativo in diferenca.index}
+
+
+def test_sem_eventos_datados(base):
+    vazia = base.head(3).assign(Data_Interrupcao=pd.NaT)
+    with pytest.raises(ValueError):
+        agregar_por_ativo(vazia, CHAVES)
+
+
+def test_eventos_sem_trecho_nao_colidem_com_outro_grupo(base):
+    # Trechos sintéticos com vários eventos cada; o evento copiado sem Trecho não pode cair no grupo 0
+    base = base.assign(Trecho=[f"Trecho {i % 40}" for i in range(len(base))])
+    referencia = agregar_por_ativo(base)
+
+    orfao = base.iloc[[0]].assign(Trecho=None, Clientes_Afetados=999_999)
+    com_orfao = pd.concat([base, orfao], ignore_index=True)
+    pd.testing.assert_frame_equal(agregar_por_ativo(com_orfao), referencia)
+
+    eventos = calcular_janelas_moveis(com_orfao)
+    assert eventos.iloc[-1][["Eventos_12M", "Clientes_Afetados_12M"]].isna().all()
+    esperado = calcular_janelas_moveis(base)
+    for coluna in ("Eventos_12M", "Clientes_Afetados_12M", "Impacto_DEC_36M"):
+        np.testing.assert_array_equal(eventos[coluna].to_numpy()[:-1], esperado[coluna].to_numpy())
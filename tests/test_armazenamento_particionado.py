@@ -0,0 +1,65 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes das partições ano/mês e da leitura filtrada (armazenamento_particionado.py).
+'''
+
+# Importar bibliotecas
+import pandas as pd
+import pytest
+from acesso_dados import carregar_base
+from armazenamento_particionado import atualizar_particoes, carregar_particoes, selecionar_particoes
+
+
+@pytest.fixture
+def base_path(pasta_dados):
+    return str(pasta_dados / "interrupcoes_light.csv")
+
+
+def _comparavel(df):
+    # Partições mudam a ordem das linhas e compactam os tipos: comparar valores, ordenados pelo trecho
+    df = df.astype({col: str for col in df.select_dtypes("category").columns})
+    return df.sort_values("Trecho", kind="stable").reset_index(drop=True)
+
+
+@pytest.mark.parametrize("inicio, fim, ativos", [
+    ("2023-03-01", "2023-03-31", None),
+    ("2023-02-15", "2023-07-10 12:00", None),
+    (None, "2023-05-31", ["Transformador"]),
+    ("2024-01-01", None, ["Religador", "Chave Fusível"]),
+])
+def test_leitura_filtrada_igual_ao_filtro_da_base(base_path, inicio, fim, ativos):
+    base = carregar_base(base_path)
+    selecao = pd.Series(True, index=base.index)
+    if inicio is not None:
+        selecao &= base["Data_Interrupcao"] >= pd.Timestamp(inicio)
+    if fim is not None:
+        # Fim inclusivo: uma data sem hora inclui o dia inteiro
+        limite = pd.Timestamp(fim)
+        limite = limite + pd.Timedelta(days=1) if limite == limite.normalize() else limite + pd.Timedelta(1, "ns")
+        selecao &= base["Data_Interrupcao"] < limite
+    if ativos is not None:
+        selecao &= base["Ativo"].isin(ativos)
+
+    lido = carregar_particoes(base_path, inicio, fim, ativos)
+    assert len(lido) == selecao.sum() > 0
+    pd.testing.assert_frame_equal(_comparavel(lido), _comparavel(base[selecao]), check_dtype=False)
+
+
+def test_particoes_fora_do_filtro_nao_sao_abertas(base_path):
+    _, manifesto = atualizar_particoes(base_path)
+    selecionadas = selecionar_particoes(manifesto, "2023-03-01", "2023-03-31")
+    assert [particao["particao"] for particao, _ in selecionadas] == ["ano=2023/mes=03"]
+    # Partição inteiramente dentro do filtro: lida sem filtro de linhas
+    assert selecionadas[0][1] is None
+
+
+def test_selecao_vazia_mantem_categorias(base_path):
+    cheio = carregar_particoes(base_path, "2023-03-01", "2023-03-31")
+    vazio = carregar_particoes(base_path, "2030-01-01", "2030-12-31")
+    assert len(vazio) == 0
+    assert list(vazio.columns) == list(cheio.columns)
+    for col in ("Trecho", "Ativo", "Causa", "Status_Ativo"):
+        assert isinstance(vazio[col].dtype, pd.CategoricalDtype)
+    assert isinstance(carregar_particoes(base_path, "2030-01-01", colunas=["Ativo"])["Ativo"].dtype,
+                      pd.CategoricalDtype)
@@ -0,0 +1,67 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes da calibração dos pesos (calibracao_pesos.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import nnls
+from calibracao_pesos import EquacoesNormais, calibrar_pesos, dobras_linhas, equacoes_do_df, resolver_nnls
+
+VARIAVEIS = ["Freq_Falhas", "Tempo_Operacao", "Impacto_DEC", "Impacto_FEC"]
+PESOS_REAIS = np.array([0.0, 0.5, 3.0, 1.5])
+
+
+@pytest.fixture
+def base():
+    rng = np.random.default_rng(9)
+    n = 20_000
+    df = pd.DataFrame({
+        "Freq_Falhas": rng.integers(1, 10, n).astype(np.float64),
+        "Tempo_Operacao": rng.uniform(0, 40, n),
+        "Impacto_DEC": rng.lognormal(0.0, 1.0, n),
+        "Impacto_FEC": rng.lognormal(-1.0, 0.5, n),
+    })
+    df["Criticidade_REAL"] = df[VARIAVEIS].to_numpy() @ PESOS_REAIS + rng.normal(0.0, 0.1, n)
+    return df
+
+
+@pytest.mark.parametrize("semente", range(10))
+def test_nnls_igual_ao_scipy(semente):
+    rng = np.random.default_rng(semente)
+    x = rng.normal(size=(300, 6))
+    y = x @ rng.normal(size=6) + rng.normal(size=300)
+    esperado, _ = nnls(x, y)
+    np.testing.assert_allclose(resolver_nnls(x.T @ x, x.T @ y), esperado, atol=1e-8)
+
+
+def test_equacoes_em_blocos_iguais_as_diretas(base):
+    x, y = base[VARIAVEIS].to_numpy(), base["Criticidade_REAL"].to_numpy()
+    equacoes = equacoes_do_df(base, VARIAVEIS, tamanho_bloco=1234)
+    xtx, xty, yty, n = equacoes.sistema(np.arange(equacoes.n_dobras))
+    assert n == len(base)
+    np.testing.assert_allclose(xtx, x.T @ x, rtol=1e-12)
+    np.testing.assert_allclose(xty, x.T @ y, rtol=1e-12)
+    np.testing.assert_allclose(yty, y @ y, rtol=1e-12)
+
+    # Dobras pelo hash das posições: não dependem do tamanho dos blocos
+    np.testing.assert_array_equal(equacoes.n, equacoes_do_df(base, VARIAVEIS, tamanho_bloco=5000).n)
+    np.testing.assert_array_equal(np.bincount(dobras_linhas(0, 0, len(base), 5).astype(np.int64)), equacoes.n)
+
+
+def test_mesclar_equacoes(base):
+    metades = [equacoes_do_df(parte, VARIAVEIS, tarefa=i) for i, parte in enumerate((base[:7000], base[7000:]))]
+    total = EquacoesNormais(len(VARIAVEIS)).mesclar(metades[0]).mesclar(metades[1])
+    np.testing.assert_allclose(total.xtx.sum(axis=0), base[VARIAVEIS].to_numpy().T @ base[VARIAVEIS].to_numpy())
+    np.testing.assert_array_equal(total.minimos, base[VARIAVEIS].min().to_numpy())
+
+
+@pytest.mark.parametrize("metodo", ["nnls", "ridge"])
+def test_calibracao_recupera_os_pesos(base, metodo):
+    pesos_df, _ = calibrar_pesos(equacoes_do_df(base, VARIAVEIS), VARIAVEIS, metodo=metodo)
+    assert list(pesos_df["Variavel"]) == VARIAVEIS
+    assert (pesos_df["Peso"] >= 0).all()
+    np.testing.assert_allclose(pesos_df["Peso"], PESOS_REAIS, atol=0.02)
@@ -0,0 +1,60 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes da ingestão incremental (ingestao_incremental.py) contra o cálculo sobre a base inteira.
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+from acesso_dados import carregar_base
+from conftest import PESOS_INICIAIS
+from ingestao_incremental import carregar_estado, carregar_ranking, ingerir_eventos
+
+
+@pytest.fixture
+def base(pasta_dados):
+    df = carregar_base(str(pasta_dados / "interrupcoes_light.csv"))
+    # Vários eventos por ativo, para que os lotes atualizem ativos já existentes
+    df["Trecho"] = "T" + (np.arange(len(df)) % 150).astype(str)
+    return df
+
+
+def _indice_da_base(df):
+    # Referência: média do índice Min-Max dos eventos de cada ativo, calculada sobre a base inteira
+    pesos = dict(zip(PESOS_INICIAIS["Variavel"], PESOS_INICIAIS["Peso"]))
+    indice = sum((df[col] - df[col].min()) / (df[col].max() - df[col].min()) * peso for col, peso in pesos.items())
+    return indice.groupby(df["Trecho"]).mean()
+
+
+def test_lotes_incrementais_iguais_a_base_inteira(base, tmp_path):
+    historico = str(tmp_path / "historico")
+    for lote in np.array_split(np.arange(len(base)), 4):
+        ativos, afetados, _ = ingerir_eventos(base.iloc[lote], PESOS_INICIAIS, historico)
+        assert set(afetados) == set(base["Trecho"].iloc[lote])
+
+    esperado = _indice_da_base(base)
+    ativos = ativos.set_index("Trecho")
+    np.testing.assert_allclose(ativos.loc[esperado.index, "Indice_Criticidade"], esperado, rtol=1e-12)
+    assert (ativos["Eventos"].sum(), carregar_estado(historico)["linhas"]) == (len(base), len(base))
+
+    ranking = carregar_ranking(historico, top_k=10)
+    assert list(ranking["Trecho"]) == list(esperado.sort_values(ascending=False, kind="stable").index[:10])
+
+
+def test_recalculo_parcial_quando_extremos_nao_mudam(base, tmp_path):
+    historico = str(tmp_path / "historico")
+    ingerir_eventos(base, PESOS_INICIAIS, historico)
+
+    # Lote dentro dos extremos: só os ativos do lote são recalculados
+    lote = base.iloc[:20]
+    ativos, afetados, recalculo_total = ingerir_eventos(lote, PESOS_INICIAIS, historico)
+    assert not recalculo_total
+    esperado = _indice_da_base(pd.concat([base, lote]))
+    ativos = ativos.set_index("Trecho")
+    np.testing.assert_allclose(ativos.loc[esperado.index, "Indice_Criticidade"], esperado, rtol=1e-12)
+
+    # Pesos diferentes: recálculo completo a partir dos agregados
+    _, _, recalculo_total = ingerir_eventos(base.iloc[20:30], PESOS_INICIAIS.assign(Peso=1.0), historico)
+    assert recalculo_total
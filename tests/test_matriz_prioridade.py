@@ -0,0 +1,25 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do cálculo em blocos da matriz de priorização (matriz_prioridade.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import matriz_prioridade
+from acesso_dados import carregar_base
+from conftest import PESOS_INICIAIS
+
+
+def test_streaming_identico_ao_calculo_em_memoria(pasta_dados, tmp_path):
+    base_path = str(pasta_dados / "interrupcoes_light.csv")
+    em_memoria = matriz_prioridade.calcular_criticidade(carregar_base(base_path), PESOS_INICIAIS).sort_index()
+
+    saida_path = str(tmp_path / "streaming.csv")
+    matriz_prioridade.calcular_criticidade_streaming(base_path, PESOS_INICIAIS, saida_path, tamanho_bloco=700)
+    streaming = pd.read_csv(saida_path, float_precision="round_trip")
+
+    # Mesmas linhas, na ordem da base, bit a bit
+    for coluna in ("Indice_Criticidade", "Impacto_DEC_Norm", "Tempo_Operacao_Norm"):
+        np.testing.assert_array_equal(streaming[coluna].to_numpy(), em_memoria[coluna].to_numpy())
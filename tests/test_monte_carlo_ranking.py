@@ -0,0 +1,56 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes dos percentis de rank e das chaves ausentes no Monte Carlo (monte_carlo_ranking.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+from acesso_dados import carregar_base
+from conftest import PESOS_INICIAIS
+from monte_carlo_ranking import _percentil_histograma, simular_ranking
+
+
+def _ranks_simulados(n_ativos, n_replicas, semente):
+    # Ranks (base 0) de cada ativo em cada réplica, concentrados em torno de posições diferentes
+    rng = np.random.default_rng(semente)
+    centros = rng.permutation(n_ativos)
+    return np.clip(np.rint(centros[:, None] + rng.normal(0, 4, (n_ativos, n_replicas))), 0, n_ativos - 1).astype(int)
+
+
+def _histograma(ranks, n_ativos, n_faixas):
+    faixas = ranks * n_faixas // n_ativos
+    return np.stack([np.bincount(linha, minlength=n_faixas) for linha in faixas])
+
+
+@pytest.mark.parametrize("q", [0.05, 0.5, 0.95])
+def test_percentil_exato_com_uma_faixa_por_rank(q):
+    ranks = _ranks_simulados(60, 501, 1)
+    esperado = np.quantile(ranks, q, axis=1, method="inverted_cdf") + 1
+    np.testing.assert_array_equal(_percentil_histograma(_histograma(ranks, 60, 60), q, 60), esperado)
+
+
+@pytest.mark.parametrize("n_faixas", [7, 16, 25])
+def test_percentil_por_faixas_dentro_da_faixa(n_faixas):
+    n_ativos = 100
+    ranks = _ranks_simulados(n_ativos, 400, 2)
+    for q in (0.05, 0.5, 0.95):
+        exato = np.quantile(ranks, q, axis=1, method="inverted_cdf")
+        estimado = _percentil_histograma(_histograma(ranks, n_ativos, n_faixas), q, n_ativos) - 1
+        # Mesma faixa do percentil exato
+        np.testing.assert_array_equal(estimado * n_faixas // n_ativos, exato * n_faixas // n_ativos)
+
+
+def test_eventos_sem_chave_fora_do_ranking(pasta_dados):
+    base = carregar_base(str(pasta_dados / "interrupcoes_light.csv"))
+    base["Trecho"] = [f"T{i % 30}" for i in range(len(base))]
+    base.loc[[0, 31, 2999], "Trecho"] = None
+
+    resultado = simular_ranking(base, PESOS_INICIAIS, n_replicas=32, k=5, n_processos=1)
+    assert resultado["Trecho"].notna().all()
+    assert sorted(resultado["Trecho"]) == sorted(f"T{i}" for i in range(30))
+    assert resultado["Rank_Observado"].tolist() == list(range(1, 31))
+    assert (resultado["Rank_P05"] <= resultado["Rank_P50"]).all()
+    assert (resultado["Rank_P50"] <= resultado["Rank_P95"]).all()
@@ -0,0 +1,71 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do núcleo da pontuação (nucleo_criticidade.py) contra a soma original com pandas.
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+from nucleo_criticidade import calcular_pontuacao, colunas_variaveis
+
+VARIAVEIS = ["Freq_Falhas", "Tempo_Operacao", "Impacto_DEC", "Impacto_FEC", "Clientes_Afetados"]
+PESOS = [0.0, 0.08, 32.43, 20.15, 0.04]
+
+
+@pytest.fixture
+def tabela():
+    rng = np.random.default_rng(11)
+    n = 10_007
+    df = pd.DataFrame({
+        "Freq_Falhas": rng.integers(1, 10, n),
+        "Tempo_Operacao": rng.integers(0, 40, n),
+        "Impacto_DEC": rng.lognormal(0.0, 1.5, n),
+        "Impacto_FEC": rng.lognormal(-1.0, 1.0, n),
+        "Clientes_Afetados": rng.integers(1, 5000, n),
+    })
+    df.loc[rng.choice(n, 50, replace=False), "Impacto_DEC"] = np.nan
+    return df
+
+
+def _soma_pandas(df, pesos, normalizar=False):
+    # Implementação original: soma ponderada coluna a coluna, começando de 0
+    total = 0
+    for var, peso in zip(VARIAVEIS, pesos):
+        coluna = df[var]
+        if normalizar:
+            coluna = (coluna - coluna.min()) / (coluna.max() - coluna.min())
+        total = total + coluna * peso
+    return total.to_numpy()
+
+
+@pytest.mark.parametrize("tamanho_bloco", [None, 1, 1000, 32768])
+def test_bruta_identica_a_soma_pandas(tabela, tamanho_bloco):
+    pontuacao = calcular_pontuacao(colunas_variaveis(tabela, VARIAVEIS), PESOS, "bruta", tamanho_bloco=tamanho_bloco)
+    np.testing.assert_array_equal(pontuacao, _soma_pandas(tabela, PESOS))
+
+
+@pytest.mark.parametrize("tamanho_bloco", [None, 7, 4096])
+def test_minmax_identica_a_soma_pandas(tabela, tamanho_bloco):
+    tabela["Tempo_Operacao"] = 5  # amplitude zero: NaN, como na divisão do pandas
+    normalizadas = [np.empty(len(tabela)) for _ in VARIAVEIS]
+    pontuacao = calcular_pontuacao(colunas_variaveis(tabela, VARIAVEIS), PESOS, "minmax",
+                                   normalizadas=normalizadas, tamanho_bloco=tamanho_bloco)
+    np.testing.assert_array_equal(pontuacao, _soma_pandas(tabela, PESOS, normalizar=True))
+    for var, valores in zip(VARIAVEIS, normalizadas):
+        coluna = tabela[var]
+        np.testing.assert_array_equal(valores, ((coluna - coluna.min()) / (coluna.max() - coluna.min())).to_numpy())
+
+
+def test_matriz_igual_a_lista_de_colunas(tabela):
+    matriz = tabela[VARIAVEIS].to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(calcular_pontuacao(matriz, PESOS, "minmax"),
+                                  calcular_pontuacao(colunas_variaveis(tabela, VARIAVEIS), PESOS, "minmax"))
+
+
+def test_pesos_e_normalizacao_invalidos(tabela):
+    with pytest.raises(ValueError):
+        calcular_pontuacao(colunas_variaveis(tabela, VARIAVEIS), PESOS[:2])
+    with pytest.raises(ValueError):
+        calcular_pontuacao(colunas_variaveis(tabela, VARIAVEIS), PESOS, "zscore")
@@ -0,0 +1,154 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do pipeline de etapas (pipeline_estagios.py) e do sistema integrado.
+'''
+
+# Importar bibliotecas
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+import instrumentacao
+import integrando_sistema
+from conftest import DIRETORIO_SCRIPTS, REGISTROS_TESTE
+from pipeline_estagios import CacheEstagios, Estagio, arquivos_codigo, executar_pipeline
+
+
+def _copiar_scripts(destino, pasta_dados):
+    # Cópia dos scripts com OUTPUT_PATH do sistema integrado apontando para a pasta de teste
+    shutil.copytree(DIRETORIO_SCRIPTS, destino, ignore=shutil.ignore_patterns("DADOS", "__pycache__"))
+    caminho = os.path.join(destino, "integrando_sistema.py")
+    with open(caminho, encoding="utf-8") as arquivo:
+        linhas = arquivo.read().splitlines(keepends=True)
+    linhas = [f"OUTPUT_PATH = {str(pasta_dados)!r}\n" if linha.startswith("OUTPUT_PATH = ") else linha
+              for linha in linhas]
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(linhas)
+
+
+def _executar_script(pasta_scripts):
+    processo = subprocess.run([sys.executable, "integrando_sistema.py"], cwd=pasta_scripts,
+                              capture_output=True, text=True, timeout=300)
+    assert processo.returncode == 0, processo.stderr
+    return processo.stdout
+
+
+def test_integrando_sistema_como_main_e_invalidacao_por_dependencia(tmp_path, pasta_dados):
+    pasta_scripts = tmp_path / "script"
+    _copiar_scripts(pasta_scripts, pasta_dados)
+
+    # As funções das etapas ficam em __main__ quando o script é executado diretamente
+    saida = _executar_script(pasta_scripts)
+    assert "[pipeline] criticidade: executada" in saida
+    assert (pasta_dados / "resultado_criticidade.csv").exists()
+    # Vazão (linhas/s) no resumo das métricas para as etapas executadas
+    resumo = {linha.split()[0]: linha.split() for linha in saida.splitlines() if linha[:1].isalpha()}
+    assert all(resumo[nome][2] != "-" for nome in ("cache_colunar", "eda", "criticidade", "matriz_priorizacao"))
+
+    saida = _executar_script(pasta_scripts)
+    assert "[pipeline] criticidade: em cache" in saida
+    assert "[pipeline] eda: em cache" in saida
+
+    # Dependência indireta (criterio -> nucleo_criticidade), não citada em integrando_sistema.py
+    with open(pasta_scripts / "nucleo_criticidade.py", "a", encoding="utf-8") as arquivo:
+        arquivo.write("\n# alteração\n")
+    saida = _executar_script(pasta_scripts)
+    assert "[pipeline] criticidade: executada" in saida
+    assert "[pipeline] matriz_priorizacao: executada" in saida
+    assert "[pipeline] eda: em cache" in saida
+
+
+def _nomes_arquivos(funcao):
+    return {os.path.basename(arquivo) for arquivo in arquivos_codigo(funcao)}
+
+
+def test_arquivos_codigo_segue_imports_locais():
+    criticidade = _nomes_arquivos(integrando_sistema.etapa_criticidade)
+    assert {"criterio_definido_classificar_criticidade.py", "nucleo_criticidade.py",
+            "acesso_dados.py", "armazenamento_particionado.py"} <= criticidade
+    assert "estatisticas_eda.py" not in criticidade
+
+    eda = _nomes_arquivos(integrando_sistema.etapa_eda)
+    assert {"estatisticas_eda.py", "sketch_quantis.py"} <= eda
+    assert "nucleo_criticidade.py" not in eda
+
+
+def _copiar(origem, destino):
+    with open(origem, encoding="utf-8") as entrada, open(destino, "w", encoding="utf-8") as saida:
+        texto = entrada.read()
+        saida.write(texto.upper())
+    return len(texto)
+
+
+def test_cache_invalida_por_entrada_e_parametros(tmp_path):
+    entrada, saida = tmp_path / "entrada.txt", tmp_path / "saida.txt"
+    entrada.write_text("a")
+
+    def estagios(destino=saida):
+        return [Estagio("copiar", _copiar, entradas=[entrada], saidas=[destino],
+                        parametros={"origem": str(entrada), "destino": str(destino)})]
+
+    assert executar_pipeline(estagios(), tmp_path) == {"copiar": "executada"}
+    assert executar_pipeline(estagios(), tmp_path) == {"copiar": "cache"}
+
+    # Saída apagada: restaurada a partir dos objetos, sem executar
+    saida.unlink()
+    assert executar_pipeline(estagios(), tmp_path) == {"copiar": "cache"}
+    assert saida.read_text() == "A"
+
+    entrada.write_text("b")
+    assert executar_pipeline(estagios(), tmp_path) == {"copiar": "executada"}
+    assert saida.read_text() == "B"
+
+    assert executar_pipeline(estagios(tmp_path / "outra.txt"), tmp_path) == {"copiar": "executada"}
+
+
+def test_chave_inclui_constantes_usadas(tmp_path, monkeypatch):
+    entrada = tmp_path / "entrada.txt"
+    entrada.write_text("a")
+    cache = CacheEstagios(tmp_path)
+    estagio = Estagio("gerar", _gerar_com_constante, entradas=[entrada])
+    chave = cache.chave(estagio)
+    assert cache.chave(estagio) == chave
+
+    # Constantes globais usadas pela função fazem parte da versão do código
+    monkeypatch.setattr(sys.modules[__name__], "_TEXTO_GERADO", "outro")
+    assert cache.chave(estagio) != chave
+
+
+_TEXTO_GERADO = "texto"
+
+
+def _gerar_com_constante():
+    return _TEXTO_GERADO
+
+
+def test_ciclo_entre_etapas(tmp_path):
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    estagios = [Estagio("x", _copiar, entradas=[a], saidas=[b]), Estagio("y", _copiar, entradas=[b], saidas=[a])]
+    with pytest.raises(ValueError, match="Ciclo"):
+        executar_pipeline(estagios, tmp_path)
+
+
+@pytest.mark.parametrize("n_processos", [1, 2])
+def test_etapas_registram_linhas(tmp_path, n_processos):
+    estagios = []
+    for nome in ("a", "b"):
+        entrada = tmp_path / f"{nome}.txt"
+        entrada.write_text("x" * 10)
+        estagios.append(Estagio(nome, _copiar, entradas=[entrada], saidas=[tmp_path / f"{nome}.out"],
+                                parametros={"origem": str(entrada), "destino": str(tmp_path / f"{nome}.out")}))
+    ativa = instrumentacao.configurar(memoria="nenhuma")
+    executar_pipeline(estagios, tmp_path, n_processos=n_processos)
+    assert {r["etapa"]: r["linhas"] for r in ativa.etapas} == {"a": 10, "b": 10}
+    assert all(r["linhas_por_s"] for r in ativa.etapas)
+
+
+def test_validar_registra_linhas_da_base(pasta_dados):
+    import integrando_sistema
+
+    linhas = integrando_sistema.etapa_validar(str(pasta_dados / "interrupcoes_light.csv"),
+                                              str(pasta_dados / "pesos_anal_criticidade.csv"))
+    assert linhas == REGISTROS_TESTE
@@ -0,0 +1,74 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes da criticidade particionada e do Monte Carlo em processos com memória compartilhada.
+'''
+
+# Importar bibliotecas
+import pandas as pd
+import pytest
+import criterio_definido_classificar_criticidade as criterio
+import matriz_prioridade
+from acesso_dados import carregar_base
+from conftest import PESOS_INICIAIS
+from monte_carlo_ranking import simular_ranking
+from processamento_particionado import calcular_criticidade_particionada, particionar
+
+CALCULO_EM_MEMORIA = {"bruta": criterio.calcular_criticidade, "minmax": matriz_prioridade.calcular_criticidade}
+
+
+@pytest.fixture
+def base(pasta_dados):
+    return carregar_base(str(pasta_dados / "interrupcoes_light.csv"))
+
+
+@pytest.mark.parametrize("normalizacao", ["bruta", "minmax"])
+@pytest.mark.parametrize("por", ["Ativo", "mes"])
+@pytest.mark.parametrize("n_processos", [1, 2])
+def test_particionado_igual_ao_calculo_em_memoria(base, normalizacao, por, n_processos):
+    referencia = CALCULO_EM_MEMORIA[normalizacao](base.copy(), PESOS_INICIAIS)
+    ranking, agregado = calcular_criticidade_particionada(base.copy(), PESOS_INICIAIS, normalizacao, por=por,
+                                                          n_processos=n_processos, linhas_por_tarefa=500)
+    # Bit a bit, na mesma ordem (tarefas pequenas: várias por partição)
+    pd.testing.assert_frame_equal(ranking, referencia, check_exact=True)
+    assert agregado["Eventos"].sum() == len(base)
+
+    top, _ = calcular_criticidade_particionada(base.copy(), PESOS_INICIAIS, normalizacao, por=por, top_k=25,
+                                               n_processos=n_processos, linhas_por_tarefa=500)
+    pd.testing.assert_frame_equal(top, referencia.head(25), check_exact=True)
+
+
+def test_monte_carlo_independe_do_numero_de_processos(base):
+    parametros = dict(n_replicas=64, elementos_por_lote=len(base) * 16, semente=3)
+    pd.testing.assert_frame_equal(simular_ranking(base, PESOS_INICIAIS, n_processos=1, **parametros),
+                                  simular_ranking(base, PESOS_INICIAIS, n_processos=2, **parametros))
+
+
+@pytest.mark.parametrize("por", ["Ativo", "mes"])
+def test_eventos_sem_data_ou_sem_trecho(base, por):
+    # Trechos repetidos (a base simulada tem um por evento) e algumas linhas sem data, sem tipo ou sem Trecho
+    base["Trecho"] = [f"T{i % 7}" for i in range(len(base))]
+    base.loc[[3, 40, 41], "Data_Interrupcao"] = pd.NaT
+    base.loc[[5, 900], "Ativo"] = None
+    base.loc[[8, 41, 2000], "Trecho"] = None
+
+    referencia = matriz_prioridade.calcular_criticidade(base.copy(), PESOS_INICIAIS)
+    ranking, agregado = calcular_criticidade_particionada(base.copy(), PESOS_INICIAIS, por=por,
+                                                          n_processos=2, linhas_por_tarefa=500)
+    pd.testing.assert_frame_equal(ranking, referencia, check_exact=True)
+
+    # Uma linha por Trecho; os eventos sem Trecho ficam fora da agregação
+    com_trecho = referencia.dropna(subset=["Trecho"])
+    assert sorted(agregado["Trecho"]) == [f"T{i}" for i in range(7)]
+    esperado = com_trecho.groupby("Trecho")["Indice_Criticidade"].agg(["size", "max"])
+    agregado = agregado.set_index("Trecho").loc[esperado.index]
+    assert agregado["Eventos"].tolist() == esperado["size"].tolist()
+    assert agregado["Indice_Maximo"].tolist() == esperado["max"].tolist()
+
+
+def test_particao_sem_data():
+    df = pd.DataFrame({"Data_Interrupcao": pd.to_datetime(["2023-02-10", None, "2023-01-05", "2023-02-01"])})
+    ordem, limites, rotulos = particionar(df, por="mes")
+    assert rotulos == ["2023-01", "2023-02", "sem_data"]
+    assert ordem.tolist() == [2, 0, 3, 1]
+    assert limites.tolist() == [0, 1, 3, 4]
@@ -0,0 +1,45 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do ranking Top-K por seleção parcial (ranking_criticidade.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+from ranking_criticidade import ordenar_por_criticidade, selecionar_top_k
+
+
+def _valores_com_empates(n, semente):
+    # Poucos valores distintos (muitos empates), NaN, zeros com sinal e infinitos
+    rng = np.random.default_rng(semente)
+    valores = rng.integers(0, 20, n).astype(np.float64) / 4
+    valores[rng.random(n) < 0.1] = np.nan
+    valores[rng.random(n) < 0.02] = -0.0
+    valores[rng.random(n) < 0.01] = np.inf
+    valores[rng.random(n) < 0.01] = -np.inf
+    return valores
+
+
+@pytest.mark.parametrize("semente", range(5))
+@pytest.mark.parametrize("k", [0, 1, 7, 50, 180, 199, 200, 500])
+def test_top_k_igual_a_ordenacao_estavel(semente, k):
+    valores = _valores_com_empates(200, semente)
+    esperado = pd.Series(valores).sort_values(ascending=False, kind="stable").index.to_numpy()[:k]
+    np.testing.assert_array_equal(selecionar_top_k(valores, k), esperado)
+
+
+def test_ordenar_por_criticidade_com_indice_nao_padrao():
+    valores = _valores_com_empates(1000, 42)
+    df = pd.DataFrame({"Indice": valores, "Linha": np.arange(1000)}, index=np.arange(1000)[::-1] * 3)
+    completo = df.sort_values("Indice", ascending=False, kind="stable")
+    pd.testing.assert_frame_equal(ordenar_por_criticidade(df, "Indice"), completo)
+    for k in (1, 25, 900, 1000):
+        pd.testing.assert_frame_equal(ordenar_por_criticidade(df, "Indice", top_k=k), completo.head(k))
+
+
+def test_top_k_coluna_inteira_e_nullable():
+    df = pd.DataFrame({"Indice": pd.array([3, None, 5, 3, 1, None, 5], dtype="Int64")})
+    esperado = df.sort_values("Indice", ascending=False, kind="stable")
+    pd.testing.assert_frame_equal(ordenar_por_criticidade(df, "Indice", top_k=6), esperado.head(6))
@@ -0,0 +1,65 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do relatório HTML único acumulado entre scripts (relatorio_html.py).
+'''
+
+# Importar bibliotecas
+import json
+import pytest
+import relatorio_html
+
+go = pytest.importorskip("plotly.graph_objects")
+
+
+def _figura(titulo):
+    return go.Figure(go.Bar(x=[1, 2, 3], y=[3, 1, 2]), layout={"title": {"text": titulo}})
+
+
+def _secoes(caminho):
+    with open(relatorio_html.pasta_figuras(str(caminho)) + "/manifesto.json", encoding="utf-8") as arquivo:
+        return [item["secao"] for item in json.load(arquivo)["secoes"]]
+
+
+def test_scripts_acumulam_secoes_no_mesmo_relatorio(tmp_path):
+    caminho = str(tmp_path / "relatorio.html")
+    # EDA -> criticidade -> matriz: cada script grava o seu relatório no mesmo caminho
+    for secao, titulos in (("EDA", ["Ativos", "Causas"]), ("Criticidade", ["Ranking"]), ("Matriz", ["Tabela"])):
+        relatorio = relatorio_html.RelatorioHTML(caminho)
+        for titulo in titulos:
+            relatorio.adicionar(_figura(titulo), secao)
+        resultado = relatorio.gravar()
+    assert resultado["figuras"] == 4
+    assert _secoes(caminho) == ["EDA", "Criticidade", "Matriz"]
+
+    # Nova execução da criticidade: substitui a seção, sem duplicar, e mantém a posição
+    relatorio = relatorio_html.RelatorioHTML(caminho)
+    relatorio.adicionar(_figura("Ranking novo"), "Criticidade")
+    assert relatorio.gravar()["figuras"] == 4
+    assert _secoes(caminho) == ["EDA", "Criticidade", "Matriz"]
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        conteudo = arquivo.read()
+    assert conteudo.count("class=\"figura\"") == 4
+    assert "Ranking novo" in conteudo and "Criticidade: Ranking<" not in conteudo
+    assert conteudo.index("<h2>EDA</h2>") < conteudo.index("<h2>Criticidade</h2>") < conteudo.index("<h2>Matriz</h2>")
+
+
+def test_sistema_integrado_grava_figuras_das_etapas(tmp_path, pasta_dados, monkeypatch):
+    import integrando_sistema
+
+    base_path = str(pasta_dados / "interrupcoes_light.csv")
+    pesos_path = str(pasta_dados / "pesos_anal_criticidade.csv")
+    for nome, arquivo in (("BASE_FILE_PATH", base_path), ("CRITICIDADE_FILE_PATH", tmp_path / "criticidade.csv"),
+                          ("MATRIZ_FILE_PATH", tmp_path / "matriz.csv")):
+        monkeypatch.setattr(integrando_sistema, nome, str(arquivo))
+    integrando_sistema.etapa_criticidade(base_path, pesos_path, integrando_sistema.CRITICIDADE_FILE_PATH)
+    integrando_sistema.etapa_matriz(base_path, pesos_path, integrando_sistema.MATRIZ_FILE_PATH)
+
+    monkeypatch.setattr(relatorio_html, "_ATIVO", None)
+    assert integrando_sistema.gerar_relatorio() is None
+    caminho = tmp_path / "relatorio.html"
+    relatorio_html.configurar(str(caminho))
+    resultado = integrando_sistema.gerar_relatorio()
+    assert resultado["figuras"] > 0
+    assert _secoes(caminho) == ["Análise Exploratória", "Criticidade", "Matriz de Priorização"]
@@ -0,0 +1,48 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do índice em memória e do what-if do serviço de consultas (servico_consultas.py).
+'''
+
+# Importar bibliotecas
+import asyncio
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import matriz_prioridade
+from acesso_dados import carregar_base_compacta
+from servico_consultas import ErroConsulta, ServicoConsultas, carregar_indice
+
+PESOS_DEC_FEC = pd.DataFrame({"Variavel": ["Freq_Falhas", "Tempo_Operacao", "Impacto_DEC_FEC"],
+                              "Peso": [0.2, 0.3, 0.5]})
+
+
+@pytest.fixture
+def caminhos(pasta_dados):
+    pesos_path = pasta_dados / "pesos_dec_fec.csv"
+    PESOS_DEC_FEC.to_csv(pesos_path, index=False)
+    return str(pasta_dados / "interrupcoes_light.csv"), str(pesos_path)
+
+
+def test_pesos_com_impacto_dec_fec_iguais_a_matriz(caminhos):
+    base_path, pesos_path = caminhos
+    indice = carregar_indice(base_path, pesos_path)
+    referencia = matriz_prioridade.calcular_criticidade(carregar_base_compacta(base_path), PESOS_DEC_FEC)
+    np.testing.assert_array_equal(indice.indice[referencia.index], referencia["Indice_Criticidade"].to_numpy())
+    assert "Impacto_DEC_FEC" not in indice.df.columns
+
+
+def test_what_if_com_ativo_desconhecido_nao_calcula(pasta_dados):
+    servico = ServicoConsultas(str(pasta_dados / "interrupcoes_light.csv"),
+                               str(pasta_dados / "pesos_anal_criticidade.csv"))
+    corpo = json.dumps({"pesos": {"Impacto_DEC": 1}, "ativo": "Inexistente"}).encode()
+    with pytest.raises(ErroConsulta) as erro:
+        asyncio.run(servico._what_if(corpo))
+    assert erro.value.status == 404
+    assert servico.indice.estado()["cache_what_if"] == 0
+
+    corpo = json.dumps({"pesos": {"Impacto_DEC": 1}, "ativo": "Transformador", "k": 3}).encode()
+    resposta = asyncio.run(servico._what_if(corpo))
+    assert [registro["Ativo"] for registro in resposta["ativos"]] == ["Transformador"] * 3
+    assert servico.indice.estado()["cache_what_if"] == 1
@@ -0,0 +1,51 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes do sketch de quantis KLL (sketch_quantis.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pytest
+from sketch_quantis import SketchQuantis
+
+QS = np.linspace(0.01, 0.99, 99)
+
+
+def _erro_rank(sketch, valores):
+    # Maior diferença entre o rank estimado e o rank exato, nos quantis estimados
+    ordenados = np.sort(valores)
+    ranks = np.searchsorted(ordenados, sketch.quantis(QS), side="right") / len(ordenados)
+    return np.abs(ranks - QS).max()
+
+
+@pytest.fixture
+def valores():
+    return np.random.default_rng(5).lognormal(0.0, 2.0, 200_000)
+
+
+def test_erro_de_rank_limitado_e_memoria_constante(valores):
+    sketch = SketchQuantis(k=400).atualizar(valores)
+    assert sketch.n == len(valores)
+    assert _erro_rank(sketch, valores) < 0.01
+    assert sum(len(itens) for itens in sketch.niveis) < 4 * 400
+
+
+def test_mesclar_blocos_equivale_a_um_sketch(valores):
+    partes = [SketchQuantis(k=400, semente=i).atualizar(bloco) for i, bloco in enumerate(np.array_split(valores, 16))]
+    mesclado = partes[0]
+    for parte in partes[1:]:
+        mesclado.mesclar(parte)
+    assert mesclado.n == len(valores)
+    assert _erro_rank(mesclado, valores) < 0.01
+
+    # rank(x) é consistente com quantis(q)
+    np.testing.assert_allclose(mesclado.rank(mesclado.quantis(QS)), QS, atol=0.01)
+
+
+def test_nan_ignorados_e_sketch_vazio():
+    sketch = SketchQuantis(k=50)
+    assert np.isnan(sketch.quantis([0.5])).all()
+    sketch.atualizar([np.nan, 1.0, 2.0, np.nan, 3.0])
+    assert sketch.n == 3
+    np.testing.assert_array_equal(sketch.quantis([0.0, 0.5, 1.0]), [1.0, 2.0, 3.0])
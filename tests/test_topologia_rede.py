@@ -0,0 +1,84 @@
+'''
+    ATIVOS_REDE_AEREA.docx
+
+    |> Objetivo: testes das propagações na rede radial e das métricas de topologia nos pesos (topologia_rede.py).
+'''
+
+# Importar bibliotecas
+import numpy as np
+import pandas as pd
+import pytest
+import criterio_definido_classificar_criticidade as criterio
+import matriz_prioridade
+from conftest import PESOS_INICIAIS
+from topologia_rede import COLUNA_JUSANTE, COLUNA_MONTANTE, TopologiaRede, calcular_metricas_topologia, \
+    carregar_topologia, gerar_topologia_simulada, juntar_topologia
+
+
+def _arvore_aleatoria(n, semente):
+    # Cada trecho (exceto os inícios de alimentador) liga-se a um trecho anterior em uma ordem aleatória
+    rng = np.random.default_rng(semente)
+    ordem = rng.permutation(n)
+    pai = np.full(n, -1, dtype=np.int64)
+    for i in range(3, n):
+        pai[ordem[i]] = ordem[rng.integers(0, i)]
+    return pai
+
+
+def _ancestrais(pai, i):
+    while pai[i] >= 0:
+        i = pai[i]
+        yield i
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_propagacoes_contra_laco_de_referencia(semente):
+    pai = _arvore_aleatoria(300, semente)
+    topologia = TopologiaRede([f"T{i}" for i in range(len(pai))], pai)
+    valores = np.random.default_rng(semente).random(len(pai))
+
+    jusante = valores.copy()
+    montante = np.zeros(len(pai))
+    for i in range(len(pai)):
+        for ancestral in _ancestrais(pai, i):
+            jusante[ancestral] += valores[i]
+            montante[i] += valores[ancestral]
+    np.testing.assert_allclose(topologia.somar_jusante(valores), jusante, rtol=1e-12)
+    np.testing.assert_allclose(topologia.somar_montante(valores), montante, rtol=1e-12)
+    assert topologia.nivel.tolist() == [len(list(_ancestrais(pai, i))) for i in range(len(pai))]
+
+
+def test_ciclo_e_mais_de_um_montante():
+    ciclo = pd.DataFrame({COLUNA_MONTANTE: ["A", "B", "C"], COLUNA_JUSANTE: ["B", "C", "A"]})
+    with pytest.raises(ValueError, match="ciclos"):
+        TopologiaRede.de_arestas(ciclo, trechos_extras=["D"])
+    dois_montantes = pd.DataFrame({COLUNA_MONTANTE: ["A", "B"], COLUNA_JUSANTE: ["C", "C"]})
+    with pytest.raises(ValueError, match="mais de um montante"):
+        TopologiaRede.de_arestas(dois_montantes)
+
+
+@pytest.mark.parametrize("carregar, calcular, coluna", [
+    (criterio.carregar_dados_pesos, criterio.calcular_criticidade, "Criticidade_Calculada"),
+    (matriz_prioridade.carregar_dados_e_pesos, matriz_prioridade.calcular_criticidade, "Indice_Criticidade"),
+])
+def test_pesos_com_metricas_de_topologia(pasta_dados, carregar, calcular, coluna):
+    base_path = str(pasta_dados / "interrupcoes_light.csv")
+    pesos_path = pasta_dados / "pesos_topologia.csv"
+    pd.concat([PESOS_INICIAIS, pd.DataFrame({"Variavel": ["Clientes_Jusante", "Impacto_DEC_Montante"],
+                                             "Peso": [0.01, 1.0]})]).to_csv(pesos_path, index=False)
+
+    # Sem o arquivo de topologia na pasta da base, a carga falha de forma explícita
+    with pytest.raises(FileNotFoundError):
+        carregar(base_path, str(pesos_path))
+
+    df, _ = carregar(base_path, str(pasta_dados / "pesos_anal_criticidade.csv"))
+    assert "Clientes_Jusante" not in df.columns
+    gerar_topologia_simulada(df["Trecho"].cat.categories, pasta_dados / "topologia_trechos.csv", n_alimentadores=5)
+
+    df, pesos_df = carregar(base_path, str(pesos_path))
+    topologia = carregar_topologia(pasta_dados / "topologia_trechos.csv", df["Trecho"].cat.categories)
+    esperado = juntar_topologia(df.drop(columns=["Clientes_Jusante", "Impacto_DEC_Montante"]),
+                                calcular_metricas_topologia(topologia, df),
+                                ["Clientes_Jusante", "Impacto_DEC_Montante"])
+    pd.testing.assert_frame_equal(df, esperado)
+    assert calcular(df, pesos_df)[coluna].notna().all()